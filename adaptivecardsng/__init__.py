@@ -7,3 +7,57 @@ __license__ = 'GPLv3+'
 import sys
 if sys.version_info < (3, 7):
     raise RuntimeError("Python versions earlier than 3.7.0 are NOT supported.")
+
+# Lazy loading of the public classes.
+#
+# ``import adaptivecardsng`` imports nothing else: every class listed
+# below is available as an attribute of the package, and its module is
+# imported the first time it's used (PEP 562).  Submodules can be
+# reached the same way, e.g. adaptivecardsng.validation.
+#
+# The modules in turn only import what they use at runtime; classes
+# used in annotations alone are imported under TYPE_CHECKING, which is
+# defined as a constant rather than imported from typing because
+# importing typing costs more than the rest of the package.
+# benchmarks/bench_import.py keeps track of the import times.
+
+_EXPORTS = {
+    'actions': ('OpenUrl', 'Submit', 'ShowCard', 'TargetElement', 'ToggleVisibility', 'Execute'),
+    'base': ('BaseObject',),
+    'cards': ('AdaptiveCard',),
+    'containers': ('ActionSet', 'Container', 'Column', 'ColumnSet', 'Fact', 'FactSet', 'ImageSet',
+                   'TableCell', 'TableRow', 'Table'),
+    'elements': ('TextBlock', 'Image', 'MediaSource', 'Media', 'TextRun', 'RichTextBlock'),
+    'enums': ('FontType', 'FontSize', 'FontWeight', 'TextBlockStyle', 'ImageFillMode', 'ImageSize',
+              'ImageStyle', 'HorizontalAlignment', 'VerticalAlignment', 'BlockElementHeight',
+              'Spacing', 'ActionStyle', 'ActionMode', 'AssociatedInputs', 'Colors',
+              'ContainerStyle', 'TextInputStyle', 'ChoiceInputStyle'),
+    'inputs': ('Text', 'Number', 'Date', 'Time', 'Toggle', 'Choice', 'ChoiceSet'),
+    'messages.teams': ('TeamsAdaptiveMessage',),
+    'types': ('BackgroundImage', 'Refresh', 'TokenExchangeResource', 'AuthCardButton',
+              'Authentication'),
+}
+
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name: str):
+    import importlib
+
+    module = _MODULES.get(name)
+    if module is None:
+        try:
+            return importlib.import_module(f'{__name__}.{name}')
+        except ModuleNotFoundError as error:
+            if error.name != f'{__name__}.{name}':
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f'{__name__}.{module}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from .base import BaseAction, BaseObject
-from .cards import AdaptiveCard
 from .enums import ActionStyle, ActionMode, AssociatedInputs
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .cards import AdaptiveCard
+
 
 class OpenUrl(BaseAction):
     def __init__(self,
@@ -66,7 +69,7 @@ class TargetElement(BaseObject):
         super(TargetElement, self).__init__(*args, **kwargs)
         self.elementId = element_id
         if visible:
-            self.isVisisble = visible
+            self.isVisible = visible
 
 
 class ToggleVisibility(BaseAction):
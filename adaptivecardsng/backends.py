@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import importlib
+
+from .serialization import JSONFormat, encode, encode_bytes, json_default
+
+# Pluggable JSON encoding backends.
+#
+# BaseObject.as_json() and BaseObject.as_bytes() hand the object tree to
+# a backend.  The default, "builtin", is the compiled encoder from
+# serialization.py and reproduces json.dumps() output exactly for every
+# format.  The stdlib "json" module is always available; "orjson" and
+# "ujson" are used only if they are installed.
+#
+# The native backends only implement the layouts their libraries can
+# produce natively (compact output, or two-space indentation with ': '
+# key separators).  For any other format they defer to the builtin
+# encoder, so selecting a backend never changes the document layout.
+#
+# orjson's output also differs from json.dumps() for some content: it
+# writes non-ASCII characters (and DEL) raw rather than as \u escapes,
+# NaN and Infinity as null, and float exponents without the '+' ("1e16"
+# for "1e+16"), and it refuses integers beyond 64 bits.  Such output is
+# spotted after the fact with one scan of the bytes and encoded again
+# with the builtin encoder.  The scan is conservative: it also matches
+# "null" and digit-"e" in strings, which only costs the second encoding.
+# It adds about a fifth to orjson's own time.
+#
+# ujson is checked the same way.  It writes DEL raw and negative
+# single-digit exponents without the leading zero ("1e-7" for "1e-07"),
+# and it ignores ``default=`` when sorting keys, so sorted formats are
+# always left to the builtin encoder.
+
+
+# Compiled when a native backend is first used; see _exponent().
+_EXPONENT = None
+
+
+def _exponent():
+    # A digit followed by an exponent, e.g. "1e16" or "1e-7".  Matching "e"
+    # first is several times faster than a leading digit class.
+    global _EXPONENT
+    if _EXPONENT is None:
+        import re
+        _EXPONENT = re.compile(rb'e[-0-9](?<=[0-9]e.)')
+    return _EXPONENT
+
+
+class JSONBackend:
+    """
+    Base class for JSON encoding backends.
+
+    Subclasses override ``supports``, ``dumps`` and/or ``dumps_bytes``.  The base
+    implementation is the builtin compiled encoder.
+    """
+    name = 'builtin'
+
+    def supports(self, fmt: JSONFormat) -> bool:
+        """
+        Args:
+            fmt (JSONFormat): The requested output format.
+
+        Returns:
+            bool: Whether this backend can produce ``fmt`` natively.
+        """
+        return True
+
+    def dumps(self, obj, fmt: JSONFormat) -> str:
+        """
+        Args:
+            obj: Any BaseObject, or a list/dict/scalar containing them.
+            fmt (JSONFormat): The output format to use.
+
+        Returns:
+            str: The encoded JSON document.
+        """
+        return encode(obj, fmt)
+
+    def dumps_bytes(self, obj, fmt: JSONFormat) -> bytes:
+        """
+        Args:
+            obj: Any BaseObject, or a list/dict/scalar containing them.
+            fmt (JSONFormat): The output format to use.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON document.
+        """
+        return encode_bytes(obj, fmt)
+
+
+class StdlibBackend(JSONBackend):
+    """Backend built on the standard library ``json`` module."""
+    name = 'json'
+
+    def __init__(self) -> None:
+        # Imported when first used, as for the other backends: importing json
+        # (and re with it) is a large share of this package's import time.
+        self._json = importlib.import_module('json')
+
+    def dumps(self, obj, fmt: JSONFormat) -> str:
+        return self._json.dumps(obj, default=json_default, indent=fmt.indent,
+                                separators=(fmt.item_separator, fmt.key_separator),
+                                sort_keys=fmt.sort_keys)
+
+    def dumps_bytes(self, obj, fmt: JSONFormat) -> bytes:
+        return self.dumps(obj, fmt).encode('ascii')
+
+
+class OrjsonBackend(JSONBackend):
+    """Backend built on ``orjson``, if installed."""
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        self._orjson = importlib.import_module('orjson')
+        self._exponent = _exponent()
+
+    def _options(self, fmt: JSONFormat) -> int:
+        orjson = self._orjson
+        options = orjson.OPT_NON_STR_KEYS
+        if fmt.indent is not None:
+            options |= orjson.OPT_INDENT_2
+        if fmt.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def supports(self, fmt: JSONFormat) -> bool:
+        # The layout only; see _native() for the content orjson can't reproduce.
+        if fmt.indent is None:
+            return (fmt.item_separator, fmt.key_separator) == (',', ':')
+        return fmt.indent == '  ' and (fmt.item_separator, fmt.key_separator) == (',', ': ')
+
+    def _native(self, obj, fmt: JSONFormat) -> (bytes | None):
+        # orjson's output if it matches the builtin encoder's, else None.
+        if not self.supports(fmt):
+            return None
+        orjson = self._orjson
+        try:
+            payload = orjson.dumps(obj, default=json_default, option=self._options(fmt))
+        except orjson.JSONEncodeError:
+            return None
+        # Bytes json.dumps() would escape, nulls that may stand for NaN or
+        # Infinity, and exponents.
+        if not payload.isascii() or b'\x7f' in payload or b'null' in payload or \
+                self._exponent.search(payload) is not None:
+            return None
+        return payload
+
+    def dumps(self, obj, fmt: JSONFormat) -> str:
+        payload = self._native(obj, fmt)
+        if payload is None:
+            return encode(obj, fmt)
+        return payload.decode('ascii')
+
+    def dumps_bytes(self, obj, fmt: JSONFormat) -> bytes:
+        payload = self._native(obj, fmt)
+        if payload is None:
+            return encode_bytes(obj, fmt)
+        return payload
+
+
+class UjsonBackend(JSONBackend):
+    """Backend built on ``ujson``, if installed."""
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        self._ujson = importlib.import_module('ujson')
+        self._exponent = _exponent()
+
+    def supports(self, fmt: JSONFormat) -> bool:
+        # The layout only; see _native() for the content ujson can't reproduce.
+        # ujson drops ``default=`` when sorting, and indent=0 means no newlines.
+        if fmt.sort_keys:
+            return False
+        if fmt.indent is None:
+            return (fmt.item_separator, fmt.key_separator) == (',', ':')
+        return fmt.indent != '' and fmt.indent.strip(' ') == '' and \
+            (fmt.item_separator, fmt.key_separator) == (',', ': ')
+
+    def _native(self, obj, fmt: JSONFormat) -> (bytes | None):
+        # ujson's output if it matches the builtin encoder's, else None.
+        if not self.supports(fmt):
+            return None
+        try:
+            text = self._ujson.dumps(obj, default=json_default, ensure_ascii=True,
+                                     escape_forward_slashes=False,
+                                     indent=len(fmt.indent or ''))
+        except (TypeError, ValueError, OverflowError):
+            return None
+        payload = text.encode('ascii')
+        # Raw DEL, and exponents.
+        if b'\x7f' in payload or self._exponent.search(payload) is not None:
+            return None
+        return payload
+
+    def dumps(self, obj, fmt: JSONFormat) -> str:
+        payload = self._native(obj, fmt)
+        if payload is None:
+            return encode(obj, fmt)
+        return payload.decode('ascii')
+
+    def dumps_bytes(self, obj, fmt: JSONFormat) -> bytes:
+        payload = self._native(obj, fmt)
+        if payload is None:
+            return encode_bytes(obj, fmt)
+        return payload
+
+
+_BACKEND_TYPES = {
+    'builtin': JSONBackend,
+    'json': StdlibBackend,
+    'orjson': OrjsonBackend,
+    'ujson': UjsonBackend,
+}
+
+# Preference order used when the backend is 'auto'.  ujson and the stdlib
+# encoder call back into Python for every object, which makes them about
+# half as fast as the builtin encoder for cards; see bench_backends.py.
+_AUTO_ORDER = ('orjson', 'builtin')
+
+_instances = {}
+_current = None
+
+
+def available_backends() -> list[str]:
+    """
+    Returns:
+        list: Names of the backends that can be used in this environment.
+    """
+    names = []
+    for name in _BACKEND_TYPES:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name: (str | JSONBackend | None) = None) -> JSONBackend:
+    """
+    Look up a JSON backend.
+
+    Args:
+        name (str/JSONBackend, optional): 'builtin', 'json', 'orjson', 'ujson' or
+            'auto' (the fastest installed). Defaults to the process-wide backend
+            chosen with set_backend().
+
+    Returns:
+        JSONBackend: The backend instance.
+
+    Raises:
+        ImportError: If the requested backend's library is not installed.
+        ValueError: If the backend name is unknown.
+    """
+    if name is None:
+        if _current is None:
+            return _instances.setdefault('builtin', JSONBackend())
+        return _current
+    if isinstance(name, JSONBackend):
+        return name
+    if name == 'auto':
+        for candidate in _AUTO_ORDER:
+            try:
+                return get_backend(candidate)
+            except ImportError:
+                continue
+
+    backend = _instances.get(name)
+    if backend is None:
+        try:
+            backend_type = _BACKEND_TYPES[name]
+        except KeyError:
+            raise ValueError(f"Unknown JSON backend: {name!r}") from None
+        backend = _instances[name] = backend_type()
+    return backend
+
+
+def set_backend(name: (str | JSONBackend | None)) -> JSONBackend:
+    """
+    Select the JSON backend used by default for the whole process.
+
+    Args:
+        name (str/JSONBackend, optional): See get_backend(). None restores 'builtin'.
+
+    Returns:
+        JSONBackend: The backend now in use.
+    """
+    global _current
+    _current = None if name is None else get_backend(name)
+    return get_backend()
@@ -1,27 +1,102 @@
 from __future__ import annotations
 
-import json
-import enum
-
 from .enums import BlockElementHeight, Spacing, ActionStyle, ActionMode
+from .backends import JSONBackend, get_backend
+from .serialization import COMPACT, CANONICAL, DEFAULT_CHUNK_SIZE, JSONFormat
+from .serialization import dump, iterencode_bytes, json_default, preview, to_dict
 
 
-class BaseObjectJSONEncoder(json.JSONEncoder):
-    """Specialized JSON Encoder for adaptivecardsng BaseObject and its subclasses."""
-    def default(self, obj: BaseObject):
-        """
-        Default JSON handler function for generating JSON data.
+# Output formats used by BaseObject.__str__ and BaseObject.as_json.
+_STR_FORMAT = JSONFormat(indent=2, sort_keys=True)
+_AS_JSON_FORMAT = JSONFormat(indent=2, separators=(',', ':'), sort_keys=True)
 
-        Args:
-            obj (BaseObject): Any BaseObject or subclassed objects.
 
-        Returns:
+def _select_format(compact: bool, canonical: bool, default: JSONFormat) -> JSONFormat:
+    if canonical:
+        return CANONICAL
+    if compact:
+        return COMPACT
+    return default
 
-        """
-        if isinstance(obj, enum.Enum):
-            return str(obj.value)
 
-        return obj.__dict__
+# Callables notified with the object whenever a BaseObject is mutated, used
+# by serialization caches to invalidate stale output.  Attribute assignment
+# is only intercepted while at least one listener is registered, so there
+# is no cost to object construction otherwise.
+_mutation_listeners = []
+
+
+def _notify_mutation(obj) -> None:
+    for listener in _mutation_listeners:
+        listener(obj)
+
+
+def _tracked_setattr(self, name, value) -> None:
+    object.__setattr__(self, name, value)
+    _notify_mutation(self)
+
+
+def _tracked_delattr(self, name) -> None:
+    object.__delattr__(self, name)
+    _notify_mutation(self)
+
+
+def add_mutation_listener(listener) -> None:
+    """
+    Register a callable to be invoked as ``listener(obj)`` after any BaseObject
+    is mutated through item or attribute assignment or deletion.
+
+    Args:
+        listener (callable): The callback to register.
+    """
+    if not _mutation_listeners:
+        BaseObject.__setattr__ = _tracked_setattr
+        BaseObject.__delattr__ = _tracked_delattr
+    _mutation_listeners.append(listener)
+
+
+def remove_mutation_listener(listener) -> None:
+    """
+    Unregister a callable added with add_mutation_listener().
+
+    Args:
+        listener (callable): The callback to remove.
+    """
+    _mutation_listeners.remove(listener)
+    if not _mutation_listeners:
+        del BaseObject.__setattr__
+        del BaseObject.__delattr__
+
+
+def _make_json_encoder() -> type:
+    import json
+
+    class BaseObjectJSONEncoder(json.JSONEncoder):
+        """Specialized JSON Encoder for adaptivecardsng BaseObject and its subclasses."""
+        def default(self, obj: BaseObject):
+            """
+            Default JSON handler function for generating JSON data.
+
+            Args:
+                obj (BaseObject): Any BaseObject or subclassed objects.
+
+            Returns:
+
+            """
+            return json_default(obj)
+
+    BaseObjectJSONEncoder.__module__ = __name__
+    BaseObjectJSONEncoder.__qualname__ = 'BaseObjectJSONEncoder'
+    return BaseObjectJSONEncoder
+
+
+def __getattr__(name: str):
+    # BaseObjectJSONEncoder is built on first use, so that importing the
+    # package doesn't import the json module.
+    if name == 'BaseObjectJSONEncoder':
+        encoder = globals()[name] = _make_json_encoder()
+        return encoder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class BaseObject:
@@ -36,12 +111,28 @@ class BaseObject:
 
     def __setitem__(self, key, value) -> None:
         self.__dict__[key] = value
+        if _mutation_listeners:
+            _notify_mutation(self)
 
     def __getitem__(self, key) -> object:
         return self.__dict__[key]
 
     def __delitem__(self, key) -> None:
         del self.__dict__[key]
+        if _mutation_listeners:
+            _notify_mutation(self)
+
+    def __eq__(self, other) -> bool:
+        # Structural: equal if both serialize to the same JSON; see fingerprint.py.
+        from .fingerprint import _TRACKED, equal
+        if not isinstance(other, _TRACKED):
+            return NotImplemented
+        return equal(self, other)
+
+    def __hash__(self) -> int:
+        # Content-based to agree with __eq__, and not remembered; see fingerprint.py.
+        from .fingerprint import content_hash
+        return content_hash(self)
 
     def __iter__(self) -> iter:
         return iter(self.__dict__)
@@ -50,7 +141,8 @@ class BaseObject:
         return len(self.__dict__)
 
     def __str__(self) -> str:
-        return json.dumps(self.__dict__, sort_keys=True, indent=2, cls=BaseObjectJSONEncoder)
+        # Shows lazily consumed rows/items as a placeholder rather than reading them.
+        return preview(self, _STR_FORMAT)
 
     def __repr__(self):
         return self.__str__()
@@ -61,9 +153,127 @@ class BaseObject:
         else:
             raise ValueError("Specified key already exists.")
 
-    def as_json(self) -> str:
-        return json.dumps(self.__dict__, sort_keys=True, indent=2,
-                          separators=(',', ':'), cls=BaseObjectJSONEncoder)
+    def as_json(self, compact: bool = False, canonical: bool = False,
+                backend: (str | JSONBackend | None) = None) -> str:
+        """
+        Serialize this object to a JSON string.
+
+        By default the output is indented and key-sorted for readability.
+
+        Args:
+            compact (bool, optional): Emit no whitespace and keep keys in insertion
+                order. This is the smallest and fastest form, suited to the wire.
+            canonical (bool, optional): Emit no whitespace with keys sorted, so that
+                equal objects always produce identical output.
+            backend (str/JSONBackend, optional): JSON backend to use for this call.
+                Defaults to the process-wide backend; see backends.set_backend().
+
+        Returns:
+            str: The encoded JSON document.
+        """
+        return get_backend(backend).dumps(self, _select_format(compact, canonical,
+                                                               _AS_JSON_FORMAT))
+
+    def as_bytes(self, compact: bool = True, canonical: bool = False,
+                 backend: (str | JSONBackend | None) = None) -> bytes:
+        """
+        Serialize this object to UTF-8 encoded JSON, ready for a socket or HTTP body.
+
+        Args:
+            compact (bool, optional): Emit no whitespace and keep keys in insertion
+                order. Defaults to True; pass False for the indented as_json() layout.
+            canonical (bool, optional): Emit no whitespace with keys sorted.
+            backend (str/JSONBackend, optional): JSON backend to use for this call.
+                Defaults to the process-wide backend; see backends.set_backend().
+
+        Returns:
+            bytes: The encoded JSON document.
+        """
+        return get_backend(backend).dumps_bytes(self, _select_format(compact, canonical,
+                                                                     _AS_JSON_FORMAT))
+
+    def iter_bytes(self, compact: bool = True, canonical: bool = False,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Serialize this object incrementally, yielding UTF-8 JSON in chunks.
+
+        Suited to streaming large cards into HTTP request bodies without holding
+        the whole payload in memory. The joined chunks equal as_bytes().
+
+        Args:
+            compact (bool, optional): See as_bytes(). Defaults to True.
+            canonical (bool, optional): See as_bytes().
+            chunk_size (int, optional): Approximate size of each chunk, in bytes.
+
+        Returns:
+            Iterator of bytes chunks.
+        """
+        return iterencode_bytes(self, _select_format(compact, canonical, _AS_JSON_FORMAT),
+                                chunk_size)
+
+    def dump(self, fp, compact: bool = True, canonical: bool = False,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Serialize this object incrementally to a binary file-like object.
+
+        Args:
+            fp: Any object with a write(bytes) method.
+            compact (bool, optional): See as_bytes(). Defaults to True.
+            canonical (bool, optional): See as_bytes().
+            chunk_size (int, optional): Approximate size of each write, in bytes.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        return dump(self, fp, _select_format(compact, canonical, _AS_JSON_FORMAT), chunk_size)
+
+    def to_dict(self) -> dict:
+        """
+        Convert this object and everything beneath it into plain Python data.
+
+        Returns:
+            dict: JSON-compatible data with Enums mapped to their wire strings.
+        """
+        return to_dict(self)
+
+    def encoded_size(self, fresh: bool = True) -> int:
+        """
+        Size of the compact JSON encoding.
+
+        Args:
+            fresh (bool, optional): Measure the whole tree again. Pass False to
+                reuse the sizes remembered from earlier calls, which are stale after
+                in-place changes to lists; see sizing.encoded_size().
+
+        Returns:
+            int: The length in bytes of as_bytes() output; see sizing.encoded_size().
+        """
+        # Imported here: sizing depends on this module.
+        from .sizing import encoded_size
+        return encoded_size(self, fresh)
+
+    def fingerprint(self) -> str:
+        """
+        Content hash of the canonical JSON form, remembered between calls.
+
+        Returns:
+            str: 32 hex digits; see fingerprint.fingerprint().
+        """
+        from .fingerprint import fingerprint
+        return fingerprint(self)
+
+    def derive(self, changes: dict) -> BaseObject:
+        """
+        Copy-on-write variant of this object, sharing all unchanged subtrees.
+
+        Args:
+            changes (dict): ``{JSON pointer: new value}``; see derive.derive().
+
+        Returns:
+            BaseObject: The variant; this object is left unchanged.
+        """
+        from .derive import derive
+        return derive(self, changes)
 
 
 class BaseElement(BaseObject):
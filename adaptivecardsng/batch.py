@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Batch rendering across a pool of workers.
+#
+# as_bytes() runs on a single core.  render_many() splits a batch into
+# chunks and serializes the chunks in parallel on a concurrent.futures
+# pool, yielding the results in input order.
+#
+# With a process pool the inputs have to be pickled and sent to the
+# workers, which for finished card objects can cost about as much as
+# serializing them.  It scales best when given a factory and small data
+# records, so that the cards are built in the workers: factories must be
+# picklable, i.e. module-level functions or compiled Templates (e.g.
+# template.render_bytes).  Thread pools avoid the pickling but are
+# limited by the GIL.  Cards holding lazily consumed rows or items (a
+# LazySequence, e.g. Table(rows=<generator>)) can't be pickled at all:
+# build those in the workers, or use a thread pool.
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def _render_chunk(factory, items: list, compact: bool, canonical: bool) -> list:
+    rendered = []
+    for item in items:
+        if factory is not None:
+            item = factory(item)
+        if isinstance(item, bytes):
+            rendered.append(item)
+        elif isinstance(item, str):
+            rendered.append(item.encode('utf-8'))
+        else:
+            rendered.append(item.as_bytes(compact=compact, canonical=canonical))
+    return rendered
+
+
+def _chunks(items, chunk_size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_many(items, factory=None, executor: (str | Executor | None) = 'process',
+                max_workers: (int | None) = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                compact: bool = True, canonical: bool = False):
+    """
+    Serialize many cards or messages in parallel, yielding UTF-8 JSON in input order.
+
+    Args:
+        items (iterable): AdaptiveCard/TeamsAdaptiveMessage (or any BaseObject)
+            instances, or data records when ``factory`` is given. With a process
+            pool they must be picklable, which cards holding a LazySequence aren't.
+        factory (callable, optional): Called with each record to produce the object
+            to serialize. It may also return ready-made ``str`` or ``bytes``.
+        executor (str/Executor, optional): 'process' (the default) or 'thread' to
+            create a pool for this call, an existing Executor to use (it is left
+            running), or None to render in the calling thread.
+        max_workers (int, optional): Pool size when a pool is created here. Defaults
+            to the concurrent.futures default.
+        chunk_size (int, optional): Number of items handed to a worker at a time.
+        compact (bool, optional): See BaseObject.as_bytes(). Defaults to True.
+        canonical (bool, optional): See BaseObject.as_bytes().
+
+    Yields:
+        bytes: The encoded JSON for each item, in the order of ``items``.
+
+    Raises:
+        ValueError: If ``executor`` or ``chunk_size`` is invalid.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    if executor is None:
+        for chunk in _chunks(items, chunk_size):
+            yield from _render_chunk(factory, chunk, compact, canonical)
+        return
+
+    if isinstance(executor, Executor):
+        pool, owned = executor, False
+    elif executor == 'process':
+        pool, owned = ProcessPoolExecutor(max_workers=max_workers), True
+    elif executor == 'thread':
+        pool, owned = ThreadPoolExecutor(max_workers=max_workers), True
+    else:
+        raise ValueError(f"Unknown executor: {executor!r}")
+
+    # Keep a bounded number of chunks in flight, so that arbitrarily long
+    # inputs are consumed lazily rather than submitted all at once.
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.submit(_render_chunk, factory, chunk, compact, canonical))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from functools import partial
+
+from .backends import JSONBackend
+from .base import BaseObject, add_mutation_listener, remove_mutation_listener
+from .compact import CompactNode
+from .serialization import (COMPACT, JSONFormat, _ENCODERS, _OBJECTS, _SCALARS, _compile,
+                            _encode_array, _write_object)
+
+# Subtree serialization cache.
+#
+# Dashboards tend to re-serialize the same card over and over with only
+# a value or two changed.  SerializationCache remembers the encoded JSON
+# fragment of every BaseObject it has serialized, and reuses it until
+# that object, or anything beneath it, is mutated.
+#
+# Invalidation relies on two pieces of bookkeeping: while encoding, the
+# cache records which object each object was found under, and it
+# registers a mutation listener with BaseObject.  When an object is
+# changed through item/attribute assignment or deletion, its fragment
+# and those of all its recorded ancestors are dropped.
+#
+# In-place changes to plain lists and dicts (e.g. card.body.append(x) or
+# submit.data['key'] = value) are NOT seen by the listener.  Either
+# assign a new list/dict to the attribute, or call invalidate() on the
+# owning object afterwards.
+#
+# A cache can be shared between threads, e.g. set as the process-wide
+# backend under render_many(executor='thread').  The object each value
+# was found under is passed down the encoder as an argument rather than
+# kept on the instance, and the bookkeeping is updated under a lock.
+# Changing a card while another thread serializes it is not supported,
+# with or without the cache.
+
+_TRACKED = (BaseObject, CompactNode)
+
+
+class SerializationCache(JSONBackend):
+    """
+    JSON backend that caches the encoded output of each object subtree.
+
+    Use it like any other backend, e.g. ``card.as_bytes(backend=cache)`` or
+    ``backends.set_backend(cache)``.  Call close() when done with it to stop
+    tracking mutations.
+    """
+    name = 'cache'
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._parents = {}
+        # Reentrant: a weak reference callback (_forget) can run in the
+        # middle of an update, when an allocation triggers the collector.
+        self._lock = threading.RLock()
+        add_mutation_listener(self._on_mutation)
+
+    def close(self) -> None:
+        """Stop tracking mutations and drop all cached fragments."""
+        remove_mutation_listener(self._on_mutation)
+        self.clear()
+
+    def __enter__(self) -> SerializationCache:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def clear(self) -> None:
+        """Drop all cached fragments and ancestry information."""
+        with self._lock:
+            self._entries.clear()
+            self._parents.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The hit and miss counters and the number of cached objects.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def invalidate(self, obj) -> None:
+        """
+        Drop the cached output of ``obj`` and of every object it was found under.
+
+        Needed after in-place changes to lists or dicts held by ``obj``, which
+        are not tracked automatically.
+
+        Args:
+            obj: A BaseObject or CompactNode.
+        """
+        entries = self._entries
+        parents = self._parents
+        pending = [id(obj)]
+        seen = set()
+        with self._lock:
+            while pending:
+                key = pending.pop()
+                if key in seen:
+                    continue
+                seen.add(key)
+                entries.pop(key, None)
+                pending.extend(parents.get(key, ()))
+
+    def _on_mutation(self, obj) -> None:
+        key = id(obj)
+        if key in self._entries or key in self._parents:
+            self.invalidate(obj)
+
+    def _forget(self, key: int) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._parents.pop(key, None)
+
+    def _write(self, value, fmt: JSONFormat, parts: list, level: int,
+               parent: (int | None) = None) -> None:
+        # ``parent`` is the id() of the nearest tracked object ``value`` is
+        # under, if any.
+        cls = value.__class__
+        scalar = _SCALARS.get(cls)
+        if scalar is not None:
+            parts.append(scalar(value))
+            return
+
+        layout = _OBJECTS.get(cls)
+        if layout is None:
+            if cls not in _ENCODERS:
+                _compile(cls)
+                self._write(value, fmt, parts, level, parent)
+                return
+            write = self._write if parent is None else partial(self._write, parent=parent)
+            _encode_array(value, fmt, parts, level, write)
+            return
+        if not isinstance(value, _TRACKED):
+            write = self._write if parent is None else partial(self._write, parent=parent)
+            _write_object(layout[0](value), fmt, parts, level, layout[1], write)
+            return
+
+        key = id(value)
+        if parent is not None:
+            with self._lock:
+                self._parents.setdefault(key, set()).add(parent)
+
+        # Without indentation the output doesn't depend on the nesting level.
+        slot = (fmt, level if fmt.indent is not None else 0)
+        entry = self._entries.get(key)
+        if entry is not None:
+            text = entry[1].get(slot)
+            if text is not None:
+                with self._lock:
+                    self.hits += 1
+                parts.append(text)
+                return
+
+        start = len(parts)
+        _write_object(layout[0](value), fmt, parts, level, layout[1],
+                      partial(self._write, parent=key))
+        text = ''.join(parts[start:])
+        del parts[start:]
+        parts.append(text)
+
+        with self._lock:
+            self.misses += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                # Hold only a weak reference, and forget the object once it's
+                # gone so that a new object reusing its id() can't pick up stale
+                # output.
+                reference = weakref.ref(value, lambda _, key=key: self._forget(key))
+                entry = self._entries[key] = (reference, {})
+            entry[1][slot] = text
+
+    def dumps(self, obj, fmt: JSONFormat = COMPACT) -> str:
+        parts = []
+        self._write(obj, fmt, parts, 0)
+        return ''.join(parts)
+
+    def dumps_bytes(self, obj, fmt: JSONFormat = COMPACT) -> bytes:
+        return self.dumps(obj, fmt).encode('ascii')
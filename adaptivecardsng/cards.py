@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from .base import BaseObject, BaseAction
-from .types import Refresh, Authentication, BackgroundImage
 from .enums import VerticalAlignment
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .types import Refresh, Authentication, BackgroundImage
+
 
 class AdaptiveCard(BaseObject):
     """
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from json.encoder import encode_basestring_ascii
+
+from .containers import Table, TableCell, TableRow
+from .elements import TextBlock
+from .serialization import JSONFormat, _write_value, register_array_type
+
+# Columnar bulk construction of Tables.
+#
+# A hand-built N x M Table holds N*M TableCells, each wrapping a
+# TextBlock with its own __dict__.  Table.from_columns() and
+# Table.from_rows() instead keep the caller's column sequences (lists,
+# tuples, array.array, NumPy arrays, ...) as they are, in a ColumnarRows
+# sequence that stands in for the Table's "rows" list.
+#
+# The compiled encoder writes ColumnarRows without creating any cells:
+# one row is built with placeholder texts and encoded once per output
+# format, which gives a template that each row of formatted, encoded
+# cell texts is substituted into.  Everything else that walks a card
+# (iteration, indexing, the other backends, to_dict()) sees ordinary
+# TableRow objects, built on demand.  Either way the output is exactly
+# that of the equivalent hand-built Table, described in from_columns().
+
+
+class _TextFormat:
+    # Turns cell values into text; a class rather than a closure so that
+    # tables can be pickled, e.g. for batch.render_many().
+    __slots__ = ('spec',)
+
+    def __init__(self, spec: (str | None), precision: (int | None)) -> None:
+        if spec is None and precision is not None:
+            spec = f'.{precision}f'
+        self.spec = spec
+
+    def __call__(self, value) -> str:
+        if value is None:
+            return ''
+        if self.spec is None:
+            return str(value)
+        return format(value, self.spec)
+
+
+def _per_column(option, names: list, what: str) -> list:
+    # A single value for every column, a sequence with one value per column,
+    # or a mapping keyed on the column names.
+    if isinstance(option, Mapping):
+        return [option.get(name) for name in names]
+    if isinstance(option, (list, tuple)):
+        if len(option) != len(names):
+            raise ValueError(f"Expected {len(names)} {what} values, got {len(option)}.")
+        return list(option)
+    return [option] * len(names)
+
+
+class ColumnarRows(Sequence):
+    """
+    The rows of a Table, stored column by column.
+
+    Created by Table.from_columns() and Table.from_rows(); behaves like a
+    read-only list of TableRow objects, which are built when accessed.
+    """
+
+    def __init__(self, columns: list, formatters: list, header: (list | None) = None,
+                 wrap: (bool | None) = None) -> None:
+        """
+        Args:
+            columns (list): One sequence of cell values per column, all the same length.
+            formatters (list): One callable per column, turning a value into cell text.
+            header (list, optional): Header row texts, one per column.
+            wrap (bool, optional): Whether the cell TextBlocks wrap.
+        """
+        lengths = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        self._columns = columns
+        self._formatters = formatters
+        self._header = header
+        self._wrap = wrap
+        self._count = lengths.pop() if lengths else 0
+        self._templates = {}
+
+    def _make_row(self, texts) -> TableRow:
+        return TableRow(cells=[TableCell(items=[TextBlock(text=text, wrap=self._wrap)])
+                               for text in texts])
+
+    def _row_texts(self, index: int) -> list:
+        return [formatter(column[index])
+                for column, formatter in zip(self._columns, self._formatters)]
+
+    def __len__(self) -> int:
+        return self._count + (self._header is not None)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('row index out of range')
+        if self._header is not None:
+            if index == 0:
+                return self._make_row(self._header)
+            index -= 1
+        return self._make_row(self._row_texts(index))
+
+    def __iter__(self):
+        if self._header is not None:
+            yield self._make_row(self._header)
+        for index in range(self._count):
+            yield self._make_row(self._row_texts(index))
+
+    def _template(self, fmt: JSONFormat, level: int) -> str:
+        # A %-format string for one encoded row, taking one encoded text per cell.
+        key = (fmt, level)
+        template = self._templates.get(key)
+        if template is None:
+            placeholders = [f'\0{position}\0' for position in range(len(self._columns))]
+            parts = []
+            _write_value(self._make_row(placeholders), fmt, parts, level)
+            template = ''.join(parts).replace('%', '%%')
+            for placeholder in placeholders:
+                template = template.replace(encode_basestring_ascii(placeholder), '%s')
+            self._templates[key] = template
+        return template
+
+    def _encoded_rows(self, template: str) -> list:
+        encoded = [list(map(encode_basestring_ascii, map(formatter, column)))
+                   for column, formatter in zip(self._columns, self._formatters)]
+        rows = [template % texts for texts in zip(*encoded)]
+        if self._header is not None:
+            rows.insert(0, template % tuple(map(encode_basestring_ascii, self._header)))
+        return rows
+
+
+def _encode_rows(rows: ColumnarRows, fmt: JSONFormat, parts: list, level: int) -> None:
+    if not len(rows):
+        parts.append('[]')
+        return
+
+    if fmt.indent is None:
+        separator = fmt.item_separator
+        opening = '['
+        closing = ']'
+    else:
+        level += 1
+        newline = fmt.newline(level)
+        separator = fmt.item_separator + newline
+        opening = '[' + newline
+        closing = fmt.newline(level - 1) + ']'
+
+    parts.append(opening)
+    parts.append(separator.join(rows._encoded_rows(rows._template(fmt, level))))
+    parts.append(closing)
+
+
+register_array_type(ColumnarRows, _encode_rows)
+
+
+def from_columns(columns: (Mapping | Sequence), headers: (Sequence | bool | None) = None,
+                 formats=None, precision=None, align=None, widths=1,
+                 wrap: (bool | None) = None, cls: type = Table, **kwargs) -> Table:
+    """
+    Build a Table from column data.
+
+    The result serializes exactly like a Table built by hand with
+    ``columns=[{'width': width, 'horizontalCellContentAlignment': align}, ...]``
+    (the alignment only where given), ``rows=[TableRow(cells=[TableCell(items=[
+    TextBlock(text=text, wrap=wrap)]), ...]), ...]`` and, when there is a header,
+    ``first_row_as_header=True``.
+
+    The per-column options take a single value for all columns, a list with one
+    value per column, or a dict keyed on the column names.
+
+    Args:
+        columns (dict/list): Column name to values, or a list of value sequences.
+            Values may be any sequence supporting len() and indexing, e.g. lists,
+            tuples, array.array or NumPy arrays.
+        headers (list/bool, optional): Header row texts, or True for the column names
+            (the default when ``columns`` is a dict). False or None for no header row.
+        formats (optional): format() specs for the values, e.g. ',.2f'.
+        precision (optional): Digits after the decimal point, where no format is given.
+        align (optional): HorizontalAlignment of the column's cell contents.
+        widths (optional): Width of each column. Defaults to 1 (equal widths).
+        wrap (bool, optional): Whether the cell texts wrap.
+        cls (type, optional): The Table subclass to build. Defaults to Table.
+        **kwargs: Passed on to Table(), e.g. show_grid_lines.
+
+    Returns:
+        Table: The table, with its rows held in a ColumnarRows sequence.
+    """
+    if isinstance(columns, Mapping):
+        names = list(columns)
+        data = list(columns.values())
+        if headers is None:
+            headers = True
+    else:
+        data = list(columns)
+        names = list(range(len(data)))
+    if headers is True:
+        headers = names
+    if headers is None or headers is False:
+        headers = None
+    else:
+        headers = [str(header) for header in headers]
+        if len(headers) != len(data):
+            raise ValueError(f"Expected {len(data)} headers, got {len(headers)}.")
+
+    formatters = [_TextFormat(spec, digits) for spec, digits in
+                  zip(_per_column(formats, names, 'format'),
+                      _per_column(precision, names, 'precision'))]
+    definitions = []
+    for width, alignment in zip(_per_column(widths, names, 'width'),
+                                _per_column(align, names, 'align')):
+        definition = {'width': width}
+        if alignment:
+            definition['horizontalCellContentAlignment'] = alignment
+        definitions.append(definition)
+
+    rows = ColumnarRows(data, formatters, headers, wrap)
+    return cls(columns=definitions, rows=rows, first_row_as_header=headers is not None,
+               **kwargs)
+
+
+def from_rows(rows: Sequence, headers: (Sequence | None) = None, cls: type = Table,
+              **kwargs) -> Table:
+    """
+    Build a Table from row data; see from_columns() for the options.
+
+    Args:
+        rows (list): A sequence of rows, each a sequence with one value per column,
+            e.g. a list of tuples or a 2-D NumPy array.
+        headers (list, optional): Header row texts.
+        cls (type, optional): The Table subclass to build. Defaults to Table.
+        **kwargs: Passed on to from_columns().
+
+    Returns:
+        Table: The table, with its data transposed into columns.
+    """
+    columns = [list(column) for column in zip(*rows)]
+    return from_columns(columns, headers=headers, cls=cls, **kwargs)
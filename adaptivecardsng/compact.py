@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import enum
+
+from .base import BaseObject, _mutation_listeners, _notify_mutation
+
+# Compact, memory-efficient node representation for large card trees.
+#
+# Every BaseObject keeps its state in a per-instance __dict__, which is
+# the bulk of the memory used by big cards (a 2,000-row Table holds tens
+# of thousands of nodes).  compact() converts a finished tree into
+# CompactNode objects, which use __slots__ and no __dict__.
+#
+# The keys of a node, together with the values that are the same for
+# most instances (the 'type' string, Enum members, booleans and None),
+# are held in a Shape shared by every node with the same layout.  Only
+# the remaining values are stored on the node itself: directly when
+# there is just one (e.g. a TextBlock's text), otherwise as a tuple.
+#
+# Child lists are stored as tuples, which are smaller and don't
+# over-allocate, so a compacted tree is read-only in that respect:
+# assign a new list rather than appending to one.  A node whose only
+# varying value is a single child (a TableCell holding one TextBlock,
+# say) stores that child directly and leaves the one-element tuple to
+# be rebuilt on access.
+#
+# Equal string values of a tree (a Column's width, a Fact's title) are
+# stored once.
+#
+# The __weakref__ slot stays: the size, fingerprint and serialization
+# caches hold their entries by weak reference.
+#
+# CompactNodes keep the mapping protocol of BaseObject and serialize
+# identically, but they are not instances of the original classes.  Use
+# CompactNode.expand() to get the regular objects back, with lists.
+
+
+# Keys whose values are fixed by the class rather than by the instance.
+_SHARED_KEYS = frozenset(('type', 'version', '$schema'))
+
+_SHAPES = {}
+
+
+def _is_shared(key, value) -> bool:
+    if value is None or value.__class__ is bool or isinstance(value, enum.Enum):
+        return True
+    return key in _SHARED_KEYS and value.__class__ is str
+
+
+class Shape:
+    """
+    Shared key table describing the layout of a group of CompactNodes.
+
+    Shapes are interned, so all nodes with the same class, keys and shared
+    values point at a single Shape instance.
+    """
+    __slots__ = ('cls', 'keys', 'constants', 'index', 'size', 'single')
+
+    def __init__(self, cls: type, keys: tuple, constants: dict,
+                 single: bool = False) -> None:
+        """
+        Args:
+            cls (type): The BaseObject class the nodes were compacted from.
+            keys (tuple): All keys of the node, in insertion order.
+            constants (dict): Keys whose values are shared, and those values.
+            single (bool, optional): Whether the only varying value is a
+                one-element tuple, stored as its element.
+        """
+        self.cls = cls
+        self.keys = keys
+        self.constants = constants
+        varying = [key for key in keys if key not in constants]
+        self.index = {key: position for position, key in enumerate(varying)}
+        self.size = len(varying)
+        self.single = single
+
+    def pack(self, state: dict) -> object:
+        """Return the per-node storage for the non-shared values of ``state``."""
+        if self.size == 1:
+            for key in self.index:
+                return state[key][0] if self.single else state[key]
+        return tuple(state[key] for key in self.index)
+
+    def unpack(self, values) -> dict:
+        """Rebuild the full key/value mapping of a node from its stored values."""
+        constants = self.constants
+        index = self.index
+        if self.size == 1:
+            if self.single:
+                values = (values,)
+            return {key: constants[key] if key in constants else values
+                    for key in self.keys}
+        return {key: constants[key] if key in constants else values[index[key]]
+                for key in self.keys}
+
+    def lookup(self, values, key) -> object:
+        """Return the value of ``key`` for a node; raises KeyError if absent."""
+        if key in self.constants:
+            return self.constants[key]
+        position = self.index[key]
+        if self.size == 1:
+            return (values,) if self.single else values
+        return values[position]
+
+
+def _shape_for(cls: type, state: dict) -> Shape:
+    constants = tuple((key, value) for key, value in state.items()
+                      if _is_shared(key, value))
+    single = False
+    if len(state) - len(constants) == 1:
+        for key, value in state.items():
+            if not _is_shared(key, value):
+                single = value.__class__ is tuple and len(value) == 1
+    signature = (cls, tuple(state), constants, single)
+    shape = _SHAPES.get(signature)
+    if shape is None:
+        shape = _SHAPES[signature] = Shape(cls, signature[1], dict(constants), single)
+    return shape
+
+
+class CompactNode:
+    """
+    Slotted stand-in for a BaseObject, created by compact().
+
+    Supports the same mapping protocol as BaseObject (``node[key]``, ``in``,
+    iteration, ``len``, ``insert``) plus attribute access, and serializes
+    exactly as the original object would.
+    """
+    __slots__ = ('_shape', '_values', '__weakref__')
+
+    def __init__(self, cls: type, state: dict) -> None:
+        """
+        Args:
+            cls (type): The BaseObject class being compacted.
+            state (dict): The object's attributes, with children already compacted.
+        """
+        shape = _shape_for(cls, state)
+        object.__setattr__(self, '_shape', shape)
+        object.__setattr__(self, '_values', shape.pack(state))
+
+    @property
+    def __dict__(self) -> dict:
+        # A snapshot, so that json_default() and BaseObjectJSONEncoder can
+        # encode compact nodes.  Changes to it are not written back.
+        return self._shape.unpack(self._values)
+
+    @property
+    def node_class(self) -> type:
+        """The BaseObject class this node was compacted from."""
+        return self._shape.cls
+
+    def _replace(self, state: dict) -> None:
+        shape = _shape_for(self._shape.cls, state)
+        object.__setattr__(self, '_shape', shape)
+        object.__setattr__(self, '_values', shape.pack(state))
+        if _mutation_listeners:
+            _notify_mutation(self)
+
+    def __reduce__(self):
+        return CompactNode, (self._shape.cls, self.__dict__)
+
+    def __getattr__(self, name) -> object:
+        if name in CompactNode.__slots__:
+            raise AttributeError(name)
+        try:
+            return self._shape.lookup(self._values, name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value) -> None:
+        self.__setitem__(name, value)
+
+    def __delattr__(self, name) -> None:
+        try:
+            self.__delitem__(name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setitem__(self, key, value) -> None:
+        state = self.__dict__
+        state[key] = value
+        self._replace(state)
+
+    def __getitem__(self, key) -> object:
+        return self._shape.lookup(self._values, key)
+
+    def __delitem__(self, key) -> None:
+        state = self.__dict__
+        del state[key]
+        self._replace(state)
+
+    def __contains__(self, key) -> bool:
+        return key in self._shape.constants or key in self._shape.index
+
+    def __iter__(self) -> iter:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._shape.keys)
+
+    def insert(self, key, value):
+        if key not in self:
+            self.__setitem__(key, value)
+        else:
+            raise ValueError("Specified key already exists.")
+
+    __str__ = BaseObject.__str__
+    __repr__ = BaseObject.__repr__
+    as_json = BaseObject.as_json
+    as_bytes = BaseObject.as_bytes
+    iter_bytes = BaseObject.iter_bytes
+    dump = BaseObject.dump
+    to_dict = BaseObject.to_dict
+    encoded_size = BaseObject.encoded_size
+    fingerprint = BaseObject.fingerprint
+    derive = BaseObject.derive
+    __eq__ = BaseObject.__eq__
+    __hash__ = BaseObject.__hash__
+
+    def expand(self) -> BaseObject:
+        """
+        Convert this node, and any compact nodes beneath it, back to regular objects.
+
+        Returns:
+            BaseObject: An instance of the original class.
+        """
+        return expand(self)
+
+
+def _convert(value, node_factory, array: type):
+    # Converts the nodes under ``value``, with lists and tuples as ``array``.
+    if isinstance(value, (BaseObject, CompactNode)):
+        return node_factory(value)
+    if value.__class__ is list or value.__class__ is tuple:
+        if array is tuple:
+            return tuple([_convert(item, node_factory, array) for item in value])
+        # Copy then fill in place: unlike a comprehension, this doesn't
+        # over-allocate the new list.
+        converted = list(value)
+        for position, item in enumerate(value):
+            converted[position] = _convert(item, node_factory, array)
+        return converted
+    if value.__class__ is dict:
+        return {key: _convert(item, node_factory, array) for key, item in value.items()}
+    return value
+
+
+class _Compactor:
+    # The node factory for compact(), with the tree's string values.
+    __slots__ = ('strings',)
+
+    def __init__(self) -> None:
+        self.strings = {}
+
+    def __call__(self, obj) -> CompactNode:
+        if isinstance(obj, CompactNode):
+            return obj
+        strings = self.strings
+        state = {}
+        for key, value in obj.__dict__.items():
+            if value.__class__ is str:
+                # One copy of each string value for the whole tree.
+                state[key] = strings.setdefault(value, value)
+            else:
+                state[key] = _convert(value, self, tuple)
+        return CompactNode(obj.__class__, state)
+
+
+def _expand_node(obj) -> BaseObject:
+    if isinstance(obj, CompactNode):
+        cls = obj.node_class
+        state = obj.__dict__
+    else:
+        cls = obj.__class__
+        state = obj.__dict__
+    expanded = cls.__new__(cls)
+    expanded.__dict__.update({key: _convert(value, _expand_node, list)
+                              for key, value in state.items()})
+    return expanded
+
+
+def compact(obj):
+    """
+    Convert a BaseObject tree into CompactNodes.
+
+    Nested objects are converted recursively, including those held in lists and
+    dicts; lists become tuples.  The original tree is left untouched.
+
+    Args:
+        obj: A BaseObject, or a list/dict containing them.
+
+    Returns:
+        The compacted equivalent of ``obj``.
+    """
+    return _convert(obj, _Compactor(), tuple)
+
+
+def expand(obj):
+    """
+    Convert CompactNodes in a tree back into regular BaseObject instances.
+
+    Arrays come back as lists.
+
+    Args:
+        obj: A CompactNode or BaseObject, or a list/dict containing them.
+
+    Returns:
+        The expanded equivalent of ``obj``.
+    """
+    return _convert(obj, _expand_node, list)
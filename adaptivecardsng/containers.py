@@ -5,11 +5,13 @@ from .base import BaseAction, BaseSet, BaseContainer, BaseElement, BaseObject
 from .enums import BlockElementHeight, Spacing, ContainerStyle
 from .enums import VerticalAlignment, HorizontalAlignment, ImageSize
 
-from .elements import Image
+from .lazy import elements, more_text
 
-from .actions import Execute, OpenUrl, Submit, ToggleVisibility
-
-from .types import BackgroundImage
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .elements import Image
+    from .actions import Execute, OpenUrl, Submit, ToggleVisibility
+    from .types import BackgroundImage
 
 
 class ActionSet(BaseSet):
@@ -42,10 +44,12 @@ class Container(BaseContainer):
                  height: (str | BlockElementHeight | None) = None,
                  separator: (bool | None) = None, spacing: (str | Spacing | None) = None,
                  id: (str | None) = None, visible: bool = True,
-                 requires: (dict | None) = None, *args, **kwargs) -> None:
+                 requires: (dict | None) = None, *args,
+                 # Items may be any iterable, consumed lazily; see lazy.py.
+                 item_limit: (int | None) = None, **kwargs) -> None:
         super(Container, self).__init__("Container", fallback, height, separator, spacing, id,
                                         visible, requires, *args, **kwargs)
-        self.items = items
+        self.items = elements(items, item_limit, more_text)
         if select_action:
             self.selectAction = select_action
         if style:
@@ -55,11 +59,11 @@ class Container(BaseContainer):
         if bleed:
             self.bleed = bleed
         if background_image:
-            self.backgroundIMage = background_image
+            self.backgroundImage = background_image
         if min_height:
             self.minHeight = min_height
         if rtl:
-            self.__dict__['rtl?'] = rtl
+            self.rtl = rtl
 
 
 class Column(BaseObject):
@@ -77,6 +81,7 @@ class Column(BaseObject):
                  id: (str | None) = None, visible: bool = True,
                  requires: (dict | None) = None, *args, **kwargs) -> None:
         super(Column, self).__init__(*args, **kwargs)
+        self.type = 'Column'
         if items:
             self.items = items
         if background_image:
@@ -188,7 +193,7 @@ class TableCell(BaseContainer):
                  background_image: (str | BackgroundImage | None) = None,
                  min_height: (str | None) = None,
                  rtl: (bool | None) = None, *args, **kwargs):
-        super(TableCell, self).__init__(*args, **kwargs)
+        super(TableCell, self).__init__("TableCell", *args, **kwargs)
         self.items = items
         if select_action:
             self.selectAction = select_action
@@ -203,7 +208,7 @@ class TableCell(BaseContainer):
         if min_height:
             self.minHeight = min_height
         if rtl:
-            self.__dict__['rtl?'] = rtl
+            self.rtl = rtl
 
 
 class TableRow(BaseObject):
@@ -224,11 +229,16 @@ class TableRow(BaseObject):
             self.verticalCellContentAlignment = vertical_cell_content_alignment
 
 
+def _more_rows(count: int) -> TableRow:
+    # Trailer row of a Table whose rows were cut short by row_limit.
+    return TableRow(cells=[TableCell(items=[more_text(count)])])
+
+
 class Table(BaseContainer):
     def __init__(self,
                  # Table specific items
                  columns: (list | dict | None) = None,
-                 rows: (TableRow | None) = None,
+                 rows: (list[TableRow] | None) = None,
                  first_row_as_header: (bool | None) = None,
                  show_grid_lines: (bool | None) = None,
                  grid_style: (ContainerStyle | None) = None,
@@ -239,11 +249,14 @@ class Table(BaseContainer):
                  height: (str | BlockElementHeight | None) = None,
                  separator: (bool | None) = False, spacing: (str | Spacing | None) = None,
                  id: (str | None) = None, visible: bool = True,
-                 requires: (dict | None) = None, *args, **kwargs) -> None:
-        super(Table, self).__init__("Container", fallback, height, separator, spacing, id,
+                 requires: (dict | None) = None, *args,
+                 # Rows may be any iterable, consumed lazily; see lazy.py.
+                 row_limit: (int | None) = None, **kwargs) -> None:
+        super(Table, self).__init__("Table", fallback, height, separator, spacing, id,
                                     visible, requires, *args, **kwargs)
         if columns:
             self.columns = columns
+        rows = elements(rows, row_limit, _more_rows)
         if rows:
             self.rows = rows
         if first_row_as_header:
@@ -256,3 +269,24 @@ class Table(BaseContainer):
             self.horizontalCellContentAlignment = horizontal_cell_content_alignment
         if vertical_cell_content_alignment:
             self.verticalCellContentAlignment = vertical_cell_content_alignment
+
+    @classmethod
+    def from_columns(cls, columns, **kwargs) -> Table:
+        """
+        Build a Table from column data without creating a cell object per value.
+
+        See columnar.from_columns() for the arguments.
+        """
+        # Imported here: columnar depends on this module.
+        from .columnar import from_columns
+        return from_columns(columns, cls=cls, **kwargs)
+
+    @classmethod
+    def from_rows(cls, rows, **kwargs) -> Table:
+        """
+        Build a Table from row data, stored column by column.
+
+        See columnar.from_rows() for the arguments.
+        """
+        from .columnar import from_rows
+        return from_rows(rows, cls=cls, **kwargs)
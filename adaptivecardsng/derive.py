@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from .base import BaseObject
+from .compact import CompactNode
+from .diff import PatchError, _child, _index, _parse_pointer
+from .interning import is_shared
+from .serialization import _ARRAYS, _ONE_SHOT
+
+# Copy-on-write variants of card trees.
+#
+# derive() returns a variant of a tree with a few members changed,
+# given as {JSON pointer: new value}.  Only the objects and arrays on
+# the paths from the root to the changes are copied, one level each;
+# everything else is shared between the original and the variant.
+# Deriving a per-recipient variant of a large card that changes a
+# greeting and a Submit payload therefore costs a handful of shallow
+# copies instead of a deepcopy() of the whole tree.
+#
+# Because unchanged subtrees are shared, changing one of them in place
+# changes every variant that shares it; derive again instead, or
+# intern() the base card first so that shared objects refuse changes.
+# New values are used as they are, not copied.
+#
+# Shared objects keep what the caches remember about them: a variant
+# only re-measures (sizing.py) and re-hashes (fingerprint.py) the
+# copies on the changed paths.
+#
+# Arrays on a changed path are copied as lists, so tuples (from
+# interning) and ColumnarRows are materialized there; frozen objects on
+# a path are copied as instances of their original, mutable class.
+#
+# A LazySequence can only be read once, so it can be neither copied
+# nor shared: one on a changed path, or held directly by the root, is
+# refused with a PatchError.  Looking for them anywhere else would mean
+# walking the whole tree, so a LazySequence deeper in an unchanged
+# subtree ends up shared, and only the first of the base card and its
+# variants to be serialized gets its elements.  Build such cards with
+# lists if they are to be derived from.
+
+# Pass as a value to remove the member or array element at that path.
+REMOVE = object()
+
+
+def _copy(value):
+    # A shallow copy that can be changed.
+    if isinstance(value, BaseObject):
+        cls = value.__class__
+        if is_shared(value):
+            cls = cls.__bases__[0]
+        copy = cls.__new__(cls)
+        copy.__dict__.update(value.__dict__)
+        return copy
+    if isinstance(value, CompactNode):
+        return CompactNode(value.node_class, value.__dict__)
+    if isinstance(value, dict):
+        return dict(value)
+    if value.__class__ in _ONE_SHOT:
+        raise PatchError(f"Can't copy a {value.__class__.__name__}, which can only be "
+                         f"read once; pass a list instead")
+    if isinstance(value, (list, tuple)) or value.__class__ in _ARRAYS:
+        return list(value)
+    raise PatchError(f"Can't descend into {value.__class__.__name__}")
+
+
+def _set(container, token: str, value) -> None:
+    if isinstance(container, list):
+        index = _index(container, token, insert=value is not REMOVE)
+        if value is REMOVE:
+            del container[index]
+        elif index == len(container):
+            container.append(value)
+        else:
+            container[index] = value
+    elif value is REMOVE:
+        try:
+            del container[token]
+        except KeyError:
+            raise PatchError(f"No member {token!r}") from None
+    else:
+        container[token] = value
+
+
+def derive(obj, changes: dict):
+    """
+    Return a variant of ``obj`` with the given changes, sharing everything else.
+
+    Args:
+        obj: A BaseObject tree, e.g. an AdaptiveCard.
+        changes (dict): ``{JSON pointer: value}``, e.g.
+            ``{'/body/0/text': 'Hello, Ann', '/actions/0/data': {'user': 'ann'}}``.
+            A pointer names an object member (added or replaced), an array index
+            (replaced) or ``-`` (appended). Use REMOVE as the value to remove the
+            member or element instead.
+
+    Returns:
+        A new root object; ``obj`` is left unchanged.
+
+    Raises:
+        PatchError: If a pointer is invalid or doesn't lead into the tree, or if a
+            LazySequence is on the path to a change or held by ``obj`` itself.
+    """
+    if isinstance(obj, (BaseObject, CompactNode)):
+        for member in obj.__dict__.values():
+            if member.__class__ in _ONE_SHOT:
+                raise PatchError(f"Can't share a {member.__class__.__name__} held by "
+                                 f"the root, which can only be read once")
+    root = _copy(obj)
+    # Ids of the copies made so far, which later changes can modify in
+    # place; they are all reachable from ``root``, so the ids stay valid.
+    copies = {id(root)}
+    for pointer, value in changes.items():
+        tokens = _parse_pointer(pointer)
+        if not tokens:
+            raise PatchError("The root can't be replaced")
+        container = root
+        for token in tokens[:-1]:
+            child = _child(container, token)
+            if id(child) not in copies:
+                child = _copy(child)
+                copies.add(id(child))
+                _set(container, token, child)
+            container = child
+        _set(container, tokens[-1], value)
+    return root
@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import copy
+
+from .fingerprint import _TRACKED, _digest, _hash
+from .serialization import _ARRAYS, _ENCODERS, _OBJECTS, _SCALARS, _compile, _key_text, to_dict
+
+# Structural diff and patch of card trees, as RFC 6902 JSON Patch.
+#
+# diff() compares two trees the way they serialize: Enum members equal
+# their wire strings, tuples equal lists, and key order is ignored.
+# Every subtree gets a digest, computed bottom-up once per subtree, and
+# subtrees with equal digests are skipped without being walked, so the
+# cost of a diff is dominated by hashing the two trees rather than by
+# comparing them.  The digests of BaseObjects are their fingerprints
+# (see fingerprint.py), which are remembered until the object changes,
+# so diffing a card against its previous version only hashes what was
+# changed or added.  As there, in-place changes to plain lists and dicts
+# need an invalidate() call.
+#
+# Arrays are compared in three steps:
+#
+#   - The common leading and trailing elements are skipped, which makes
+#     appends and single insertions cheap.
+#   - The remaining elements are matched by their "id" property where
+#     they have one, and otherwise by equal digests, then pairwise in
+#     order among elements with the same "type".
+#   - Unmatched old elements are removed, matched elements are moved to
+#     their new positions ("move" operations) and diffed recursively,
+#     and unmatched new elements are added.
+#
+# So reordering elements that carry ids yields a few moves rather than
+# a rewrite of the whole array.
+#
+# apply_patch() applies a patch to either a BaseObject tree or plain
+# JSON data, in place.
+
+_SCALAR = 0
+_OBJECT = 1
+_ARRAY = 2
+
+
+def _pointer_token(key) -> str:
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+class _Differ:
+    # Holds the digests of plain lists and dicts, and the array views,
+    # computed during one diff() call.
+    # Entries keep their objects alive, so id() keys can't be reused.
+    def __init__(self) -> None:
+        self._digests = {}
+        self._arrays = {}
+        self.operations = []
+
+    def view(self, value) -> tuple:
+        cls = value.__class__
+        scalar = _SCALARS.get(cls)
+        if scalar is not None:
+            return _SCALAR, scalar(value)
+        layout = _OBJECTS.get(cls)
+        if layout is not None:
+            return _OBJECT, layout[0](value)
+        if cls not in _ENCODERS:
+            _compile(cls)
+            return self.view(value)
+        if cls is list:
+            return _ARRAY, value
+        entry = self._arrays.get(id(value))
+        if entry is None:
+            entry = self._arrays[id(value)] = (value, list(value))
+        return _ARRAY, entry[1]
+
+    def digest(self, value) -> str:
+        # As in fingerprint.py, which remembers the digests of BaseObjects.
+        scalar = _SCALARS.get(value.__class__)
+        if scalar is not None:
+            return scalar(value)
+        if isinstance(value, _TRACKED):
+            return _digest(value)
+        entry = self._digests.get(id(value))
+        if entry is not None:
+            return entry[1]
+
+        kind, data = self.view(value)
+        digest = self.digest
+        if kind == _OBJECT:
+            keys = _OBJECTS[value.__class__][1]
+            members = sorted([f'{_key_text(key, keys)}:{digest(item)}'
+                              for key, item in data.items()])
+            text = '{' + ','.join(members) + '}'
+        else:
+            text = '[' + ','.join([digest(item) for item in data]) + ']'
+        result = _hash(text)
+        self._digests[id(value)] = (value, result)
+        return result
+
+    def emit(self, op: str, path: str, value=None, source: (str | None) = None) -> None:
+        operation = {'op': op, 'path': path}
+        if source is not None:
+            operation['from'] = source
+        if op in ('add', 'replace'):
+            operation['value'] = to_dict(value)
+        self.operations.append(operation)
+
+    def compare(self, old, new, path: str) -> None:
+        if self.digest(old) == self.digest(new):
+            return
+        old_kind, old_data = self.view(old)
+        new_kind, new_data = self.view(new)
+        if old_kind != new_kind or old_kind == _SCALAR:
+            self.emit('replace', path, new)
+        elif old_kind == _OBJECT:
+            self.compare_objects(old_data, new_data, path)
+        else:
+            self.compare_arrays(old_data, new_data, path)
+
+    def compare_objects(self, old: dict, new: dict, path: str) -> None:
+        for key in old:
+            if key not in new:
+                self.emit('remove', f'{path}/{_pointer_token(key)}')
+        for key, value in new.items():
+            if key in old:
+                self.compare(old[key], value, f'{path}/{_pointer_token(key)}')
+            else:
+                self.emit('add', f'{path}/{_pointer_token(key)}', value)
+
+    def _identity(self, value) -> tuple:
+        # (id, type) of an array element, for matching.
+        kind, data = self.view(value)
+        if kind != _OBJECT:
+            return None, None
+        identifier = data.get('id')
+        return identifier if isinstance(identifier, str) else None, data.get('type')
+
+    def compare_arrays(self, old: list, new: list, path: str) -> None:
+        digest = self.digest
+        start = 0
+        limit = min(len(old), len(new))
+        while start < limit and digest(old[start]) == digest(new[start]):
+            start += 1
+        old_end = len(old)
+        new_end = len(new)
+        while old_end > start and new_end > start and \
+                digest(old[old_end - 1]) == digest(new[new_end - 1]):
+            old_end -= 1
+            new_end -= 1
+        if start == old_end and start == new_end:
+            return
+
+        old_middle = range(start, old_end)
+        new_middle = range(start, new_end)
+        matches = {}   # new index -> old index
+        matched = set()
+
+        by_id = {}
+        by_digest = {}
+        for index in old_middle:
+            identifier, _ = self._identity(old[index])
+            if identifier is not None:
+                by_id.setdefault(identifier, index)
+            else:
+                by_digest.setdefault(digest(old[index]), []).append(index)
+        unmatched = []
+        for index in new_middle:
+            identifier, _ = self._identity(new[index])
+            if identifier is not None:
+                candidate = by_id.pop(identifier, None)
+            else:
+                candidates = by_digest.get(digest(new[index]))
+                candidate = candidates.pop(0) if candidates else None
+            if candidate is None:
+                unmatched.append(index)
+            else:
+                matches[index] = candidate
+                matched.add(candidate)
+
+        # Pair the rest in order, among elements without an id and of the same type.
+        spare = {}
+        for index in old_middle:
+            if index not in matched:
+                identifier, kind = self._identity(old[index])
+                if identifier is None:
+                    spare.setdefault(kind, []).append(index)
+        for index in unmatched:
+            identifier, kind = self._identity(new[index])
+            candidates = spare.get(kind) if identifier is None else None
+            if candidates:
+                candidate = candidates.pop(0)
+                matches[index] = candidate
+                matched.add(candidate)
+
+        for index in reversed(old_middle):
+            if index not in matched:
+                self.emit('remove', f'{path}/{index}')
+
+        # Old indices of the surviving elements, in their current order.
+        current = [index for index in old_middle if index in matched]
+        for position, index in enumerate(new_middle):
+            target = start + position
+            candidate = matches.get(index)
+            if candidate is None:
+                self.emit('add', f'{path}/{target}', new[index])
+                current.insert(position, None)
+                continue
+            found = current.index(candidate, position)
+            if found != position:
+                self.emit('move', f'{path}/{target}', source=f'{path}/{start + found}')
+                current.insert(position, current.pop(found))
+            self.compare(old[candidate], new[index], f'{path}/{target}')
+
+
+def diff(old, new) -> list[dict]:
+    """
+    Compute the JSON Patch that turns one card tree into another.
+
+    Args:
+        old: The previous card (or any BaseObject tree, or plain JSON data).
+        new: The new card.
+
+    Returns:
+        list: RFC 6902 operations, as dicts ready for json.dumps(); empty if both
+        trees serialize to the same document.
+    """
+    differ = _Differ()
+    differ.compare(old, new, '')
+    return differ.operations
+
+
+class PatchError(ValueError):
+    """Raised when a patch can't be applied to a document."""
+
+
+def _parse_pointer(pointer: str) -> list:
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _child(container, token: str):
+    if isinstance(container, list):
+        try:
+            return container[_index(container, token)]
+        except IndexError:
+            raise PatchError(f"Index {token} out of range") from None
+    try:
+        return container[token]
+    except (KeyError, TypeError):
+        raise PatchError(f"No member {token!r}") from None
+
+
+def _index(array: list, token: str, insert: bool = False) -> int:
+    if insert and token == '-':
+        return len(array)
+    if not token.isdigit() or (token != '0' and token.startswith('0')):
+        raise PatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not insert):
+        raise PatchError(f"Index {index} out of range")
+    return index
+
+
+def _mutable(owner, token, container):
+    # Arrays held as tuples or lazy sequences become lists before being changed.
+    if isinstance(container, (*_TRACKED, dict, list)):
+        return container
+    if isinstance(container, tuple) or container.__class__ in _ARRAYS:
+        container = list(container)
+        if isinstance(owner, list):
+            owner[int(token)] = container
+        else:
+            owner[token] = container
+        return container
+    raise PatchError(f"Can't descend into {container.__class__.__name__}")
+
+
+class _Target:
+    # The container a path points into, and the key within it.
+    def __init__(self, document, pointer: str) -> None:
+        tokens = _parse_pointer(pointer)
+        if not tokens:
+            raise PatchError("The root can't be used here")
+        owner = None
+        owner_token = None
+        container = document
+        for token in tokens[:-1]:
+            container = _mutable(owner, owner_token, container)
+            owner, owner_token = container, token
+            container = _child(container, token)
+        self.container = _mutable(owner, owner_token, container)
+        self.owner = owner
+        self.owner_token = owner_token
+        self.token = tokens[-1]
+
+    def touched(self) -> None:
+        # In-place list changes aren't seen by mutation listeners (caches,
+        # size accounting), so assign the list back to its owner.
+        if isinstance(self.container, list) and self.owner is not None:
+            if isinstance(self.owner, list):
+                self.owner[int(self.owner_token)] = self.container
+            else:
+                self.owner[self.owner_token] = self.container
+
+    def get(self):
+        return _child(self.container, self.token)
+
+    def add(self, value) -> None:
+        if isinstance(self.container, list):
+            self.container.insert(_index(self.container, self.token, insert=True), value)
+            self.touched()
+        else:
+            self.container[self.token] = value
+
+    def remove(self):
+        value = self.get()
+        if isinstance(self.container, list):
+            del self.container[_index(self.container, self.token)]
+            self.touched()
+        else:
+            del self.container[self.token]
+        return value
+
+    def replace(self, value) -> None:
+        if isinstance(self.container, list):
+            self.container[_index(self.container, self.token)] = value
+            self.touched()
+        else:
+            self.get()
+            self.container[self.token] = value
+
+
+def _value(document, value):
+    # Values added to a BaseObject tree are rebuilt as BaseObjects too.
+    if isinstance(document, _TRACKED) and isinstance(value, (dict, list)):
+        from .parsing import from_dict
+        return from_dict(value)
+    return copy.deepcopy(value)
+
+
+def apply_patch(document, patch: list[dict]):
+    """
+    Apply a JSON Patch to a card tree or plain JSON data, in place.
+
+    Supports all RFC 6902 operations (add, remove, replace, move, copy, test).
+    Objects added to a BaseObject tree are rebuilt with parsing.from_dict().
+
+    Args:
+        document: A BaseObject tree or decoded JSON.
+        patch (list): The operations, e.g. as returned by diff().
+
+    Returns:
+        The patched document; a different object only if the patch replaces
+        the whole document.
+
+    Raises:
+        PatchError: If an operation can't be applied, or a "test" fails.  Earlier
+            operations are not rolled back.
+    """
+    for operation in patch:
+        try:
+            op = operation['op']
+            path = operation['path']
+        except KeyError as missing:
+            raise PatchError(f"Operation is missing {missing}") from None
+
+        if path == '':
+            if op in ('add', 'replace'):
+                document = _value(document, operation['value'])
+                continue
+            if op == 'test':
+                if diff(document, operation['value']):
+                    raise PatchError("Test failed at ''")
+                continue
+            if op in ('move', 'copy'):
+                document = _Target(document, operation['from']).get()
+                if op == 'copy':
+                    document = copy.deepcopy(document)
+                continue
+            raise PatchError(f"Can't {op} the root")
+
+        if op == 'add':
+            _Target(document, path).add(_value(document, operation['value']))
+        elif op == 'remove':
+            _Target(document, path).remove()
+        elif op == 'replace':
+            _Target(document, path).replace(_value(document, operation['value']))
+        elif op == 'move':
+            source = operation['from']
+            if path.startswith(source + '/'):
+                raise PatchError(f"Can't move {source!r} into itself")
+            value = _Target(document, source).remove()
+            _Target(document, path).add(value)
+        elif op == 'copy':
+            value = _Target(document, operation['from']).get()
+            _Target(document, path).add(copy.deepcopy(value))
+        elif op == 'test':
+            if diff(_Target(document, path).get(), operation['value']):
+                raise PatchError(f"Test failed at {path!r}")
+        else:
+            raise PatchError(f"Unknown operation {op!r}")
+    return document
@@ -7,7 +7,9 @@ from .enums import FontSize, FontWeight, TextBlockStyle
 from .enums import BlockElementHeight, Spacing, ImageSize
 from .enums import ImageStyle
 
-from .actions import Execute, OpenUrl, Submit, ToggleVisibility
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .actions import Execute, OpenUrl, Submit, ToggleVisibility
 
 
 class TextBlock(BaseElement):
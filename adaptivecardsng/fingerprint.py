@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import weakref
+from hashlib import blake2b
+
+from .base import BaseObject, add_mutation_listener, remove_mutation_listener
+from .compact import CompactNode
+from .serialization import (CANONICAL, JSONFormat, _ENCODERS, _OBJECTS, _ONE_SHOT, _SCALARS,
+                            _compile, _encode_array, _key_text, _write_object, one_shot_error)
+
+# Content fingerprints (Merkle hashes) of card trees.
+#
+# fingerprint() hashes the canonical JSON form of a tree bottom-up: the
+# digest of an object or array is a BLAKE2b hash of its canonical
+# encoding in which every nested object or array is replaced by its own
+# digest.  Two trees have the same fingerprint exactly when they
+# serialize to the same JSON up to key order (Enum members count as
+# their wire strings, tuples as lists), in any process and on any
+# version of Python.
+#
+# The digest of every BaseObject is remembered once computed, with the
+# same parent bookkeeping as sizing.py: a mutation listener drops the
+# digest of a changed object and of everything above it.  Fingerprinting
+# an unchanged tree again is a single lookup, and after a change only
+# the path from the changed object to the root is hashed again.
+#
+# BaseObject and CompactNode equality and hashing are defined on the
+# same content, so ``card == other`` compares content, and cards can be
+# used as set members and dict keys.  As with any mutable key, don't
+# change an object while it is in a set or used as a key: it won't be
+# found again.  Both work on the canonical encoding directly rather than
+# on fingerprints, and remember nothing: Python calls them implicitly,
+# from every dict and set operation, and they shouldn't register the
+# listener (and so slow down every object constructed afterwards) or
+# remember digests of throwaway cards.  Call fingerprint() explicitly
+# for a remembered hash, e.g. to find duplicate payloads in bulk.
+#
+# One-shot arrays (LazySequence) can't be hashed or compared without
+# consuming them, so they are refused with a TypeError.
+#
+# As with the serialization cache, in-place changes to plain lists and
+# dicts (e.g. card.body.append(x)) are not seen by the listener; assign
+# a new list or call invalidate() on the owning object afterwards.
+#
+# Intercepting attribute assignment slows object construction, so the
+# listener is only registered while some fingerprinted object is alive.
+
+_TRACKED = (BaseObject, CompactNode)
+
+
+def _hash(text: str) -> str:
+    # Containers are '#' and a hex digest, which no JSON scalar can be.
+    return '#' + blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class _Fingerprints:
+    def __init__(self) -> None:
+        self._digests = {}
+        self._parents = {}
+        add_mutation_listener(self._on_mutation)
+
+    def invalidate(self, obj) -> None:
+        digests = self._digests
+        parents = self._parents
+        pending = [id(obj)]
+        seen = set()
+        while pending:
+            key = pending.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+            digests.pop(key, None)
+            pending.extend(parents.get(key, ()))
+
+    def _on_mutation(self, obj) -> None:
+        key = id(obj)
+        if key in self._digests:
+            self.invalidate(obj)
+
+    def _forget(self, key: int) -> None:
+        self._digests.pop(key, None)
+        self._parents.pop(key, None)
+        if not self._digests:
+            _release(self)
+
+    def _object_text(self, mapping: dict, keys: dict, parent) -> str:
+        digest = self.digest
+        members = sorted([f'{_key_text(key, keys)}:{digest(value, parent)}'
+                          for key, value in mapping.items()])
+        return '{' + ','.join(members) + '}'
+
+    def digest(self, value, parent=None) -> str:
+        # The JSON text of a scalar, or the hash of an object or array.
+        cls = value.__class__
+        scalar = _SCALARS.get(cls)
+        if scalar is not None:
+            return scalar(value)
+
+        layout = _OBJECTS.get(cls)
+        if layout is None:
+            if cls not in _ENCODERS:
+                _compile(cls)
+                return self.digest(value, parent)
+            if cls in _ONE_SHOT:
+                raise one_shot_error(value, 'fingerprint')
+            digest = self.digest
+            return _hash('[' + ','.join([digest(item, parent) for item in value]) + ']')
+        if not isinstance(value, _TRACKED):
+            return _hash(self._object_text(layout[0](value), layout[1], parent))
+
+        key = id(value)
+        if parent is not None:
+            self._parents.setdefault(key, set()).add(parent)
+        entry = self._digests.get(key)
+        if entry is not None:
+            return entry[1]
+
+        result = _hash(self._object_text(layout[0](value), layout[1], key))
+        # Weakly held, as in SerializationCache, so a new object reusing the
+        # id() can't pick up a stale digest.
+        reference = weakref.ref(value, lambda _, key=key: self._forget(key))
+        self._digests[key] = (reference, result)
+        return result
+
+
+_fingerprints = None
+
+
+def _get_fingerprints() -> _Fingerprints:
+    global _fingerprints
+    if _fingerprints is None:
+        _fingerprints = _Fingerprints()
+    return _fingerprints
+
+
+def _release(fingerprints: _Fingerprints) -> None:
+    # Called once every fingerprinted object has been garbage collected.
+    global _fingerprints
+    if _fingerprints is fingerprints:
+        _fingerprints = None
+        remove_mutation_listener(fingerprints._on_mutation)
+
+
+def _write_canonical(value, fmt: JSONFormat, parts: list, level: int) -> None:
+    # serialization._write_value(), except that one-shot arrays are refused
+    # rather than consumed.
+    cls = value.__class__
+    scalar = _SCALARS.get(cls)
+    if scalar is not None:
+        parts.append(scalar(value))
+        return
+
+    layout = _OBJECTS.get(cls)
+    if layout is None:
+        if cls not in _ENCODERS:
+            _compile(cls)
+            _write_canonical(value, fmt, parts, level)
+            return
+        if cls in _ONE_SHOT:
+            raise one_shot_error(value, 'compare')
+        _encode_array(value, fmt, parts, level, _write_canonical)
+        return
+    _write_object(layout[0](value), fmt, parts, level, layout[1], _write_canonical)
+
+
+def _canonical(obj) -> str:
+    parts = []
+    _write_canonical(obj, CANONICAL, parts, 0)
+    return ''.join(parts)
+
+
+def content_hash(obj) -> int:
+    """
+    Hash ``obj`` on its canonical encoding, without remembering anything.
+
+    Used by BaseObject.__hash__; consistent with equal().
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+
+    Returns:
+        int: A hash() value, which differs between processes.
+
+    Raises:
+        TypeError: If the tree holds a one-shot array such as a LazySequence.
+    """
+    return hash(_canonical(obj))
+
+
+def _digest(obj) -> str:
+    return _get_fingerprints().digest(obj)
+
+
+def fingerprint(obj) -> str:
+    """
+    Return a content hash of ``obj``, computed on its canonical JSON form.
+
+    Equal for any two trees that serialize to the same JSON, regardless of key
+    order, and stable across processes, so it can be stored and compared later.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+
+    Returns:
+        str: 32 hex digits.
+
+    Raises:
+        TypeError: If the tree holds a one-shot array such as a LazySequence.
+    """
+    digest = _digest(obj)
+    if not digest.startswith('#'):
+        digest = _hash(digest)
+    return digest[1:]
+
+
+def invalidate(obj) -> None:
+    """
+    Forget the remembered digest of ``obj`` and of every object it was found under.
+
+    Needed after in-place changes to lists or dicts held by ``obj``, which are
+    not tracked automatically.
+
+    Args:
+        obj: A BaseObject or CompactNode.
+    """
+    if _fingerprints is not None:
+        _fingerprints.invalidate(obj)
+
+
+def equal(first, second) -> bool:
+    """
+    Whether two trees serialize to the same JSON, up to key order.
+
+    Compares the canonical encodings, without remembering anything; the same
+    as comparing fingerprints.
+
+    Args:
+        first: Any BaseObject, or a list/dict/scalar containing them.
+        second: Ditto.
+
+    Returns:
+        bool: True if both have the same canonical encoding.
+
+    Raises:
+        TypeError: If either tree holds a one-shot array such as a LazySequence.
+    """
+    return first is second or _canonical(first) == _canonical(second)
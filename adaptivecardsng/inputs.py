@@ -3,7 +3,9 @@ from __future__ import annotations
 from .base import BaseInput, BaseObject
 from .enums import TextInputStyle, ChoiceInputStyle
 
-from .actions import Execute, Submit, OpenUrl, ToggleVisibility
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .actions import Execute, Submit, OpenUrl, ToggleVisibility
 
 
 class Text(BaseInput):
@@ -25,7 +27,7 @@ class Text(BaseInput):
                                    *args, **kwargs)
         self.id = id
         if multiline:
-            self.multiline = multiline
+            self.isMultiline = multiline
 
         if max_length:
             self.maxLength = max_length
@@ -151,9 +153,9 @@ class Toggle(BaseInput):
         if value:
             self.value = value
         if value_off:
-            self.value_off = value_off
+            self.valueOff = value_off
         if value_on:
-            self.value_on = value_on
+            self.valueOn = value_on
         if wrap:
             self.wrap = wrap
 
@@ -165,7 +167,7 @@ class Choice(BaseObject):
         self.value = value
 
 
-class ChoiceSet(BaseObject):
+class ChoiceSet(BaseInput):
     def __init__(self,
                  # Objects for ChoiceSet
                  id: str, choices: (list[Choice] | None) = None,
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from collections import Counter
+from time import perf_counter
+
+from .base import BaseObject
+from .compact import CompactNode
+from .serialization import _ARRAYS
+
+# Opt-in instrumentation of card construction and serialization.
+#
+# A Recorder counts, while it is active:
+#
+#   - BaseObject instances created, per class;
+#   - TeamsAdaptiveMessages created, and the number of objects in the
+#     card each one carries;
+#   - calls to as_json(), as_bytes(), iter_bytes() and dump(), per class
+#     of the serialized object, with the time spent and the bytes
+#     produced.
+#
+# The counting hooks are installed on BaseObject, CompactNode and
+# TeamsAdaptiveMessage when the first recorder starts and removed when
+# the last one stops, as with mutation listeners, so when nothing is
+# recording the library runs its original, uninstrumented code.
+#
+# Use a Recorder as a context manager to measure a block of code, or
+# enable() the process-wide recorder and read it with stats().
+# Objects rebuilt by parsing.from_dict() don't go through __init__ and
+# aren't counted as instances.
+
+_SERIALIZERS = ('as_json', 'as_bytes', 'iter_bytes', 'dump')
+
+_recorders = []
+
+# (owner, name) -> the attribute replaced by a hook.
+_originals = {}
+
+# Instances created while the hooks are installed, per class.
+_instance_counts = Counter()
+
+
+def _output_size(output) -> int:
+    if output.__class__ is int:
+        return output
+    if output.__class__ is str and not output.isascii():
+        return len(output.encode('utf-8'))
+    return len(output)
+
+
+def _count_nodes(value) -> int:
+    # Objects in a tree; lazily consumed sequences are not walked.
+    cls = value.__class__
+    if cls in _ARRAYS:
+        return 0
+    if isinstance(value, (BaseObject, CompactNode)):
+        return 1 + sum(_count_nodes(item) for item in value.__dict__.values())
+    if isinstance(value, dict):
+        return sum(_count_nodes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_count_nodes(item) for item in value)
+    return 0
+
+
+def _record_serialization(obj, seconds: float, size: int) -> None:
+    name = obj.node_class.__name__ if isinstance(obj, CompactNode) else obj.__class__.__name__
+    for recorder in _recorders:
+        entry = recorder._serializations.get(name)
+        if entry is None:
+            entry = recorder._serializations[name] = [0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += size
+
+
+def _timed(method):
+    def timed(self, *args, **kwargs):
+        start = perf_counter()
+        output = method(self, *args, **kwargs)
+        _record_serialization(self, perf_counter() - start, _output_size(output))
+        return output
+    timed.__wrapped__ = method
+    return timed
+
+
+def _timed_chunks(method):
+    # Only the time spent producing chunks counts, not the time the caller
+    # spends between them.
+    def timed_chunks(self, *args, **kwargs):
+        chunks = iter(method(self, *args, **kwargs))
+        seconds = 0.0
+        size = 0
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += perf_counter() - start
+                size += len(chunk)
+                yield chunk
+        finally:
+            _record_serialization(self, seconds, size)
+    timed_chunks.__wrapped__ = method
+    return timed_chunks
+
+
+def _counted_init(init):
+    # The hottest hook: a single increment of a shared tally, which
+    # recorders take the difference of.
+    counts = _instance_counts
+
+    def counted_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        counts[self.__class__] += 1
+    counted_init.__wrapped__ = init
+    return counted_init
+
+
+def _counted_message(init):
+    def counted_message(self, card, *args, **kwargs):
+        init(self, card, *args, **kwargs)
+        nodes = _count_nodes(card)
+        for recorder in _recorders:
+            recorder._messages += 1
+            recorder._card_nodes += nodes
+            recorder._max_card_nodes = max(recorder._max_card_nodes, nodes)
+    counted_message.__wrapped__ = init
+    return counted_message
+
+
+def _hooks() -> dict:
+    from .messages.teams import TeamsAdaptiveMessage
+
+    hooks = {(BaseObject, '__init__'): _counted_init(BaseObject.__init__),
+             (TeamsAdaptiveMessage, '__init__'): _counted_message(TeamsAdaptiveMessage.__init__)}
+    for owner in (BaseObject, CompactNode):
+        for name in _SERIALIZERS:
+            method = owner.__dict__[name]
+            hooks[owner, name] = (_timed_chunks if name == 'iter_bytes' else _timed)(method)
+    return hooks
+
+
+def _install() -> None:
+    for (owner, name), hook in _hooks().items():
+        _originals[owner, name] = owner.__dict__[name]
+        setattr(owner, name, hook)
+
+
+def _uninstall() -> None:
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+class Recorder:
+    """
+    Collects construction and serialization counts while active.
+
+    Start and stop it with start()/stop(), or use it as a context manager::
+
+        with Recorder() as recorder:
+            send(build_card())
+        print(recorder.stats())
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counts."""
+        self._instances = Counter()
+        self._since = Counter(_instance_counts)
+        self._serializations = {}
+        self._messages = 0
+        self._card_nodes = 0
+        self._max_card_nodes = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether this recorder is currently counting."""
+        return self in _recorders
+
+    def start(self) -> None:
+        """Start counting; installs the hooks if no other recorder is active."""
+        if self.active:
+            return
+        if not _recorders:
+            _install()
+        self._since = Counter(_instance_counts)
+        _recorders.append(self)
+
+    def stop(self) -> None:
+        """Stop counting; removes the hooks once no recorder is active."""
+        if not self.active:
+            return
+        self._instances = self._counted()
+        _recorders.remove(self)
+        if not _recorders:
+            _uninstall()
+
+    def _counted(self) -> Counter:
+        if not self.active:
+            return self._instances
+        counted = Counter(self._instances)
+        counted.update(_instance_counts)
+        counted.subtract(self._since)
+        return +counted
+
+    def __enter__(self) -> Recorder:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: A snapshot of the counts::
+
+                {'instances': {class name: count},
+                 'messages': {'count': ..., 'card_nodes': ..., 'max_card_nodes': ...},
+                 'serializations': {class name: {'calls': ..., 'seconds': ...,
+                                                 'bytes': ...}}}
+        """
+        return {
+            'instances': {cls.__name__: count for cls, count in self._counted().items()},
+            'messages': {'count': self._messages, 'card_nodes': self._card_nodes,
+                         'max_card_nodes': self._max_card_nodes},
+            'serializations': {name: {'calls': calls, 'seconds': seconds, 'bytes': size}
+                               for name, (calls, seconds, size)
+                               in self._serializations.items()},
+        }
+
+
+# The process-wide recorder behind enable(), disable() and stats().
+_default = Recorder()
+
+
+def enable() -> None:
+    """Start the process-wide recorder."""
+    _default.start()
+
+
+def disable() -> None:
+    """Stop the process-wide recorder; its counts are kept until reset()."""
+    _default.stop()
+
+
+def reset() -> None:
+    """Clear the counts of the process-wide recorder."""
+    _default.reset()
+
+
+def stats() -> dict:
+    """
+    Returns:
+        dict: A snapshot of the process-wide recorder; see Recorder.stats().
+    """
+    return _default.stats()
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+from .base import BaseObject
+from .fingerprint import _hash
+from .serialization import (_ARRAYS, _ENCODERS, _OBJECTS, _SCALARS, _compile, _key_text,
+                            _write_object)
+
+# Flyweight interning of repeated sub-objects.
+#
+# Generated cards repeat the same fragments many times over: the same
+# Choice lists in every ChoiceSet, the same styled TextBlock labels, the
+# same Submit stubs.  InternPool.intern() finds sub-objects and lists
+# that occur more than once (by fingerprint, so equal content is enough)
+# and replaces every occurrence with one shared instance.
+#
+# Shared instances are frozen: objects belong to a subclass of their
+# original class that refuses item and attribute assignment, and lists
+# become tuples.  Everything else about them (isinstance() checks,
+# serialization, equality) is unchanged.  Objects occurring only once
+# are left as they are, and can still be changed; use thaw() to get a
+# fully mutable copy of an interned tree.
+#
+# Because a frozen object can't change, the compiled encoder remembers
+# its encoded fragment per output format, and writes it out as a single
+# string wherever the object occurs, on this and every later render.
+# Plain dicts held by frozen objects (e.g. Submit data) must not be
+# changed in place.
+#
+# Elements of lazily consumed sequences (LazySequence, ColumnarRows) are
+# never interned, since walking them would consume or build them.
+
+# Number of encoded fragments kept per frozen object; a handful of
+# formats is all that's used in practice.
+_FRAGMENT_LIMIT = 16
+
+_FROZEN = {}
+
+
+def _refuse(self, *args) -> None:
+    raise TypeError(f"This {self.__class__.__name__} is shared by interning and can't be "
+                    f"changed; use interning.thaw() for a mutable copy.")
+
+
+def _reduce(self):
+    return _make_frozen, (self.__class__.__bases__[0], dict(self.__dict__))
+
+
+def _frozen_class(cls: type) -> type:
+    frozen = _FROZEN.get(cls)
+    if frozen is not None:
+        return frozen
+
+    frozen = type(cls.__name__, (cls,), {
+        '__slots__': ('_fragments',),
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '__setattr__': _refuse,
+        '__delattr__': _refuse,
+        '__setitem__': _refuse,
+        '__delitem__': _refuse,
+        '__reduce__': _reduce,
+    })
+    _compile(frozen)
+    keys = _OBJECTS[frozen][1]
+
+    def encode_shared(obj, fmt, parts: list, level: int) -> None:
+        fragments = obj._fragments
+        fragment = fragments.get((fmt, level))
+        if fragment is None:
+            encoded = []
+            _write_object(obj.__dict__, fmt, encoded, level, keys)
+            fragment = ''.join(encoded)
+            if len(fragments) < _FRAGMENT_LIMIT:
+                fragments[(fmt, level)] = fragment
+        parts.append(fragment)
+
+    _ENCODERS[frozen] = encode_shared
+    _FROZEN[cls] = frozen
+    _FROZEN[frozen] = frozen
+    return frozen
+
+
+def _make_frozen(cls: type, state: dict) -> BaseObject:
+    frozen = _frozen_class(cls)
+    obj = object.__new__(frozen)
+    obj.__dict__.update(state)
+    object.__setattr__(obj, '_fragments', {})
+    return obj
+
+
+def is_shared(obj) -> bool:
+    """
+    Returns:
+        bool: Whether ``obj`` is a frozen instance shared by interning.
+    """
+    return _FROZEN.get(obj.__class__) is obj.__class__
+
+
+def _is_scalar(value) -> bool:
+    cls = value.__class__
+    if cls in _SCALARS:
+        return True
+    if cls not in _ENCODERS:
+        _compile(cls)
+    return cls in _SCALARS
+
+
+class InternPool:
+    """
+    Pool of frozen, shared sub-objects.
+
+    A pool can be reused across cards, so that fragments repeated from one card
+    to the next (e.g. a standard set of actions) are shared between them too.
+    """
+
+    def __init__(self) -> None:
+        self._shared = {}
+        self.reused = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The number of shared instances in the pool, and the number of
+            occurrences that were replaced by an existing shared instance.
+        """
+        return {'shared': len(self._shared), 'reused': self.reused}
+
+    def intern(self, obj):
+        """
+        Replace repeated sub-objects of ``obj`` with shared, frozen instances.
+
+        Sub-objects equal to one already in the pool are replaced too.  The tree
+        is changed in place; ``obj`` itself is never frozen.
+
+        Args:
+            obj: A BaseObject tree, e.g. an AdaptiveCard.
+
+        Returns:
+            The same ``obj``.
+        """
+        digests = {}
+        counts = {}
+        self._count(obj, digests, counts)
+        self._share_children(obj, digests, counts)
+        return obj
+
+    def _count(self, value, digests: dict, counts: dict) -> (str | None):
+        # Returns the digest of ``value``, the same as fingerprint.py's, but
+        # without remembering it beyond this call.  Records the digests of
+        # objects, lists and dicts, and counts those of objects and lists.
+        # Trees holding lazy sequences, which mustn't be walked, have none.
+        cls = value.__class__
+        if cls not in _ENCODERS and cls not in _SCALARS:
+            _compile(cls)
+        scalar = _SCALARS.get(cls)
+        if scalar is not None:
+            return scalar(value)
+        if cls in _ARRAYS:
+            return None
+
+        hashable = True
+        if isinstance(value, (BaseObject, dict)):
+            keys = _OBJECTS[cls][1]
+            members = []
+            for key, child in (value if isinstance(value, dict) else value.__dict__).items():
+                digest = self._count(child, digests, counts)
+                if digest is None:
+                    hashable = False
+                elif hashable:
+                    members.append(f'{_key_text(key, keys)}:{digest}')
+            text = '{' + ','.join(sorted(members)) + '}'
+        elif isinstance(value, (list, tuple)):
+            items = []
+            for child in value:
+                digest = self._count(child, digests, counts)
+                if digest is None:
+                    hashable = False
+                elif hashable:
+                    items.append(digest)
+            text = '[' + ','.join(items) + ']'
+        else:
+            return None
+        if not hashable:
+            return None
+
+        digest = digests[id(value)] = _hash(text)
+        if not isinstance(value, dict):
+            counts[digest] = counts.get(digest, 0) + 1
+        return digest
+
+    def _share_children(self, obj, digests: dict, counts: dict) -> None:
+        for key, value in list(obj.__dict__.items()):
+            replacement = self._share(value, digests, counts)
+            if replacement is not value:
+                obj[key] = replacement
+
+    def _share(self, value, digests: dict, counts: dict):
+        if _is_scalar(value) or value.__class__ in _ARRAYS:
+            return value
+        if isinstance(value, BaseObject):
+            digest = digests.get(id(value))
+            if digest is not None:
+                shared = self._shared.get(digest)
+                if shared is not None:
+                    self.reused += 1
+                    return shared
+                if counts[digest] > 1 or is_shared(value):
+                    return self._freeze(value, digest, digests)
+            if not is_shared(value):
+                self._share_children(value, digests, counts)
+            return value
+        if isinstance(value, (list, tuple)):
+            digest = digests.get(id(value))
+            if digest is not None and (counts[digest] > 1 or digest in self._shared):
+                return self._freeze_array(value, digest, digests)
+            items = [self._share(item, digests, counts) for item in value]
+            if any(new is not old for new, old in zip(items, value)):
+                return value.__class__(items)
+            return value
+        if isinstance(value, dict):
+            items = {key: self._share(item, digests, counts) for key, item in value.items()}
+            if any(items[key] is not item for key, item in value.items()):
+                return items
+            return value
+        return value
+
+    def _freeze(self, obj: BaseObject, digest: str, digests: dict) -> BaseObject:
+        # Returns the shared instance for ``obj``, freezing everything beneath it.
+        shared = self._shared.get(digest)
+        if shared is not None:
+            self.reused += 1
+            return shared
+        if is_shared(obj):
+            shared = obj
+        else:
+            state = {key: self._frozen_value(value, digests)
+                     for key, value in obj.__dict__.items()}
+            shared = _make_frozen(obj.__class__, state)
+        self._shared[digest] = shared
+        return shared
+
+    def _freeze_array(self, array, digest: str, digests: dict) -> tuple:
+        shared = self._shared.get(digest)
+        if shared is not None:
+            self.reused += 1
+            return shared
+        shared = self._shared[digest] = tuple(self._frozen_value(item, digests)
+                                              for item in array)
+        return shared
+
+    def _frozen_value(self, value, digests: dict):
+        if _is_scalar(value):
+            return value
+        if isinstance(value, BaseObject):
+            return self._freeze(value, digests[id(value)], digests)
+        if isinstance(value, (list, tuple)):
+            return self._freeze_array(value, digests[id(value)], digests)
+        if isinstance(value, dict):
+            return {key: self._frozen_value(item, digests) for key, item in value.items()}
+        return value
+
+
+def intern(obj, pool: (InternPool | None) = None):
+    """
+    Replace repeated sub-objects of ``obj`` with shared, frozen instances, in place.
+
+    Args:
+        obj: A BaseObject tree, e.g. an AdaptiveCard.
+        pool (InternPool, optional): A pool to share instances with other cards.
+
+    Returns:
+        The same ``obj``.
+    """
+    return (pool or InternPool()).intern(obj)
+
+
+def thaw(obj):
+    """
+    Return a deep copy of ``obj`` in which nothing is frozen or shared.
+
+    Args:
+        obj: A BaseObject tree, possibly interned.
+
+    Returns:
+        The copy; frozen objects become instances of their original class, and
+        their tuples become lists again.
+    """
+    if isinstance(obj, BaseObject):
+        cls = obj.__class__
+        if is_shared(obj):
+            cls = cls.__bases__[0]
+        copy = cls.__new__(cls)
+        copy.__dict__.update({key: thaw(value) for key, value in obj.__dict__.items()})
+        return copy
+    if isinstance(obj, (list, tuple)):
+        return [thaw(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: thaw(value) for key, value in obj.items()}
+    return obj
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+from .base import BaseObject
+from .elements import TextBlock
+from .serialization import _ARRAYS, register_array_type
+
+# Lazily consumed lists of rows or items.
+#
+# Cards fed from a database cursor shouldn't need the whole result set
+# in memory.  Table(rows=...) and Container(items=...) accept any
+# iterable, e.g. a generator over a cursor; anything other than a list
+# or tuple is wrapped in a LazySequence, which the serializers treat as
+# a JSON array and consume one element at a time.  With the streaming
+# serializer (iter_bytes()/dump()) neither the rows nor the output are
+# ever held in full.
+#
+# A LazySequence can only be iterated once: the first serialization of
+# the card (or to_dict()) consumes it, and a second one raises
+# RuntimeError.  The first element is read when the sequence is tested
+# for emptiness, which happens as the Table or Container is constructed.
+# Walks that don't produce the output refuse such cards with a TypeError
+# instead of consuming them: encoded_size(), split_card(), comparisons,
+# hashing and fingerprint(); derive() refuses them with a PatchError on
+# the paths it copies.  str() and repr() show a placeholder.  Nor
+# can a LazySequence be pickled, so cards holding one can't be sent to
+# a process pool (render_many(executor='process')); build them in the
+# workers with a factory, or use lists.
+#
+# With a limit, elements past the limit are counted but not serialized,
+# and a trailer element such as "… and 42 more" is emitted in their
+# place.
+
+
+class LazySequence:
+    """
+    A one-shot sequence of card elements drawn from an iterable.
+
+    Encoded as a JSON array by every backend.
+    """
+
+    def __init__(self, iterable, limit: (int | None) = None, trailer=None) -> None:
+        """
+        Args:
+            iterable: The source of the elements, e.g. a generator.
+            limit (int, optional): Maximum number of elements to emit.
+            trailer (callable, optional): Called as ``trailer(count)`` with the number
+                of elements dropped by ``limit``, returning the element emitted in
+                their place.  No trailer is emitted if not given.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        self._iterator = iter(iterable)
+        self._limit = limit
+        self._trailer = trailer
+        self._head = []
+        self._consumed = False
+
+    def __bool__(self) -> bool:
+        # Whether there is anything to emit, reading ahead one element if needed.
+        if self._consumed:
+            raise RuntimeError("This LazySequence has already been consumed.")
+        if not self._head:
+            for element in self._iterator:
+                self._head.append(element)
+                break
+        return bool(self._head)
+
+    def __iter__(self):
+        if self._consumed:
+            raise RuntimeError("This LazySequence has already been consumed.")
+        self._consumed = True
+        return self._elements()
+
+    def _elements(self):
+        iterator = self._iterator
+        head = self._head
+        limit = self._limit
+        emitted = 0
+        while head:
+            if limit is not None and emitted >= limit:
+                break
+            yield head.pop()
+            emitted += 1
+        if limit is None:
+            yield from iterator
+            return
+
+        for element in iterator:
+            if emitted >= limit:
+                head.append(element)
+                break
+            yield element
+            emitted += 1
+        if head:
+            remaining = len(head) + sum(1 for _ in iterator)
+            head.clear()
+            if self._trailer is not None:
+                yield self._trailer(remaining)
+
+    def __repr__(self) -> str:
+        state = 'consumed' if self._consumed else 'pending'
+        return f"<LazySequence ({state})>"
+
+    def __reduce__(self):
+        raise TypeError("A LazySequence can't be pickled; build the card where it is "
+                        "serialized, or pass a list instead.")
+
+
+register_array_type(LazySequence, one_shot=True)
+
+
+def more_text(count: int) -> TextBlock:
+    """
+    Returns:
+        TextBlock: The default trailer of a limited Container, e.g. "… and 3 more".
+    """
+    return TextBlock(text=f"… and {count} more", subtle=True)
+
+
+def elements(value, limit: (int | None), trailer):
+    """
+    Prepare the rows or items passed to a Table or Container.
+
+    Lists and tuples are kept as they are, cut down to ``limit`` (plus the
+    trailer) if needed; any other iterable is wrapped in a LazySequence.
+
+    Args:
+        value: The rows/items, or None.
+        limit (int, optional): Maximum number of elements to emit.
+        trailer (callable): Builds the trailer element; see LazySequence.
+
+    Returns:
+        The value to store on the Table/Container.
+
+    Raises:
+        TypeError: If ``value`` is a string, bytes, a mapping or a single card
+            element, which are iterable but not sequences of elements.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes, bytearray, Mapping, BaseObject)):
+        raise TypeError(f"Expected a list or other iterable of elements, not "
+                        f"{value.__class__.__name__}.")
+    if isinstance(value, LazySequence):
+        return value if limit is None else LazySequence(value, limit, trailer)
+    if isinstance(value, (list, tuple)) or value.__class__ in _ARRAYS:
+        if limit is None or len(value) <= limit:
+            return value
+        return list(value[:limit]) + [trailer(len(value) - limit)]
+    return LazySequence(value, limit, trailer)
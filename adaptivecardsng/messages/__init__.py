@@ -1 +1,28 @@
-from teams import TeamsAdaptiveMessage
\ No newline at end of file
+from .teams import TeamsAdaptiveMessage
+
+__all__ = ['AsyncWebhookSender', 'Coalescer', 'DEFAULT_BUDGET', 'DeliveryResult', 'Outbox',
+           'RetryPolicy', 'Scheduler', 'TeamsAdaptiveMessage', 'TokenBucket', 'WebhookSender',
+           'split_card']
+
+# Splitting pulls in the size accounting, and delivery the networking
+# and storage modules; they are imported on first use.
+_LAZY = {
+    'DEFAULT_BUDGET': 'splitting',
+    'split_card': 'splitting',
+    'AsyncWebhookSender': 'aio',
+    'Coalescer': 'coalescing',
+    'DeliveryResult': 'delivery',
+    'Outbox': 'outbox',
+    'RetryPolicy': 'delivery',
+    'Scheduler': 'scheduler',
+    'TokenBucket': 'scheduler',
+    'WebhookSender': 'sender',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is not None:
+        import importlib
+        return getattr(importlib.import_module(f'{__name__}.{module}'), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
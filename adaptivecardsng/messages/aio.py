@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+from time import perf_counter
+
+from .delivery import (DeliveryError, DeliveryResult, RetryPolicy, _header_line, _keep_alive,
+                       _payload, _retry_after, _status_line, _Target)
+
+# Asyncio delivery of messages to incoming webhooks.
+#
+# AsyncWebhookSender speaks HTTP/1.1 over asyncio streams and keeps the
+# connections it opens, so posting many messages to the same host pays
+# for the TCP and TLS handshakes once per connection rather than once
+# per message.  At most ``max_per_host`` requests are in flight to a
+# host at any time, each on its own connection; further sends wait for
+# a connection to become free.  Waits between retries don't hold one.
+#
+# A connection that has sat idle may have been closed by the server
+# without our noticing.  If a request on a reused connection fails
+# before any response arrives, it is sent once more on a new connection
+# without counting as an attempt.
+#
+# send() and send_many() never raise for delivery failures: every
+# message gets a DeliveryResult, so a batch can be awaited with
+# asyncio.gather() and inspected afterwards.
+
+
+class _ConnectionLost(Exception):
+    # A reused connection failed before the server answered.
+    pass
+
+
+class AsyncWebhookSender:
+    """
+    Posts messages to webhook URLs over pooled keep-alive connections.
+
+    Use it as an async context manager, or call close() when done::
+
+        async with AsyncWebhookSender(max_per_host=4) as sender:
+            results = await sender.send_many((url, message) for message in messages)
+    """
+    def __init__(self, max_per_host: int = 4, timeout: float = 10.0,
+                 retry: (RetryPolicy | None) = None, ssl=None) -> None:
+        """
+        Args:
+            max_per_host (int, optional): Number of concurrent requests, and of
+                pooled connections, per host.
+            timeout (float, optional): Seconds allowed for each attempt, from
+                connecting to reading the whole response.
+            retry (RetryPolicy, optional): Defaults to RetryPolicy().
+            ssl (ssl.SSLContext, optional): Context for https URLs. Defaults to the
+                system's default verified context.
+        """
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1.")
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self._ssl = ssl
+        self._targets = {}
+        self._limits = {}
+        self._idle = {}
+
+    async def __aenter__(self) -> AsyncWebhookSender:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections. Sends already in progress may reopen some."""
+        idle, self._idle = self._idle, {}
+        writers = [writer for connections in idle.values() for _, writer in connections]
+        for writer in writers:
+            writer.close()
+        for writer in writers:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def send(self, url: str, message) -> DeliveryResult:
+        """
+        Post one message, retrying throttled and failed attempts.
+
+        Args:
+            url (str): The incoming webhook URL.
+            message: A TeamsAdaptiveMessage, or its JSON as ``bytes`` or ``str``.
+
+        Returns:
+            DeliveryResult: The outcome of the last attempt.
+        """
+        target = self._targets.get(url)
+        if target is None:
+            target = self._targets[url] = _Target(url)
+        request = target.request(_payload(message))
+        retry = self.retry
+        start = perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            status = None
+            headers = {}
+            body = b''
+            error = None
+            try:
+                # The timeout starts once a connection slot is free.
+                async with self._limit(target.key):
+                    status, headers, body = await asyncio.wait_for(
+                        self._exchange(target, request), self.timeout)
+            except (OSError, EOFError, asyncio.TimeoutError, DeliveryError) as exc:
+                error = exc
+            if attempt >= retry.attempts or not retry.retryable(status):
+                return DeliveryResult(url, status, body, attempt, perf_counter() - start, error)
+            await asyncio.sleep(retry.delay(attempt, _retry_after(headers.get('retry-after'))))
+
+    async def send_many(self, deliveries) -> list[DeliveryResult]:
+        """
+        Post a batch of messages concurrently, within the per-host limits.
+
+        Args:
+            deliveries (iterable): ``(url, message)`` pairs.
+
+        Returns:
+            list[DeliveryResult]: One result per pair, in the same order.
+        """
+        return list(await asyncio.gather(*[self.send(url, message)
+                                           for url, message in deliveries]))
+
+    def _limit(self, key: tuple) -> asyncio.Semaphore:
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = asyncio.Semaphore(self.max_per_host)
+        return limit
+
+    async def _exchange(self, target: _Target, request: bytes) -> tuple[int, dict, bytes]:
+        idle = self._idle.get(target.key)
+        while idle:
+            connection = idle.pop()
+            if connection[0].at_eof():
+                connection[1].close()
+                continue
+            try:
+                return await self._roundtrip(target.key, connection, request, True)
+            except _ConnectionLost:
+                break
+        connection = await self._connect(target)
+        return await self._roundtrip(target.key, connection, request, False)
+
+    async def _connect(self, target: _Target) -> tuple:
+        if not target.secure:
+            return await asyncio.open_connection(target.host, target.port)
+        if self._ssl is None:
+            import ssl
+            self._ssl = ssl.create_default_context()
+        return await asyncio.open_connection(target.host, target.port, ssl=self._ssl,
+                                             server_hostname=target.host)
+
+    async def _roundtrip(self, key: tuple, connection: tuple, request: bytes,
+                         reused: bool) -> tuple[int, dict, bytes]:
+        reader, writer = connection
+        keep = False
+        try:
+            writer.write(request)
+            try:
+                await writer.drain()
+                line = await reader.readline()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if reused:
+                    raise _ConnectionLost() from None
+                raise
+            if not line:
+                if reused:
+                    raise _ConnectionLost()
+                raise ConnectionResetError("Connection closed without a response.")
+            while True:
+                status, http11 = _status_line(line)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n'):
+                        break
+                    if not line:
+                        raise asyncio.IncompleteReadError(b'', None)
+                    _header_line(line, headers)
+                # Interim responses (e.g. 100 Continue) precede the final one.
+                if not 100 <= status < 200:
+                    break
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionResetError("Connection closed without a final response.")
+            body, delimited = await self._read_body(reader, headers, status)
+            keep = delimited and _keep_alive(http11, headers)
+            return status, headers, body
+        finally:
+            if keep:
+                self._idle.setdefault(key, []).append(connection)
+            else:
+                writer.close()
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, headers: dict,
+                         status: int) -> tuple[bytes, bool]:
+        # Returns the body and whether its end was marked, so that the
+        # connection can carry another request.  Responses to HEAD requests
+        # would have no body either, but only POSTs are sent.
+        if status in (204, 304) or 100 <= status < 200:
+            return b'', True
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                line = await reader.readline()
+                try:
+                    size = int(line.split(b';', 1)[0], 16)
+                except ValueError:
+                    raise DeliveryError(f"Malformed chunk size: {line!r}") from None
+                if size == 0:
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            return b''.join(chunks), True
+        length = headers.get('content-length')
+        if length is not None:
+            if not length.isdigit():
+                raise DeliveryError(f"Malformed Content-Length: {length!r}")
+            return await reader.readexactly(int(length)), True
+        return await reader.read(), False
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from time import monotonic
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Table, TableCell, TableRow
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import FontSize, FontWeight
+from adaptivecardsng.sizing import encoded_size
+
+from .splitting import DEFAULT_BUDGET, split_card
+from .teams import TeamsAdaptiveMessage
+
+# Coalescing of bursts of small alerts into digest cards.
+#
+# A Coalescer holds back the messages for each webhook for up to
+# ``window`` seconds after the first one, or until ``max_messages`` are
+# waiting, and then hands them back as a single digest: a card with a
+# Table listing each distinct alert once, with the number of times it
+# occurred.  Alerts are told apart by their text (the text of every
+# TextBlock in the card's body), or by a ``key`` function of it, e.g.
+# one that masks out host names or counters.  A lone message is handed
+# back as it is.
+#
+# Digests are cut into several messages with split_card() if they
+# would go over the payload budget, so the table is split by rows and
+# each part repeats its header.  The actions of the original cards are
+# not carried over.  An alert whose text is too long for a message of
+# its own is shortened, ending with an ellipsis, rather than dropped.
+# The messages for every webhook being released are built before any
+# buffer is emptied, so that an error leaves every alert held back.
+#
+# The Coalescer doesn't send anything or run timers itself: add()
+# returns the digests that a full buffer produces, and due() those
+# whose window has passed, to be called periodically (next_due() tells
+# when).  Pass the results to a sender or a Scheduler.
+
+
+_ELLIPSIS = '…'
+
+
+def _card_of(message) -> AdaptiveCard:
+    if isinstance(message, TeamsAdaptiveMessage):
+        return message.attachments[0]['content']
+    return message
+
+
+def _texts(value, texts: list) -> None:
+    # The text of every TextBlock under ``value``, in document order.
+    if isinstance(value, TextBlock):
+        texts.append(value.text)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _texts(item, texts)
+    elif hasattr(value, '__dict__'):
+        for key in ('items', 'columns', 'rows', 'cells'):
+            if key in value.__dict__:
+                _texts(value.__dict__[key], texts)
+
+
+def alert_text(card: AdaptiveCard) -> str:
+    """
+    Args:
+        card (AdaptiveCard): An alert card.
+
+    Returns:
+        str: The text of the TextBlocks in its body, one per line.
+    """
+    texts = []
+    _texts(card.__dict__.get('body', ()), texts)
+    return '\n'.join(texts)
+
+
+def _shorten(text: str, room: int) -> str:
+    # ``text``, cut short with an ellipsis if its JSON string would take more
+    # than ``room`` bytes beyond those of an empty string.
+    if encoded_size(text) - 2 <= room:
+        return text
+    room -= encoded_size(_ELLIPSIS) - 2
+    used = 0
+    for end, character in enumerate(text):
+        used += encoded_size(character) - 2
+        if used > room:
+            return text[:end] + _ELLIPSIS
+    return text
+
+
+class _Buffer:
+    __slots__ = ('opened', 'messages', 'counts')
+
+    def __init__(self, opened: float) -> None:
+        self.opened = opened
+        self.messages = []
+        # Alert text -> occurrences, in order of first occurrence.
+        self.counts = {}
+
+
+class Coalescer:
+    """
+    Buffers messages per webhook and merges each burst into a digest card.
+
+    ::
+
+        coalescer = Coalescer(window=60, max_messages=50)
+        for url, message in coalescer.add(url, TeamsAdaptiveMessage(card)):
+            scheduler.submit(url, message)
+        ...
+        # Every few seconds:
+        for url, message in coalescer.due():
+            scheduler.submit(url, message)
+    """
+    def __init__(self, window: float = 60.0, max_messages: int = 50,
+                 budget: int = DEFAULT_BUDGET, key=None) -> None:
+        """
+        Args:
+            window (float, optional): Seconds a webhook's messages are held after
+                the first one.
+            max_messages (int, optional): Number of messages that end the window
+                early.
+            budget (int, optional): Maximum encoded size of each digest message.
+            key (callable, optional): Maps an alert's text to the text that
+                identifies it in the digest; alerts with the same key are counted
+                together. Defaults to the text itself.
+
+        Raises:
+            ValueError: If ``max_messages`` is below 1, or ``budget`` is too small
+                for a digest with a single, shortened alert.
+        """
+        if max_messages < 1:
+            raise ValueError("max_messages must be at least 1.")
+        smallest = encoded_size(TeamsAdaptiveMessage(digest({_ELLIPSIS: max_messages})))
+        if smallest > budget:
+            raise ValueError(f"A budget of {budget} bytes is too small for a digest, "
+                             f"which needs at least {smallest} bytes.")
+        self.window = window
+        self.max_messages = max_messages
+        self.budget = budget
+        self.key = key
+        self._buffers = {}
+
+    def __len__(self) -> int:
+        """Number of messages held back, over all webhooks."""
+        return sum(len(buffer.messages) for buffer in self._buffers.values())
+
+    def add(self, url: str, message, now: (float | None) = None) -> list[tuple]:
+        """
+        Hold back a message for its webhook's next digest.
+
+        Args:
+            url (str): The incoming webhook URL.
+            message: A TeamsAdaptiveMessage or an AdaptiveCard.
+            now (float, optional): The current time.monotonic().
+
+        Returns:
+            list[tuple]: ``(url, TeamsAdaptiveMessage)`` pairs to send now: the
+            webhook's digest if this message filled its buffer, otherwise nothing.
+        """
+        now = monotonic() if now is None else now
+        buffer = self._buffers.get(url)
+        if buffer is None:
+            buffer = self._buffers[url] = _Buffer(now)
+        text = alert_text(_card_of(message))
+        if self.key is not None:
+            text = self.key(text)
+        buffer.messages.append(message)
+        buffer.counts[text] = buffer.counts.get(text, 0) + 1
+        if len(buffer.messages) >= self.max_messages:
+            return self._release([url])
+        return []
+
+    def due(self, now: (float | None) = None) -> list[tuple]:
+        """
+        Args:
+            now (float, optional): The current time.monotonic().
+
+        Returns:
+            list[tuple]: ``(url, TeamsAdaptiveMessage)`` pairs for every webhook
+            whose window has passed.
+        """
+        now = monotonic() if now is None else now
+        return self._release([url for url, buffer in self._buffers.items()
+                              if now - buffer.opened >= self.window])
+
+    def next_due(self) -> (float | None):
+        """
+        Returns:
+            float: The time.monotonic() at which the next window passes, or None
+            if nothing is held back.
+        """
+        if not self._buffers:
+            return None
+        return min(buffer.opened for buffer in self._buffers.values()) + self.window
+
+    def flush(self) -> list[tuple]:
+        """
+        Returns:
+            list[tuple]: ``(url, TeamsAdaptiveMessage)`` pairs for everything held
+            back, e.g. on shutdown.
+        """
+        return self._release(list(self._buffers))
+
+    def _release(self, urls: list) -> list[tuple]:
+        # All messages are built before any buffer is dropped, so that an
+        # error loses nothing.
+        ready = []
+        for url in urls:
+            ready.extend((url, message) for message in self._messages(self._buffers[url]))
+        for url in urls:
+            del self._buffers[url]
+        return ready
+
+    def _messages(self, buffer: _Buffer) -> list[TeamsAdaptiveMessage]:
+        if len(buffer.messages) == 1:
+            message = buffer.messages[0]
+            if not isinstance(message, TeamsAdaptiveMessage):
+                message = TeamsAdaptiveMessage(message)
+            return [message]
+        try:
+            return split_card(digest(buffer.counts), self.budget)
+        except ValueError:
+            # Some alert doesn't fit in a message of its own.
+            return split_card(digest(self._shortened(buffer.counts)), self.budget)
+
+    def _shortened(self, counts: dict) -> dict:
+        # ``counts`` with every text cut down to what fits in a digest message
+        # on its own.  Measured with the largest possible heading and count.
+        total = sum(counts.values())
+        room = self.budget - encoded_size(TeamsAdaptiveMessage(digest({'': total})))
+        shortened = {}
+        for text, count in counts.items():
+            text = _shorten(text, room)
+            shortened[text] = shortened.get(text, 0) + count
+        return shortened
+
+
+def digest(counts: dict) -> AdaptiveCard:
+    """
+    Build a digest card listing alerts and how often each occurred.
+
+    Args:
+        counts (dict): ``{alert text: occurrences}``, in the order to list them.
+
+    Returns:
+        AdaptiveCard: A heading and a Table with one row per alert.
+    """
+    total = sum(counts.values())
+    header = TableRow(cells=[TableCell(items=[TextBlock(text='Alert',
+                                                        font_weight=FontWeight.bolder)]),
+                             TableCell(items=[TextBlock(text='Count',
+                                                        font_weight=FontWeight.bolder)])])
+    rows = [TableRow(cells=[TableCell(items=[TextBlock(text=text, wrap=True)]),
+                            TableCell(items=[TextBlock(text=str(count))])])
+            for text, count in counts.items()]
+    return AdaptiveCard(body=[
+        TextBlock(text=f'{total} alerts ({len(counts)} distinct)',
+                  font_weight=FontWeight.bolder, font_size=FontSize.medium, wrap=True),
+        Table(columns=[{'width': 5}, {'width': 1}], rows=[header] + rows,
+              first_row_as_header=True),
+    ])
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import random
+from urllib.parse import urlsplit
+
+from adaptivecardsng import __version__
+
+# Pieces shared by the webhook senders: payload encoding, the HTTP/1.1
+# request line and headers, retry policy and per-message results.
+#
+# A Teams incoming webhook accepts a JSON POST and answers 200 with the
+# body "1".  It answers 429 when the connector is throttled and 5xx
+# when the service is briefly unavailable; both are worth retrying
+# after a pause, honouring Retry-After when the service sends one.
+# Other 4xx answers (a removed webhook, an invalid card) won't succeed
+# on retry and are reported as they are.
+
+USER_AGENT = f'adaptivecardsng/{__version__}'
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Sent with every message, besides Host and Content-Length.
+_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Content-Type': 'application/json',
+}
+
+
+class DeliveryError(Exception):
+    """Raised for a malformed or unexpected response from a webhook server."""
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before sending a message again.
+
+    Waits grow exponentially with "full jitter": the n-th retry waits a random
+    time between 0 and ``min(max_delay, base_delay * 2 ** (n - 1))``, so that many
+    senders throttled at the same moment don't retry in lockstep.  A Retry-After
+    answer from the server is honoured, up to ``max_delay``.
+
+    Webhook posts aren't idempotent.  An attempt that times out or loses its
+    connection after the request was written may still have been delivered, and
+    is retried all the same, so the message can be posted twice; use
+    ``attempts=1`` where duplicates are worse than lost messages.
+    """
+    def __init__(self, attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0,
+                 statuses: frozenset = RETRY_STATUSES) -> None:
+        """
+        Args:
+            attempts (int, optional): Total number of attempts per message,
+                including the first. 1 disables retries.
+            base_delay (float, optional): Upper bound of the first wait, in seconds.
+            max_delay (float, optional): Upper bound of any wait, in seconds.
+            statuses (frozenset, optional): HTTP statuses worth retrying. Connection
+                errors and timeouts are always retried.
+        """
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1.")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+
+    def retryable(self, status: (int | None)) -> bool:
+        """
+        Args:
+            status (int): The HTTP status, or None if no response was received.
+
+        Returns:
+            bool: Whether an attempt that ended this way should be repeated.
+        """
+        return status is None or status in self.statuses
+
+    def delay(self, attempt: int, retry_after: (float | None) = None) -> float:
+        """
+        Args:
+            attempt (int): The number of attempts made so far, from 1.
+            retry_after (float, optional): The wait asked for by the server.
+
+        Returns:
+            float: The number of seconds to wait before the next attempt.
+        """
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class DeliveryResult:
+    """
+    Outcome of sending one message, after any retries.
+    """
+    __slots__ = ('url', 'status', 'body', 'attempts', 'seconds', 'error')
+
+    def __init__(self, url: str, status: (int | None), body: bytes, attempts: int,
+                 seconds: float, error: (BaseException | None) = None) -> None:
+        """
+        Args:
+            url (str): The webhook URL.
+            status (int): HTTP status of the last attempt, or None if it got no
+                response.
+            body (bytes): Response body of the last attempt.
+            attempts (int): Number of attempts made.
+            seconds (float): Time from the first attempt to the last response,
+                including waits between attempts.
+            error (Exception, optional): Why the last attempt got no response.
+        """
+        self.url = url
+        self.status = status
+        self.body = body
+        self.attempts = attempts
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the message was accepted."""
+        return self.status is not None and 200 <= self.status < 300
+
+    def __repr__(self) -> str:
+        outcome = self.status if self.error is None else repr(self.error)
+        return (f'DeliveryResult({self.url!r}, {outcome}, attempts={self.attempts}, '
+                f'seconds={self.seconds:.3f})')
+
+
+class _Target:
+    # A parsed webhook URL.  ``key`` identifies the connections that can be
+    # shared between URLs on the same host.
+    __slots__ = ('url', 'secure', 'host', 'port', 'path', 'key', 'header')
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Not an http(s) URL: {url!r}")
+        self.url = url
+        self.secure = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.secure else 80)
+        self.path = parts.path or '/'
+        if parts.query:
+            self.path += '?' + parts.query
+        self.key = (parts.scheme, self.host, self.port)
+        netloc = parts.netloc.rpartition('@')[2]
+        self.header = (f'POST {self.path} HTTP/1.1\r\nHost: {netloc}\r\n'
+                       + ''.join(f'{name}: {value}\r\n' for name, value in _HEADERS.items())
+                       ).encode('latin-1')
+
+    def request(self, body: bytes) -> bytes:
+        return self.header + b'Content-Length: %d\r\n\r\n' % len(body) + body
+
+
+def _payload(message) -> bytes:
+    # A TeamsAdaptiveMessage (or any BaseObject), or ready-made JSON.
+    if isinstance(message, bytes):
+        return message
+    if isinstance(message, str):
+        return message.encode('utf-8')
+    return message.as_bytes()
+
+
+def _retry_after(value: (str | None)) -> (float | None):
+    # Retry-After is either a number of seconds or an HTTP date.
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+    from datetime import datetime, timezone
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _status_line(line: bytes) -> tuple[int, bool]:
+    # Returns the status and whether the server speaks HTTP/1.1.
+    try:
+        version, status = line.split(None, 2)[:2]
+        status = int(status)
+    except ValueError:
+        raise DeliveryError(f"Malformed status line: {line!r}") from None
+    if not version.startswith(b'HTTP/1.'):
+        raise DeliveryError(f"Unsupported protocol: {version!r}")
+    return status, version == b'HTTP/1.1'
+
+
+def _header_line(line: bytes, headers: dict) -> None:
+    name, colon, value = line.decode('latin-1').partition(':')
+    if not colon:
+        raise DeliveryError(f"Malformed header: {line!r}")
+    headers[name.strip().lower()] = value.strip()
+
+
+def _keep_alive(http11: bool, headers: dict) -> bool:
+    connection = headers.get('connection', '').lower()
+    if http11:
+        return connection != 'close'
+    return connection == 'keep-alive'
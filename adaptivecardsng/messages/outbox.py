@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .delivery import _payload
+
+# A durable outbox for outgoing messages.
+#
+# Messages put in an Outbox are stored, already serialized, in a SQLite
+# database before anything is sent, so a throttled or unreachable
+# webhook doesn't lose them when the process restarts.  drain() sends
+# them with a WebhookSender (drain_async() with an AsyncWebhookSender)
+# and deletes each one once the webhook has accepted it.
+#
+# Writes are batched: put() buffers messages in memory and commits them
+# in a single transaction, hence a single fsync, once ``batch_size`` are
+# waiting, on flush() and on close().  Messages put but not yet flushed
+# are lost if the process dies; call flush() (or use put_many(), which
+# commits at once) where a message must be durable before carrying on.
+#
+# Messages to the same webhook are sent one after the other, in the
+# order they were put, so a channel never shows them out of order;
+# different webhooks are drained concurrently.  When a message can't
+# be delivered after the sender's retries, draining stops for its
+# webhook, and it's the first one sent on the next drain.  A message
+# the webhook refuses outright (an answer the sender doesn't retry,
+# e.g. 400 for an invalid card) can never succeed; it's set aside as a
+# dead letter so it doesn't hold up the messages behind it.
+#
+# Delivery is at least once: deletions are committed per batch, so a
+# message sent just before the process dies may be sent again.
+#
+# SQLite was chosen over a hand-rolled segment file for its crash
+# safety and cheap deletion; in WAL mode a commit appends to the log
+# with one fsync, so batched puts cost about as much as appends would.
+
+DEFAULT_BATCH_SIZE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status INTEGER,
+    dead INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (dead, id);
+"""
+
+
+class Outbox:
+    """
+    Disk-backed queue of messages waiting to be sent to webhooks.
+
+    ::
+
+        with Outbox('outbox.db') as outbox:
+            outbox.put(url, TeamsAdaptiveMessage(card))
+            ...
+            with WebhookSender() as sender:
+                outbox.drain(sender)
+    """
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Args:
+            path (str): The database file; created if it doesn't exist.
+            batch_size (int, optional): Number of put() messages buffered before
+                they are committed, and of messages read at a time when draining.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=FULL')
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> Outbox:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit any buffered messages and close the database."""
+        with self._lock:
+            self._commit_pending()
+            self._db.close()
+
+    def put(self, url: str, message) -> None:
+        """
+        Queue a message, committing the buffer once ``batch_size`` are waiting.
+
+        Args:
+            url (str): The incoming webhook URL.
+            message: A TeamsAdaptiveMessage, or its JSON as ``bytes`` or ``str``.
+        """
+        row = (url, _payload(message), time.time())
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._commit_pending()
+
+    def put_many(self, deliveries) -> None:
+        """
+        Queue a batch of messages and commit them, with any buffered ones, at once.
+
+        Args:
+            deliveries (iterable): ``(url, message)`` pairs.
+        """
+        now = time.time()
+        rows = [(url, _payload(message), now) for url, message in deliveries]
+        with self._lock:
+            self._pending.extend(rows)
+            self._commit_pending()
+
+    def flush(self) -> None:
+        """Commit the buffered messages to disk."""
+        with self._lock:
+            self._commit_pending()
+
+    def __len__(self) -> int:
+        """Number of messages waiting to be sent, including buffered ones."""
+        with self._lock:
+            stored = self._db.execute('SELECT COUNT(*) FROM outbox WHERE dead = 0').fetchone()[0]
+            return stored + len(self._pending)
+
+    def depths(self) -> dict:
+        """
+        Returns:
+            dict: The number of committed messages waiting, per webhook URL.
+        """
+        with self._lock:
+            return dict(self._db.execute('SELECT url, COUNT(*) FROM outbox WHERE dead = 0 '
+                                         'GROUP BY url'))
+
+    def dead_letters(self) -> list[tuple]:
+        """
+        Returns:
+            list[tuple]: ``(id, url, payload, status)`` of every message the webhook
+            refused, oldest first.
+        """
+        with self._lock:
+            return self._db.execute('SELECT id, url, payload, status FROM outbox '
+                                    'WHERE dead = 1 ORDER BY id').fetchall()
+
+    def requeue(self, ids) -> None:
+        """
+        Queue dead letters to be sent again, e.g. after fixing the webhook.
+
+        Args:
+            ids (iterable): Ids from dead_letters().
+        """
+        with self._lock:
+            with self._db:
+                self._db.executemany('UPDATE outbox SET dead = 0 WHERE id = ?',
+                                     [(id_,) for id_ in ids])
+
+    def discard(self, ids) -> None:
+        """
+        Delete messages, e.g. dead letters that won't be sent again.
+
+        Args:
+            ids (iterable): Ids from dead_letters().
+        """
+        with self._lock:
+            with self._db:
+                self._db.executemany('DELETE FROM outbox WHERE id = ?', [(id_,) for id_ in ids])
+
+    def drain(self, sender, max_messages: (int | None) = None) -> dict:
+        """
+        Send waiting messages with a blocking sender until none can be sent.
+
+        Args:
+            sender (WebhookSender): The sender to use; its ``max_workers`` webhooks
+                are drained at a time.
+            max_messages (int, optional): Stop once this many have been sent or set
+                aside.
+
+        Returns:
+            dict: The number of messages ``'sent'``, set aside as ``'dead'``, and
+            left waiting because their webhook is failing (``'deferred'``).
+        """
+        counts = {'sent': 0, 'dead': 0, 'deferred': 0}
+        cursor = 0
+        blocked = set()
+        with ThreadPoolExecutor(sender.max_workers, thread_name_prefix='Outbox') as executor:
+            while True:
+                groups, cursor = self._next_groups(cursor, blocked, counts, max_messages)
+                if not groups:
+                    break
+                outcomes = executor.map(lambda rows: _send_in_order(sender, rows), groups)
+                self._settle(sender.retry, groups, list(outcomes), blocked, counts)
+        return self._finish(blocked, counts)
+
+    async def drain_async(self, sender, max_messages: (int | None) = None) -> dict:
+        """
+        Send waiting messages with an AsyncWebhookSender until none can be sent.
+
+        The database is read and written in the event loop's thread; the commits
+        are small, but do block the loop briefly.
+
+        Args:
+            sender (AsyncWebhookSender): The sender to use.
+            max_messages (int, optional): See drain().
+
+        Returns:
+            dict: See drain().
+        """
+        import asyncio
+
+        async def send_in_order(rows: list) -> list:
+            results = []
+            for id_, url, payload in rows:
+                result = await sender.send(url, payload)
+                results.append((id_, result))
+                if _blocks(sender.retry, result):
+                    break
+            return results
+
+        counts = {'sent': 0, 'dead': 0, 'deferred': 0}
+        cursor = 0
+        blocked = set()
+        while True:
+            groups, cursor = self._next_groups(cursor, blocked, counts, max_messages)
+            if not groups:
+                break
+            outcomes = await asyncio.gather(*[send_in_order(rows) for rows in groups])
+            self._settle(sender.retry, groups, outcomes, blocked, counts)
+        return self._finish(blocked, counts)
+
+    def _next_groups(self, cursor: int, blocked: set, counts: dict,
+                     max_messages: (int | None)) -> tuple[list, int]:
+        # The next batch of waiting messages after ``cursor``, by webhook, in
+        # order, and the new cursor.  Messages to blocked webhooks are passed
+        # over.  An empty list once there is nothing more to send.
+        while True:
+            limit = self.batch_size
+            if max_messages is not None:
+                limit = min(limit, max_messages - counts['sent'] - counts['dead'])
+                if limit <= 0:
+                    return [], cursor
+            with self._lock:
+                self._commit_pending()
+                rows = self._db.execute('SELECT id, url, payload FROM outbox '
+                                        'WHERE dead = 0 AND id > ? ORDER BY id LIMIT ?',
+                                        (cursor, limit)).fetchall()
+            if not rows:
+                return [], cursor
+            cursor = rows[-1][0]
+            groups = {}
+            for row in rows:
+                if row[1] not in blocked:
+                    groups.setdefault(row[1], []).append(row)
+            if groups:
+                return list(groups.values()), cursor
+
+    def _settle(self, retry, groups: list, outcomes: list, blocked: set, counts: dict) -> None:
+        # Deletes what was delivered and records what wasn't, in one commit.
+        sent = []
+        dead = []
+        failed = []
+        for rows, results in zip(groups, outcomes):
+            for id_, result in results:
+                if result.ok:
+                    sent.append((id_,))
+                    continue
+                if _blocks(retry, result):
+                    failed.append((result.attempts, result.status, id_))
+                    blocked.add(rows[0][1])
+                else:
+                    dead.append((result.attempts, result.status, id_))
+        with self._lock:
+            with self._db:
+                self._db.executemany('DELETE FROM outbox WHERE id = ?', sent)
+                self._db.executemany('UPDATE outbox SET attempts = attempts + ?, status = ?, '
+                                     'dead = 1 WHERE id = ?', dead)
+                self._db.executemany('UPDATE outbox SET attempts = attempts + ?, status = ? '
+                                     'WHERE id = ?', failed)
+        counts['sent'] += len(sent)
+        counts['dead'] += len(dead)
+
+    def _finish(self, blocked: set, counts: dict) -> dict:
+        if blocked:
+            depths = self.depths()
+            counts['deferred'] = sum(depths.get(url, 0) for url in blocked)
+        return counts
+
+    def _commit_pending(self) -> None:
+        # Called with the lock held.
+        if not self._pending:
+            return
+        with self._db:
+            self._db.executemany('INSERT INTO outbox (url, payload, created) VALUES (?, ?, ?)',
+                                 self._pending)
+        self._pending = []
+
+
+def _blocks(retry, result) -> bool:
+    # Whether a failure holds up the webhook's later messages: they wait
+    # unless the message is refused outright and becomes a dead letter.
+    return not result.ok and retry.retryable(result.status)
+
+
+def _send_in_order(sender, rows: list) -> list:
+    # Sends one webhook's messages in order, stopping at a failure that blocks.
+    results = []
+    for id_, url, payload in rows:
+        result = sender.send(url, payload)
+        results.append((id_, result))
+        if _blocks(sender.retry, result):
+            break
+    return results
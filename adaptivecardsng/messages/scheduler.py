@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from time import monotonic
+
+# Per-webhook rate limiting in front of an AsyncWebhookSender.
+#
+# Teams throttles each incoming webhook to a few messages per second
+# and answers 429 beyond that.  Sending an alert storm as fast as the
+# connections allow gets most of it throttled, retried and throttled
+# again, while messages for quiet channels queue behind it.
+#
+# A Scheduler keeps a queue and a token bucket per webhook URL.  A
+# bucket holds up to ``burst`` tokens and gains ``rate`` tokens per
+# second; sending a message takes one, so a webhook gets at most
+# ``burst`` messages at once and ``rate`` per second after that.  The
+# dispatcher serves the webhooks round robin, one message per webhook
+# per turn, among those that have a token, so a storm on one channel
+# doesn't delay the others: each gets its share of the ``max_in_flight``
+# requests and of the sender's connections.
+#
+# If a webhook still answers 429 (e.g. because another process posts
+# to it too), its bucket is emptied so that it gets a pause before the
+# next message.
+#
+# stats() reports the queue depth and the time messages waited in the
+# queue, per webhook and overall.
+
+DEFAULT_RATE = 4.0
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` events per second on average, and bursts of up to ``burst``.
+    """
+    __slots__ = ('rate', 'burst', 'tokens', 'stamp')
+
+    def __init__(self, rate: float, burst: (float | None) = None,
+                 now: (float | None) = None) -> None:
+        """
+        Args:
+            rate (float): Tokens added per second.
+            burst (float, optional): Most tokens held at once. Defaults to ``rate``
+                (and at least 1).
+            now (float, optional): The current time.monotonic(); the bucket
+                starts full.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = max(1.0, rate if burst is None else burst)
+        self.tokens = self.burst
+        self.stamp = monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        if now > self.stamp:
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+
+    def delay(self, now: float) -> float:
+        """
+        Args:
+            now (float): The current time.monotonic().
+
+        Returns:
+            float: Seconds until a token is available; 0 if one is now.
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> bool:
+        """
+        Take a token if one is available.
+
+        Args:
+            now (float): The current time.monotonic().
+
+        Returns:
+            bool: Whether a token was taken.
+        """
+        if self.delay(now):
+            return False
+        self.tokens -= 1
+        return True
+
+    def empty(self, now: float) -> None:
+        """Take every token, e.g. after being throttled regardless."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _Destination:
+    __slots__ = ('bucket', 'queue', 'sent', 'throttled', 'waited', 'max_wait')
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self.bucket = bucket
+        self.queue = deque()
+        self.sent = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+
+class Scheduler:
+    """
+    Rate-limited, fair delivery of messages through an AsyncWebhookSender.
+
+    ::
+
+        async with AsyncWebhookSender() as sender:
+            async with Scheduler(sender, rate=4) as scheduler:
+                results = await scheduler.send_many(deliveries)
+    """
+    def __init__(self, sender, rate: float = DEFAULT_RATE, burst: (float | None) = None,
+                 rates: (dict | None) = None, max_in_flight: int = 16) -> None:
+        """
+        Args:
+            sender (AsyncWebhookSender): Sends the messages.
+            rate (float, optional): Messages per second allowed per webhook.
+            burst (float, optional): Messages allowed at once per webhook. Defaults
+                to ``rate``.
+            rates (dict, optional): ``{url: rate}`` or ``{url: (rate, burst)}`` for
+                webhooks with other limits.
+            max_in_flight (int, optional): Requests in progress at any time, over
+                all webhooks.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.sender = sender
+        self.rate = rate
+        self.burst = burst
+        self.rates = dict(rates or {})
+        self.max_in_flight = max_in_flight
+        self._destinations = {}
+        self._turns = deque()
+        self._in_flight = 0
+        self._tasks = set()
+        self._wakeup = None
+        self._idle = None
+        self._runner = None
+
+    async def __aenter__(self) -> Scheduler:
+        return self
+
+    async def __aexit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            await self.join()
+        await self.close()
+
+    def submit(self, url: str, message) -> asyncio.Future:
+        """
+        Queue a message; must be called from within the event loop.
+
+        Args:
+            url (str): The incoming webhook URL.
+            message: A TeamsAdaptiveMessage, or its JSON as ``bytes`` or ``str``.
+
+        Returns:
+            asyncio.Future: Resolves to the DeliveryResult once the message is sent.
+        """
+        if self._runner is None:
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._runner = asyncio.ensure_future(self._run())
+        destination = self._destinations.get(url)
+        if destination is None:
+            destination = self._destinations[url] = _Destination(self._bucket(url))
+        future = asyncio.get_event_loop().create_future()
+        if not destination.queue:
+            self._turns.append(url)
+        destination.queue.append((message, future, monotonic()))
+        self._idle.clear()
+        self._wakeup.set()
+        return future
+
+    async def send(self, url: str, message):
+        """
+        Queue a message and wait until it's sent.
+
+        Args:
+            url (str): The incoming webhook URL.
+            message: A TeamsAdaptiveMessage, or its JSON as ``bytes`` or ``str``.
+
+        Returns:
+            DeliveryResult: The outcome.
+        """
+        return await self.submit(url, message)
+
+    async def send_many(self, deliveries) -> list:
+        """
+        Queue a batch of messages and wait until all are sent.
+
+        Args:
+            deliveries (iterable): ``(url, message)`` pairs.
+
+        Returns:
+            list[DeliveryResult]: One result per pair, in the same order.
+        """
+        return list(await asyncio.gather(*[self.submit(url, message)
+                                           for url, message in deliveries]))
+
+    async def join(self) -> None:
+        """Wait until every queued message has been sent."""
+        if self._runner is not None:
+            await self._idle.wait()
+
+    async def close(self) -> None:
+        """Stop sending; messages still queued are cancelled."""
+        runner, self._runner = self._runner, None
+        if runner is None:
+            return
+        runner.cancel()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(runner, *tasks, return_exceptions=True)
+        for destination in self._destinations.values():
+            while destination.queue:
+                destination.queue.popleft()[1].cancel()
+        self._turns.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Queue depths and waiting times::
+
+                {'depth': ..., 'in_flight': ..., 'sent': ..., 'throttled': ...,
+                 'max_wait': ...,
+                 'webhooks': {url: {'depth': ..., 'sent': ..., 'throttled': ...,
+                                    'mean_wait': ..., 'max_wait': ...}}}
+
+            Waits are in seconds, from submit() until the message was handed to
+            the sender; ``throttled`` counts deliveries that still ended in 429.
+        """
+        webhooks = {}
+        for url, destination in self._destinations.items():
+            webhooks[url] = {
+                'depth': len(destination.queue),
+                'sent': destination.sent,
+                'throttled': destination.throttled,
+                'mean_wait': destination.waited / destination.sent if destination.sent else 0.0,
+                'max_wait': destination.max_wait,
+            }
+        return {
+            'depth': sum(entry['depth'] for entry in webhooks.values()),
+            'in_flight': self._in_flight,
+            'sent': sum(entry['sent'] for entry in webhooks.values()),
+            'throttled': sum(entry['throttled'] for entry in webhooks.values()),
+            'max_wait': max((entry['max_wait'] for entry in webhooks.values()), default=0.0),
+            'webhooks': webhooks,
+        }
+
+    def _bucket(self, url: str) -> TokenBucket:
+        limit = self.rates.get(url)
+        if limit is None:
+            return TokenBucket(self.rate, self.burst)
+        if isinstance(limit, tuple):
+            return TokenBucket(*limit)
+        return TokenBucket(limit)
+
+    async def _run(self) -> None:
+        turns = self._turns
+        while True:
+            # One turn for each webhook with queued messages, in order; a
+            # webhook without a token keeps its place for the next round.
+            now = monotonic()
+            wait = None
+            for _ in range(len(turns)):
+                if self._in_flight >= self.max_in_flight:
+                    wait = None
+                    break
+                url = turns.popleft()
+                destination = self._destinations[url]
+                delay = destination.bucket.delay(now)
+                if delay:
+                    wait = delay if wait is None else min(wait, delay)
+                else:
+                    destination.bucket.take(now)
+                    self._dispatch(url, destination, now)
+                if destination.queue:
+                    turns.append(url)
+            if not turns and not self._in_flight:
+                self._idle.set()
+
+            self._wakeup.clear()
+            if wait is None and turns and self._in_flight < self.max_in_flight:
+                continue
+            # Sleep until a token is due, or until a message is submitted or a
+            # request completes.  (A timer rather than wait_for(), which can
+            # swallow a cancellation arriving as the event is set.)
+            timer = None
+            if wait is not None:
+                timer = asyncio.get_event_loop().call_later(wait, self._wakeup.set)
+            try:
+                await self._wakeup.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+
+    def _dispatch(self, url: str, destination: _Destination, now: float) -> None:
+        message, future, queued = destination.queue.popleft()
+        waited = now - queued
+        destination.sent += 1
+        destination.waited += waited
+        destination.max_wait = max(destination.max_wait, waited)
+        self._in_flight += 1
+        task = asyncio.ensure_future(self._deliver(url, destination, message, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, url: str, destination: _Destination, message,
+                       future: asyncio.Future) -> None:
+        try:
+            result = await self.sender.send(url, message)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if result.status == 429:
+                destination.throttled += 1
+                destination.bucket.empty(monotonic())
+            if not future.done():
+                future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._wakeup.set()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .delivery import DeliveryResult, RetryPolicy, _HEADERS, _payload, _retry_after, _Target
+
+# Blocking delivery of messages to incoming webhooks, for code that
+# doesn't run an event loop (cron jobs, task queue workers).
+#
+# WebhookSender is the http.client counterpart of AsyncWebhookSender:
+# it keeps the connections it opens, per host, so a loop posting
+# hundreds of messages to the same host pays for the TCP and TLS
+# handshakes once per connection rather than once per message.  At most
+# ``max_per_host`` requests are in flight to a host; each thread takes
+# an idle connection, or opens one, for the duration of a request.
+#
+# send_many() spreads a batch over a small thread pool owned by the
+# sender.  Sending is I/O bound, so the threads overlap their waits for
+# the network despite the GIL.
+#
+# As with the asyncio sender, a request that fails on a reused
+# connection before any response arrives is sent again on a new
+# connection without counting as an attempt, and delivery failures are
+# reported in the DeliveryResult rather than raised.
+
+
+class _Host:
+    # The connections to one host.  Taking from and returning to the idle
+    # list are single list operations, atomic under the GIL.
+    __slots__ = ('limit', 'idle')
+
+    def __init__(self, max_connections: int) -> None:
+        self.limit = threading.BoundedSemaphore(max_connections)
+        self.idle = []
+
+
+class WebhookSender:
+    """
+    Posts messages to webhook URLs over pooled keep-alive connections, blocking.
+
+    Use it as a context manager, or call close() when done::
+
+        with WebhookSender(max_per_host=4) as sender:
+            for result in sender.send_many((url, message) for message in messages):
+                if not result.ok:
+                    log.warning('%r failed: %s', result.url, result.status)
+    """
+    def __init__(self, max_per_host: int = 4, timeout: float = 10.0,
+                 retry: (RetryPolicy | None) = None, ssl=None,
+                 max_workers: (int | None) = None) -> None:
+        """
+        Args:
+            max_per_host (int, optional): Number of concurrent requests, and of
+                pooled connections, per host.
+            timeout (float, optional): Socket timeout, in seconds, for connecting
+                and for each read and write.
+            retry (RetryPolicy, optional): Defaults to RetryPolicy().
+            ssl (ssl.SSLContext, optional): Context for https URLs. Defaults to the
+                system's default verified context.
+            max_workers (int, optional): Threads used by send_many(). Defaults to
+                ``max_per_host``.
+        """
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1.")
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.max_workers = max_workers or max_per_host
+        self._ssl = ssl
+        self._targets = {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __enter__(self) -> WebhookSender:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker threads and close all pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            hosts, self._hosts = self._hosts, {}
+        if executor is not None:
+            executor.shutdown()
+        for host in hosts.values():
+            for connection in host.idle:
+                connection.close()
+
+    def send(self, url: str, message) -> DeliveryResult:
+        """
+        Post one message, retrying throttled and failed attempts.
+
+        Args:
+            url (str): The incoming webhook URL.
+            message: A TeamsAdaptiveMessage, or its JSON as ``bytes`` or ``str``.
+
+        Returns:
+            DeliveryResult: The outcome of the last attempt.
+        """
+        target = self._targets.get(url)
+        if target is None:
+            target = self._targets[url] = _Target(url)
+        body = _payload(message)
+        retry = self.retry
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            status = None
+            headers = {}
+            content = b''
+            error = None
+            try:
+                status, headers, content = self._exchange(target, body)
+            except (OSError, http.client.HTTPException) as exc:
+                error = exc
+            if attempt >= retry.attempts or not retry.retryable(status):
+                return DeliveryResult(url, status, content, attempt,
+                                      time.perf_counter() - start, error)
+            time.sleep(retry.delay(attempt, _retry_after(headers.get('retry-after'))))
+
+    def send_many(self, deliveries) -> list[DeliveryResult]:
+        """
+        Post a batch of messages on the sender's worker threads.
+
+        Args:
+            deliveries (iterable): ``(url, message)`` pairs.
+
+        Returns:
+            list[DeliveryResult]: One result per pair, in the same order.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers,
+                                                    thread_name_prefix='WebhookSender')
+            executor = self._executor
+        futures = [executor.submit(self.send, url, message) for url, message in deliveries]
+        return [future.result() for future in futures]
+
+    def _host(self, key: tuple) -> _Host:
+        host = self._hosts.get(key)
+        if host is None:
+            with self._lock:
+                host = self._hosts.setdefault(key, _Host(self.max_per_host))
+        return host
+
+    def _exchange(self, target: _Target, body: bytes) -> tuple[int, dict, bytes]:
+        host = self._host(target.key)
+        with host.limit:
+            try:
+                connection = host.idle.pop()
+            except IndexError:
+                connection = None
+            if connection is not None:
+                try:
+                    return self._roundtrip(host, connection, target, body)
+                except ConnectionError:
+                    # Closed by the server while idle; try a new connection.
+                    pass
+            return self._roundtrip(host, self._connect(target), target, body)
+
+    def _connect(self, target: _Target) -> http.client.HTTPConnection:
+        if target.secure:
+            return http.client.HTTPSConnection(target.host, target.port, timeout=self.timeout,
+                                               context=self._ssl)
+        return http.client.HTTPConnection(target.host, target.port, timeout=self.timeout)
+
+    def _roundtrip(self, host: _Host, connection: http.client.HTTPConnection, target: _Target,
+                   body: bytes) -> tuple[int, dict, bytes]:
+        keep = False
+        try:
+            connection.request('POST', target.path, body, _HEADERS)
+            response = connection.getresponse()
+            content = response.read()
+            keep = not response.will_close
+            return response.status, {name.lower(): value for name, value
+                                     in response.getheaders()}, content
+        finally:
+            if keep:
+                host.idle.append(connection)
+            else:
+                connection.close()
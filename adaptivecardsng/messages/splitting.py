@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import copy
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.sizing import encoded_size
+
+from .teams import TeamsAdaptiveMessage
+
+# Splitting of oversized cards into several Teams messages.
+#
+# Each message gets a copy of the card carrying a slice of its body;
+# top-level properties other than "actions" are repeated on every part,
+# and the actions are kept for the last part only.  Body elements are
+# packed greedily in order.  A Table that doesn't fit in the space left
+# is split by rows into several Tables, each repeating the header row
+# when firstRowAsHeader is set.
+#
+# All sizes come from encoded_size().  The card is measured in full
+# once, and the candidate parts are then measured with fresh=False, so
+# that the sizes of the elements already measured are reused; the parts
+# are assembled from copies, never by changing lists in place.  As a
+# last line of defence every message is checked against the budget
+# before it's returned.
+
+# Teams rejects webhook payloads above roughly 28 KB; stay a little below.
+DEFAULT_BUDGET = 28000
+
+
+def _copy_with(obj, **changes):
+    clone = copy.copy(obj)
+    for key, value in changes.items():
+        clone[key] = value
+    return clone
+
+
+def _without(obj, *keys):
+    clone = copy.copy(obj)
+    for key in keys:
+        if key in clone:
+            del clone[key]
+    return clone
+
+
+class _Packer:
+    # Greedy, in-order packing of body elements into parts of at most ``room``
+    # bytes, where ``room`` excludes the message and card around the body.
+    def __init__(self, room: int) -> None:
+        self.room = room
+        self.parts = []
+        self.current = []
+        self.used = 0
+
+    def fits(self, size: int) -> bool:
+        return self.used + size + (1 if self.current else 0) <= self.room
+
+    def add(self, element, size: int) -> None:
+        self.used += size + (1 if self.current else 0)
+        self.current.append(element)
+
+    def flush(self) -> None:
+        if self.current:
+            self.parts.append(self.current)
+            self.current = []
+            self.used = 0
+
+
+def _state(obj) -> dict:
+    return obj if isinstance(obj, dict) else obj.__dict__
+
+
+def _table_header(state: dict) -> list:
+    # A list even if the rows are a tuple, as in compacted cards.
+    return list(state['rows'][:1]) if state.get('firstRowAsHeader') else []
+
+
+def _splittable(element) -> bool:
+    state = _state(element)
+    if state.get('type') != 'Table' or not state.get('rows'):
+        return False
+    return len(state['rows']) > len(_table_header(state))
+
+
+def _pack_table_rows(table, packer: _Packer) -> None:
+    state = _state(table)
+    header = _table_header(state)
+    rows = state['rows'][len(header):]
+    # Size of the Table with only its header row; each row adds its own size
+    # plus a comma, except the first row of a chunk without a header.
+    base = encoded_size(_copy_with(table, rows=header), fresh=False)
+
+    chunk = []
+    chunk_size = base
+    for row in rows:
+        row_size = encoded_size(row, fresh=False) + (1 if chunk or header else 0)
+        if not packer.fits(chunk_size + row_size):
+            if chunk:
+                packer.add(_copy_with(table, rows=header + chunk), chunk_size)
+            packer.flush()
+            chunk = []
+            chunk_size = base
+            row_size = encoded_size(row, fresh=False) + (1 if header else 0)
+            if not packer.fits(chunk_size + row_size):
+                raise ValueError(f"A Table row of {row_size} bytes doesn't fit in a "
+                                 f"message on its own.")
+        chunk.append(row)
+        chunk_size += row_size
+    packer.add(_copy_with(table, rows=header + chunk), chunk_size)
+
+
+def split_card(card: AdaptiveCard, budget: int = DEFAULT_BUDGET) -> list[TeamsAdaptiveMessage]:
+    """
+    Wrap a card in one or more TeamsAdaptiveMessages of at most ``budget`` bytes.
+
+    Args:
+        card (AdaptiveCard): The card to send.
+        budget (int, optional): Maximum encoded size of each message, in bytes.
+
+    Returns:
+        list: The messages, in order; a single message if the card already fits.
+
+    Raises:
+        ValueError: If a body element (or a single Table row) is too large to fit
+            in a message on its own.
+        TypeError: If the card holds lazily consumed rows or items (a LazySequence),
+            which can't be measured; pass lists instead.
+    """
+    message = TeamsAdaptiveMessage(card)
+    if encoded_size(message) <= budget:
+        return [message]
+
+    # Measured with the actions present, so that every part has room for them.
+    base = encoded_size(TeamsAdaptiveMessage(_copy_with(card, body=[])), fresh=False)
+    if base > budget:
+        raise ValueError(f"The card without its body is {base} bytes, over the "
+                         f"budget of {budget} bytes.")
+
+    packer = _Packer(budget - base)
+    for position, element in enumerate(_state(card).get('body') or ()):
+        size = encoded_size(element, fresh=False)
+        if packer.fits(size):
+            packer.add(element, size)
+        elif _splittable(element):
+            _pack_table_rows(element, packer)
+        else:
+            packer.flush()
+            if not packer.fits(size):
+                raise ValueError(f"body[{position}] is {size} bytes and doesn't fit in a "
+                                 f"message on its own.")
+            packer.add(element, size)
+    packer.flush()
+
+    parts = packer.parts
+    last = len(parts) - 1
+    without_actions = _without(card, 'actions')
+    messages = [TeamsAdaptiveMessage(_copy_with(card if index == last else without_actions,
+                                                body=part))
+                for index, part in enumerate(parts)]
+    for index, message in enumerate(messages):
+        size = encoded_size(message, fresh=False)
+        if size > budget:
+            raise ValueError(f"Part {index} of the card is {size} bytes, over the "
+                             f"budget of {budget} bytes.")
+    return messages
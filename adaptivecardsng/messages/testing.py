@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from time import monotonic
+
+from .scheduler import TokenBucket
+
+# A local stand-in for a Teams incoming webhook, for tests and benchmarks.
+#
+# StandInWebhook is a small HTTP/1.1 server on the loopback interface
+# that accepts JSON POSTs on any path the way a Teams webhook does:
+# it answers 200 with the body "1" and keeps the connection open.  It
+# records every payload it receives, and can be told to answer the
+# next requests with other statuses (e.g. 429 with a Retry-After), to
+# drop the connection instead of answering, as a server closing an idle
+# connection would, and to take a while to answer, to exercise retries,
+# connection reuse and concurrency.  Given
+# a ``rate``, it throttles each webhook path the way Teams does,
+# answering 429 to requests beyond that many per second.
+#
+# Used with ``async with`` it runs in the event loop under test.  Used
+# with a plain ``with``, for blocking senders, it runs in an event loop
+# of its own on a background thread.
+
+
+class StandInWebhook:
+    """
+    Local webhook server recording the messages posted to it.
+
+    Run it as an async context manager within the event loop under test, or as
+    a context manager on a thread of its own::
+
+        async with StandInWebhook() as webhook:
+            result = await sender.send(webhook.url, message)
+            assert webhook.received == [message.as_bytes()]
+
+        with StandInWebhook() as webhook:
+            result = WebhookSender().send(webhook.url, message)
+    """
+    def __init__(self, delay: float = 0.0, host: str = '127.0.0.1',
+                 rate: (float | None) = None, burst: (float | None) = None) -> None:
+        """
+        Args:
+            delay (float, optional): Seconds to wait before answering each request.
+            host (str, optional): Address to listen on. The port is chosen freely.
+            rate (float, optional): Requests per second accepted per path; others
+                are answered with 429. Unlimited by default.
+            burst (float, optional): Requests accepted at once per path. Defaults
+                to ``rate``.
+        """
+        self.delay = delay
+        self.rate = rate
+        self.burst = burst
+        self.throttled = 0
+        self._buckets = {}
+        self.host = host
+        self.port = None
+        self.received = []
+        self.paths = []
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._responses = deque()
+        self._server = None
+        self._handlers = set()
+        self._thread = None
+        self._stop = None
+
+    @property
+    def url(self) -> str:
+        """The webhook URL to post to."""
+        return f'http://{self.host}:{self.port}/webhook'
+
+    def respond(self, status: (int | None), body: bytes = b'', headers: (dict | None) = None,
+                times: int = 1) -> None:
+        """
+        Answer the next ``times`` requests with ``status`` rather than 200.
+
+        Queued answers are used in order; once they run out, requests succeed again.
+
+        Args:
+            status (int): HTTP status to answer with, or None to close the connection
+                without answering.
+            body (bytes, optional): Response body.
+            headers (dict, optional): Extra response headers, e.g. Retry-After.
+            times (int, optional): Number of requests to answer this way.
+        """
+        for _ in range(times):
+            self._responses.append((status, body, headers or {}))
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._serve, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening and close all open connections."""
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._handlers)
+            for handler in handlers:
+                handler.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> StandInWebhook:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __enter__(self) -> StandInWebhook:
+        started = threading.Event()
+        failure = []
+
+        async def run() -> None:
+            self._stop = (asyncio.get_running_loop(), asyncio.Event())
+            try:
+                await self.start()
+            except BaseException as exc:
+                failure.append(exc)
+                return
+            finally:
+                started.set()
+            try:
+                await self._stop[1].wait()
+            finally:
+                await self.close()
+
+        self._thread = threading.Thread(target=asyncio.run, args=(run(),),
+                                        name='StandInWebhook', daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            self._thread.join()
+            raise failure[0]
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        loop, stop = self._stop
+        loop.call_soon_threadsafe(stop.set)
+        self._thread.join()
+        self._thread = None
+
+    def _bucket(self, path: str) -> TokenBucket:
+        bucket = self._buckets.get(path)
+        if bucket is None:
+            bucket = self._buckets[path] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while await self._answer(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Cancelled by close(); the connection ends with the server.
+            pass
+        finally:
+            self._handlers.discard(handler)
+            writer.close()
+
+    async def _answer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        # Handles one request; returns whether the connection stays open.
+        line = await reader.readline()
+        if not line:
+            return False
+        path = line.split()[1].decode('latin-1')
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        payload = await reader.readexactly(int(headers.get('content-length', 0)))
+
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if self._responses:
+            status, body, extra = self._responses.popleft()
+            if status is None:
+                return False
+        elif self.rate is not None and not self._bucket(path).take(monotonic()):
+            self.throttled += 1
+            status, body, extra = 429, b'', {}
+        else:
+            status, body, extra = 200, b'1', {}
+            self.received.append(payload)
+            self.paths.append(path)
+        keep = headers.get('connection', '').lower() != 'close'
+        lines = [f'HTTP/1.1 {status} Stand-in']
+        if status in (204, 304):
+            # These never have a body, nor a Content-Length saying so.
+            body = b''
+        else:
+            lines += [f'Content-Length: {len(body)}', 'Content-Type: text/plain']
+        lines.extend(f'{name}: {value}' for name, value in extra.items())
+        if not keep:
+            lines.append('Connection: close')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+        return keep
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+
+from . import actions, cards, containers, elements, enums, inputs, types
+from .messages.teams import TeamsAdaptiveMessage
+
+# Deserialization: card JSON back into the BaseObject class tree.
+#
+# Everything needed to rebuild a node is looked up in tables built once
+# at import time, so parsing is a single O(n) pass with no per-node
+# reflection:
+#
+#   - _TYPES maps the "type" string of an object to its class.
+#   - Objects that carry no "type" (Fact, Choice, MediaSource, ...) are found
+#     through _CHILDREN, keyed on the parent class and property name.
+#   - Enum-valued properties are turned back into Enum members through
+#     reverse value -> member maps, with per-class overrides where the
+#     same key means different enums (e.g. "size", "style").
+#
+# Objects are created without calling __init__ and their attributes are
+# restored in document order, so serializing a parsed card reproduces
+# the original JSON.  Unrecognised values (e.g. a "color" that isn't a
+# Colors value) are kept as plain strings.
+
+
+def _reverse(enum_type) -> dict:
+    return {member.value: member for member in enum_type}
+
+
+_TYPES = {
+    'AdaptiveCard': cards.AdaptiveCard,
+    'message': TeamsAdaptiveMessage,
+    # Elements
+    'TextBlock': elements.TextBlock,
+    'Image': elements.Image,
+    'Media': elements.Media,
+    'RichTextBlock': elements.RichTextBlock,
+    'TextRun': elements.TextRun,
+    # Containers
+    'ActionSet': containers.ActionSet,
+    'Container': containers.Container,
+    'Column': containers.Column,
+    'ColumnSet': containers.ColumnSet,
+    'FactSet': containers.FactSet,
+    'ImageSet': containers.ImageSet,
+    'Table': containers.Table,
+    'TableRow': containers.TableRow,
+    'TableCell': containers.TableCell,
+    # Inputs
+    'Input.Text': inputs.Text,
+    'Input.Number': inputs.Number,
+    'Input.Date': inputs.Date,
+    'Input.Time': inputs.Time,
+    'Input.Toggle': inputs.Toggle,
+    'Input.ChoiceSet': inputs.ChoiceSet,
+    # Actions
+    'Action.OpenUrl': actions.OpenUrl,
+    'Action.Submit': actions.Submit,
+    'Action.ShowCard': actions.ShowCard,
+    'Action.ToggleVisibility': actions.ToggleVisibility,
+    'Action.Execute': actions.Execute,
+}
+
+# Properties holding objects that have no "type" of their own.
+_CHILDREN = {
+    cards.AdaptiveCard: {'refresh': types.Refresh,
+                         'authentication': types.Authentication,
+                         'backgroundImage': types.BackgroundImage},
+    containers.Container: {'backgroundImage': types.BackgroundImage},
+    containers.Column: {'backgroundImage': types.BackgroundImage},
+    containers.ColumnSet: {'columns': containers.Column},
+    containers.FactSet: {'facts': containers.Fact},
+    containers.Table: {'rows': containers.TableRow},
+    containers.TableRow: {'cells': containers.TableCell},
+    containers.TableCell: {'backgroundImage': types.BackgroundImage},
+    elements.Media: {'sources': elements.MediaSource},
+    elements.RichTextBlock: {'inlines': elements.TextRun},
+    inputs.ChoiceSet: {'choices': inputs.Choice},
+    actions.ToggleVisibility: {'targetElements': actions.TargetElement},
+    types.Authentication: {'tokenExchangeResource': types.TokenExchangeResource,
+                           'buttons': types.AuthCardButton},
+}
+
+# Properties holding arbitrary user data, which is never converted.
+_RAW = frozenset(('data', 'requires'))
+
+# Enum-valued properties shared by all classes.
+_COMMON_ENUMS = {
+    'color': _reverse(enums.Colors),
+    'fontType': _reverse(enums.FontType),
+    'weight': _reverse(enums.FontWeight),
+    'fillMode': _reverse(enums.ImageFillMode),
+    'horizontalAlignment': _reverse(enums.HorizontalAlignment),
+    'horizontalCellContentAlignment': _reverse(enums.HorizontalAlignment),
+    'verticalAlignment': _reverse(enums.VerticalAlignment),
+    'verticalContentAlignment': _reverse(enums.VerticalAlignment),
+    'verticalCellContentAlignment': _reverse(enums.VerticalAlignment),
+    'height': _reverse(enums.BlockElementHeight),
+    'spacing': _reverse(enums.Spacing),
+    'mode': _reverse(enums.ActionMode),
+    'associatedInputs': _reverse(enums.AssociatedInputs),
+    'gridStyle': _reverse(enums.ContainerStyle),
+    'imageSize': _reverse(enums.ImageSize),
+}
+
+_CONTAINER_STYLE = {'style': _reverse(enums.ContainerStyle)}
+_ACTION_STYLE = {'style': _reverse(enums.ActionStyle)}
+
+# Per-class overrides of _COMMON_ENUMS.
+_CLASS_ENUMS = {
+    elements.TextBlock: {'size': _reverse(enums.FontSize),
+                         'style': _reverse(enums.TextBlockStyle)},
+    elements.TextRun: {'size': _reverse(enums.FontSize)},
+    elements.Image: {'size': _reverse(enums.ImageSize),
+                     'style': _reverse(enums.ImageStyle)},
+    containers.Container: _CONTAINER_STYLE,
+    containers.Column: _CONTAINER_STYLE,
+    containers.ColumnSet: _CONTAINER_STYLE,
+    containers.TableCell: _CONTAINER_STYLE,
+    containers.TableRow: _CONTAINER_STYLE,
+    inputs.Text: {'style': _reverse(enums.TextInputStyle)},
+    inputs.ChoiceSet: {'style': _reverse(enums.ChoiceInputStyle)},
+    actions.OpenUrl: _ACTION_STYLE,
+    actions.Submit: _ACTION_STYLE,
+    actions.ShowCard: _ACTION_STYLE,
+    actions.ToggleVisibility: _ACTION_STYLE,
+    actions.Execute: _ACTION_STYLE,
+}
+
+_ENUMS = {cls: {**_COMMON_ENUMS, **overrides} for cls, overrides in _CLASS_ENUMS.items()}
+
+_NO_CHILDREN = {}
+
+
+def _parse_value(value, cls: (type | None) = None):
+    if value.__class__ is dict:
+        if cls is None:
+            cls = _TYPES.get(value.get('type'))
+            if cls is None:
+                return {key: _parse_value(item) for key, item in value.items()}
+        return _parse_object(cls, value)
+    if value.__class__ is list:
+        return [_parse_value(item, cls) for item in value]
+    return value
+
+
+def _parse_object(cls: type, data: dict):
+    enum_maps = _ENUMS.get(cls, _COMMON_ENUMS)
+    children = _CHILDREN.get(cls, _NO_CHILDREN)
+    state = {}
+    for key, value in data.items():
+        if value.__class__ is str:
+            members = enum_maps.get(key)
+            state[key] = value if members is None else members.get(value, value)
+        elif key in _RAW:
+            state[key] = value
+        else:
+            state[key] = _parse_value(value, children.get(key))
+
+    obj = cls.__new__(cls)
+    obj.__dict__.update(state)
+    return obj
+
+
+def from_dict(data: dict, cls: (type | None) = None):
+    """
+    Build BaseObjects from decoded card JSON.
+
+    Args:
+        data (dict): The decoded JSON, e.g. an AdaptiveCard or Teams message.
+        cls (type, optional): The class of the top-level object, for objects
+            that have no "type" property (e.g. a Fact or Choice).
+
+    Returns:
+        The rebuilt object, or a plain dict if its type isn't recognised.
+    """
+    return _parse_value(data, cls)
+
+
+def from_json(text: (str | bytes), cls: (type | None) = None):
+    """
+    Parse card JSON into BaseObjects.
+
+    Args:
+        text (str/bytes): The JSON document.
+        cls (type, optional): The class of the top-level object; see from_dict().
+
+    Returns:
+        The rebuilt object, or a plain dict if its type isn't recognised.
+    """
+    return _parse_value(json.loads(text), cls)
@@ -0,0 +1,720 @@
+from __future__ import annotations
+
+import enum
+try:
+    # The C accelerator, without importing the json package (and re) with it.
+    from _json import encode_basestring_ascii
+except ImportError:
+    from json.encoder import encode_basestring_ascii
+from operator import itemgetter
+
+# Serialization engine for BaseObject trees.
+#
+# The stock approach (json.dumps with BaseObjectJSONEncoder) calls
+# JSONEncoder.default() once for every nested object and every Enum
+# member, and then walks each object's __dict__ through the generic
+# encoder.  That is fine for a handful of cards, but it dominates the
+# CPU cost once cards are rendered at volume.
+#
+# Instead, the first time a given class is seen we "compile" a small
+# specialised routine for it and store it in a dispatch table keyed on
+# the exact type.  Object keys are JSON-encoded once per class and
+# cached, and Enum members are mapped straight to their encoded wire
+# strings, so the hot path is a handful of dict lookups per node.
+#
+# The output is byte-for-byte identical to what json.dumps() produces
+# for the same arguments with BaseObjectJSONEncoder.
+
+
+_INFINITY = float('inf')
+
+# Upper bound on the number of distinct keys we cache per class.  Plain
+# dicts (e.g. Submit.data payloads) can carry arbitrary keys, so we stop
+# caching once a class has seen this many.
+_KEY_CACHE_LIMIT = 4096
+
+
+def _float_repr(value: float) -> str:
+    # Mirrors json.encoder's floatstr() with allow_nan=True.
+    if value != value:
+        return 'NaN'
+    if value == _INFINITY:
+        return 'Infinity'
+    if value == -_INFINITY:
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+def _encode_key(key) -> str:
+    """Encode a mapping key the same way json.dumps() does."""
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    if isinstance(key, float):
+        return '"' + _float_repr(key) + '"'
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    if isinstance(key, int):
+        return '"' + int.__repr__(key) + '"'
+    raise TypeError(f'keys must be str, int, float, bool or None, '
+                    f'not {key.__class__.__name__}')
+
+
+class JSONFormat:
+    """
+    Describes the whitespace and ordering of serialized output.
+
+    Mirrors the ``indent``, ``separators`` and ``sort_keys`` arguments of
+    ``json.dumps`` so that output matches the standard library exactly.
+    """
+    def __init__(self, indent: (int | str | None) = None,
+                 separators: (tuple[str, str] | None) = None,
+                 sort_keys: bool = False) -> None:
+        """
+        Args:
+            indent (int/str, optional): Indentation per nesting level, as in json.dumps.
+            separators (tuple, optional): (item_separator, key_separator) pair.
+            sort_keys (bool, optional): Whether object keys are emitted in sorted order.
+        """
+        if indent is not None and not isinstance(indent, str):
+            indent = ' ' * indent
+        if separators is None:
+            separators = (', ', ': ') if indent is None else (',', ': ')
+        self.indent = indent
+        self.item_separator, self.key_separator = separators
+        self.sort_keys = sort_keys
+        self._newlines = ['\n']
+
+    def newline(self, level: int) -> str:
+        """Return the newline-and-indent string for the given nesting level."""
+        newlines = self._newlines
+        while len(newlines) <= level:
+            newlines.append('\n' + self.indent * len(newlines))
+        return newlines[level]
+
+
+# No whitespace, keys in insertion order: the cheapest form for the wire.
+COMPACT = JSONFormat(separators=(',', ':'))
+
+# No whitespace, keys sorted: deterministic output for hashing and comparison.
+CANONICAL = JSONFormat(separators=(',', ':'), sort_keys=True)
+
+
+# Scalar encoders, keyed on exact type.  Each maps a value to its JSON text.
+_SCALARS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: _float_repr,
+    bool: {True: 'true', False: 'false'}.__getitem__,
+    type(None): lambda value: 'null',
+}
+
+# Plain-data converters used by to_dict(), keyed on exact type.
+_PLAIN = {
+    str: None,
+    int: None,
+    float: None,
+    bool: None,
+    type(None): None,
+}
+
+# Compiled encoders for container-like types, keyed on exact type.
+_ENCODERS = {}
+
+# Object-like types, keyed on exact type: (items accessor, encoded key cache).
+_OBJECTS = {}
+
+# Sequence types that are encoded as JSON arrays without being lists or
+# tuples, see register_array_type().
+_ARRAYS = set()
+
+# Those of _ARRAYS that can only be iterated once.  Only a walk that
+# produces the output may consume them; see one_shot_error().
+_ONE_SHOT = set()
+
+
+def json_default(obj) -> object:
+    """
+    Fallback hook for third-party JSON encoders (the ``default=`` argument).
+
+    Converts objects the same way BaseObjectJSONEncoder.default() does, so any
+    encoder using this hook sees the same data as the compiled encoders.
+
+    Args:
+        obj: An Enum member, BaseObject or other object with a ``__dict__``.
+
+    Returns:
+        The wire string for Enum members, otherwise the object's attributes.
+    """
+    if isinstance(obj, enum.Enum):
+        return str(obj.value)
+    if obj.__class__ in _ARRAYS:
+        return list(obj)
+    return obj.__dict__
+
+
+def register_array_type(cls: type, encoder=None, one_shot: bool = False) -> None:
+    """
+    Have instances of a sequence type encoded as JSON arrays.
+
+    Args:
+        cls (type): A type supporting len() and iteration.
+        encoder (callable, optional): A specialised ``encoder(obj, fmt, parts, level)``
+            for the compiled encoder; it must produce the same output as encoding
+            ``list(obj)``. Defaults to the generic array encoder.
+        one_shot (bool, optional): Whether instances can only be iterated once,
+            e.g. because they draw from a generator. Such arrays need not support
+            len(), and are never walked except to produce output.
+    """
+    _ARRAYS.add(cls)
+    if one_shot:
+        _ONE_SHOT.add(cls)
+    _ENCODERS[cls] = encoder or _encode_array
+    _PLAIN[cls] = _plain_array
+
+
+def _object_items(obj) -> dict:
+    return obj.__dict__
+
+
+def _compile(cls: type):
+    """
+    Build and register the encoder routines for a type we haven't seen yet.
+
+    Subclasses of the JSON primitive types are handled the way the stdlib
+    encoder handles them, so mixed-in Enums (``class X(str, Enum)``) encode
+    exactly as json.dumps() would encode them.
+    """
+    if issubclass(cls, str):
+        _SCALARS[cls] = encode_basestring_ascii
+        _PLAIN[cls] = None
+        return
+    if issubclass(cls, int) and not issubclass(cls, bool):
+        _SCALARS[cls] = int.__repr__
+        _PLAIN[cls] = None
+        return
+    if issubclass(cls, float):
+        _SCALARS[cls] = _float_repr
+        _PLAIN[cls] = None
+        return
+    if issubclass(cls, (list, tuple)):
+        _ENCODERS[cls] = _encode_array
+        _PLAIN[cls] = _plain_array
+        return
+    if issubclass(cls, dict):
+        _register_object(cls, lambda obj: obj)
+        _PLAIN[cls] = _plain_mapping
+        return
+    if issubclass(cls, enum.Enum):
+        # Same wire value BaseObjectJSONEncoder.default() would produce.
+        wire = {member: str(member.value) for member in cls}
+        encoded = {member: encode_basestring_ascii(value) for member, value in wire.items()}
+        _SCALARS[cls] = encoded.__getitem__
+        _PLAIN[cls] = wire.__getitem__
+        return
+
+    _register_object(cls, _object_items)
+    _PLAIN[cls] = lambda obj: _plain_mapping(obj.__dict__)
+
+
+def _register_object(cls: type, items_of) -> None:
+    # Each class gets its own cache of pre-encoded keys.
+    keys = {}
+
+    def encode_object(obj, fmt: JSONFormat, parts: list, level: int) -> None:
+        _write_object(items_of(obj), fmt, parts, level, keys)
+
+    _OBJECTS[cls] = (items_of, keys)
+    _ENCODERS[cls] = encode_object
+
+
+def _key_text(key, keys: dict) -> str:
+    encoded = keys.get(key)
+    if encoded is None:
+        encoded = _encode_key(key)
+        # Only cache str keys: 1, 1.0 and True all hash alike.
+        if key.__class__ is str and len(keys) < _KEY_CACHE_LIMIT:
+            keys[key] = encoded
+    return encoded
+
+
+def _write_value(value, fmt: JSONFormat, parts: list, level: int) -> None:
+    cls = value.__class__
+    scalar = _SCALARS.get(cls)
+    if scalar is not None:
+        parts.append(scalar(value))
+        return
+    encoder = _ENCODERS.get(cls)
+    if encoder is None:
+        _compile(cls)
+        _write_value(value, fmt, parts, level)
+        return
+    encoder(value, fmt, parts, level)
+
+
+def _write_object(mapping: dict, fmt: JSONFormat, parts: list, level: int,
+                  keys: dict, write_value=_write_value) -> None:
+    if not mapping:
+        parts.append('{}')
+        return
+
+    items = mapping.items()
+    if fmt.sort_keys:
+        items = sorted(items, key=itemgetter(0))
+
+    if fmt.indent is None:
+        separator = fmt.item_separator
+        closing = '}'
+        parts.append('{')
+    else:
+        level += 1
+        newline = fmt.newline(level)
+        separator = fmt.item_separator + newline
+        closing = fmt.newline(level - 1) + '}'
+        parts.append('{' + newline)
+
+    key_separator = fmt.key_separator
+    first = True
+    for key, value in items:
+        encoded = keys.get(key)
+        if encoded is None:
+            encoded = _key_text(key, keys)
+        if first:
+            first = False
+            parts.append(encoded + key_separator)
+        else:
+            parts.append(separator + encoded + key_separator)
+
+        scalar = _SCALARS.get(value.__class__)
+        if scalar is not None:
+            parts.append(scalar(value))
+        else:
+            write_value(value, fmt, parts, level)
+    parts.append(closing)
+
+
+def _encode_array(array, fmt: JSONFormat, parts: list, level: int,
+                  write_value=_write_value) -> None:
+    if not array:
+        parts.append('[]')
+        return
+
+    if fmt.indent is None:
+        separator = fmt.item_separator
+        closing = ']'
+        parts.append('[')
+    else:
+        level += 1
+        newline = fmt.newline(level)
+        separator = fmt.item_separator + newline
+        closing = fmt.newline(level - 1) + ']'
+        parts.append('[' + newline)
+
+    first = True
+    for value in array:
+        if first:
+            first = False
+        else:
+            parts.append(separator)
+        scalar = _SCALARS.get(value.__class__)
+        if scalar is not None:
+            parts.append(scalar(value))
+        else:
+            write_value(value, fmt, parts, level)
+    parts.append(closing)
+
+
+def _plain_value(value):
+    try:
+        converter = _PLAIN[value.__class__]
+    except KeyError:
+        _compile(value.__class__)
+        converter = _PLAIN[value.__class__]
+    if converter is None:
+        return value
+    return converter(value)
+
+
+def _plain_array(array) -> list:
+    return [_plain_value(value) for value in array]
+
+
+def _plain_mapping(mapping: dict) -> dict:
+    return {key: _plain_value(value) for key, value in mapping.items()}
+
+
+def _children(value):
+    # The values directly beneath ``value``; None for scalars, and for
+    # array types that may only be iterated once.
+    if isinstance(value, (list, tuple)):
+        return value
+    if isinstance(value, dict):
+        return value.values()
+    layout = _OBJECTS.get(value.__class__)
+    if layout is not None:
+        return layout[0](value).values()
+    return None
+
+
+def one_shot_error(value, action: str) -> TypeError:
+    """
+    Build the error raised when ``action`` would consume a one-shot array.
+
+    Args:
+        value: The array, e.g. a LazySequence.
+        action (str): What was attempted, e.g. "measure".
+
+    Returns:
+        TypeError: The error to raise.
+    """
+    name = value.__class__.__name__
+    return TypeError(f"Can't {action} a card holding a {name} without consuming it; "
+                     f"pass a list instead, e.g. list(rows).")
+
+
+def _write_preview(value, fmt: JSONFormat, parts: list, level: int) -> None:
+    # _write_value(), except that one-shot arrays are written as a string
+    # placeholder rather than consumed.
+    cls = value.__class__
+    scalar = _SCALARS.get(cls)
+    if scalar is not None:
+        parts.append(scalar(value))
+        return
+    if cls in _ONE_SHOT:
+        parts.append(encode_basestring_ascii(repr(value)))
+        return
+
+    layout = _OBJECTS.get(cls)
+    if layout is None:
+        if cls not in _ENCODERS:
+            _compile(cls)
+            _write_preview(value, fmt, parts, level)
+            return
+        _encode_array(value, fmt, parts, level, _write_preview)
+        return
+    _write_object(layout[0](value), fmt, parts, level, layout[1], _write_preview)
+
+
+def _check_circular(obj) -> None:
+    """
+    Raise ValueError if the tree under ``obj`` contains itself.
+
+    The encoders keep no record of the objects they are inside of, which
+    would cost a set operation per node; a cycle shows up as a RecursionError
+    instead, and this tells it apart from a merely very deep tree, with the
+    error json.dumps() raises.
+    """
+    # Ids of the objects on the path from the root to the current one.
+    path = set()
+    finished = set()
+    stack = [(obj, False)]
+    while stack:
+        value, leaving = stack.pop()
+        marker = id(value)
+        if leaving:
+            path.discard(marker)
+            finished.add(marker)
+            continue
+        if marker in path:
+            raise ValueError("Circular reference detected")
+        if marker in finished:
+            continue
+        children = _children(value)
+        if children is None:
+            continue
+        path.add(marker)
+        stack.append((value, True))
+        stack.extend((child, False) for child in children)
+
+
+def to_dict(obj) -> object:
+    """
+    Convert an object tree into plain JSON-compatible Python data.
+
+    BaseObjects become dicts, Enum members become their wire strings, and
+    tuples become lists.  Passing the result to json.dumps() yields the same
+    output as passing the original tree with BaseObjectJSONEncoder.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+
+    Returns:
+        The plain-data equivalent of ``obj``.
+    """
+    try:
+        return _plain_value(obj)
+    except RecursionError:
+        _check_circular(obj)
+        raise
+
+
+def to_json(obj, indent: (int | str | None) = None,
+            separators: (tuple[str, str] | None) = None,
+            sort_keys: bool = False) -> str:
+    """
+    Serialize an object tree to a JSON string using the compiled encoders.
+
+    Takes the same formatting arguments as json.dumps() and produces identical
+    output to ``json.dumps(obj, cls=BaseObjectJSONEncoder, ...)``.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        indent (int/str, optional): Indentation per nesting level.
+        separators (tuple, optional): (item_separator, key_separator) pair.
+        sort_keys (bool, optional): Whether object keys are emitted in sorted order.
+
+    Returns:
+        str: The encoded JSON document.
+    """
+    return encode(obj, JSONFormat(indent, separators, sort_keys))
+
+
+def encode(obj, fmt: JSONFormat) -> str:
+    """
+    Serialize an object tree to a JSON string with a prebuilt JSONFormat.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        fmt (JSONFormat): The output format to use.
+
+    Returns:
+        str: The encoded JSON document.
+    """
+    parts = []
+    try:
+        _write_value(obj, fmt, parts, 0)
+    except RecursionError:
+        _check_circular(obj)
+        raise
+    return ''.join(parts)
+
+
+def preview(obj, fmt: JSONFormat) -> str:
+    """
+    Serialize an object tree for display, without consuming one-shot arrays.
+
+    Like encode(), except that any one-shot array, such as a LazySequence, is
+    shown as a string placeholder (e.g. ``"<LazySequence (pending)>"``) and left
+    as it was.  Slower than encode(); used by str() and repr() of BaseObjects.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        fmt (JSONFormat): The output format to use.
+
+    Returns:
+        str: The JSON-like text.
+    """
+    parts = []
+    try:
+        _write_preview(obj, fmt, parts, 0)
+    except RecursionError:
+        _check_circular(obj)
+        raise
+    return ''.join(parts)
+
+
+def encode_bytes(obj, fmt: JSONFormat = COMPACT) -> bytes:
+    """
+    Serialize an object tree to UTF-8 encoded JSON bytes.
+
+    The encoder escapes all non-ASCII characters, so the result is plain
+    ASCII and therefore valid UTF-8; converting the joined text is a straight
+    copy rather than a transcode.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        fmt (JSONFormat, optional): The output format to use. Defaults to COMPACT.
+
+    Returns:
+        bytes: The encoded JSON document.
+    """
+    return encode(obj, fmt).encode('ascii')
+
+
+# Default size, in characters, of the chunks produced by iterencode().
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _Chunker:
+    # Collects encoded parts and reports when enough text has built up to
+    # emit a chunk.  Part lengths are summed incrementally so each part is
+    # only measured once.
+    __slots__ = ('parts', 'counted', 'size', 'chunk_size')
+
+    def __init__(self, chunk_size: int) -> None:
+        self.parts = []
+        self.counted = 0
+        self.size = 0
+        self.chunk_size = chunk_size
+
+    def ready(self) -> bool:
+        parts = self.parts
+        self.size += sum(map(len, parts[self.counted:]))
+        self.counted = len(parts)
+        return self.size >= self.chunk_size
+
+    def take(self) -> str:
+        text = ''.join(self.parts)
+        self.parts.clear()
+        self.counted = 0
+        self.size = 0
+        return text
+
+
+def _iter_value(value, fmt: JSONFormat, chunker: _Chunker, level: int):
+    cls = value.__class__
+    if cls not in _SCALARS and cls not in _ENCODERS:
+        _compile(cls)
+
+    scalar = _SCALARS.get(cls)
+    if scalar is not None:
+        chunker.parts.append(scalar(value))
+        return
+
+    layout = _OBJECTS.get(cls)
+    if layout is not None:
+        items_of, keys = layout
+        yield from _iter_object(items_of(value), fmt, chunker, level, keys)
+    else:
+        yield from _iter_array(value, fmt, chunker, level)
+
+
+def _iter_object(mapping: dict, fmt: JSONFormat, chunker: _Chunker, level: int,
+                 keys: dict):
+    parts = chunker.parts
+    if not mapping:
+        parts.append('{}')
+        return
+
+    items = mapping.items()
+    if fmt.sort_keys:
+        items = sorted(items, key=itemgetter(0))
+
+    if fmt.indent is None:
+        separator = fmt.item_separator
+        closing = '}'
+        parts.append('{')
+    else:
+        level += 1
+        newline = fmt.newline(level)
+        separator = fmt.item_separator + newline
+        closing = fmt.newline(level - 1) + '}'
+        parts.append('{' + newline)
+
+    key_separator = fmt.key_separator
+    first = True
+    for key, value in items:
+        if first:
+            first = False
+            parts.append(_key_text(key, keys) + key_separator)
+        else:
+            parts.append(separator + _key_text(key, keys) + key_separator)
+
+        scalar = _SCALARS.get(value.__class__)
+        if scalar is not None:
+            parts.append(scalar(value))
+        else:
+            yield from _iter_value(value, fmt, chunker, level)
+            if chunker.ready():
+                yield chunker.take()
+    parts.append(closing)
+
+
+def _iter_array(array, fmt: JSONFormat, chunker: _Chunker, level: int):
+    parts = chunker.parts
+    if not array:
+        parts.append('[]')
+        return
+
+    if fmt.indent is None:
+        separator = fmt.item_separator
+        closing = ']'
+        parts.append('[')
+    else:
+        level += 1
+        newline = fmt.newline(level)
+        separator = fmt.item_separator + newline
+        closing = fmt.newline(level - 1) + ']'
+        parts.append('[' + newline)
+
+    first = True
+    for value in array:
+        if first:
+            first = False
+        else:
+            parts.append(separator)
+        scalar = _SCALARS.get(value.__class__)
+        if scalar is not None:
+            parts.append(scalar(value))
+        else:
+            yield from _iter_value(value, fmt, chunker, level)
+            if chunker.ready():
+                yield chunker.take()
+    parts.append(closing)
+
+
+def iterencode(obj, fmt: JSONFormat = COMPACT, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Serialize an object tree incrementally, yielding the JSON text in chunks.
+
+    Only about ``chunk_size`` characters of output are held in memory at a time,
+    so arbitrarily large cards can be written out without building the whole
+    document first.  Joining the chunks gives exactly what encode() returns.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        fmt (JSONFormat, optional): The output format to use. Defaults to COMPACT.
+        chunk_size (int, optional): Approximate size of each chunk, in characters.
+
+    Yields:
+        str: Consecutive pieces of the encoded JSON document.
+    """
+    chunker = _Chunker(chunk_size)
+    try:
+        yield from _iter_value(obj, fmt, chunker, 0)
+    except RecursionError:
+        _check_circular(obj)
+        raise
+    if chunker.parts:
+        yield chunker.take()
+
+
+def iterencode_bytes(obj, fmt: JSONFormat = COMPACT,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Like iterencode(), but yields UTF-8 encoded ``bytes`` chunks.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        fmt (JSONFormat, optional): The output format to use. Defaults to COMPACT.
+        chunk_size (int, optional): Approximate size of each chunk, in bytes.
+
+    Yields:
+        bytes: Consecutive pieces of the encoded JSON document.
+    """
+    for chunk in iterencode(obj, fmt, chunk_size):
+        yield chunk.encode('ascii')
+
+
+def dump(obj, fp, fmt: JSONFormat = COMPACT, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Serialize an object tree incrementally to a binary file-like object.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        fp: Any object with a ``write(bytes)`` method, such as a file opened in
+            binary mode or a socket's makefile('wb').
+        fmt (JSONFormat, optional): The output format to use. Defaults to COMPACT.
+        chunk_size (int, optional): Approximate size of each write, in bytes.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    written = 0
+    for chunk in iterencode_bytes(obj, fmt, chunk_size):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import weakref
+
+from .base import BaseObject, add_mutation_listener, remove_mutation_listener
+from .compact import CompactNode
+from .serialization import (_ENCODERS, _OBJECTS, _ONE_SHOT, _SCALARS, _compile, _key_text,
+                            one_shot_error)
+
+# Encoded payload-size accounting.
+#
+# Teams rejects webhook payloads above roughly 28 KB, so callers need to
+# know how big a card will be on the wire, often repeatedly while they
+# add or trim content.  encoded_size() returns the length in bytes of
+# the compact (as_bytes()) encoding without building it.
+#
+# The size of every BaseObject subtree is remembered once measured, and
+# the same parent bookkeeping as SerializationCache is used to keep it
+# up to date: a mutation listener drops the size of a changed object and
+# of everything above it.  Asking again for the size of an unchanged
+# tree is a single lookup, and after a change only the path from the
+# changed object to the root is measured again; untouched siblings keep
+# their sizes.
+#
+# As with the serialization cache, in-place changes to plain lists and
+# dicts (e.g. card.body.append(x)), which is how cards are usually
+# built, are not seen by the listener.  encoded_size() therefore
+# measures the whole tree by default, remembering the new sizes, and
+# the remembered sizes are only used when asked for with fresh=False:
+# by callers that changed the tree only through attribute assignment
+# since it was last measured, such as split_card() measuring the parts
+# of a card it has just measured.
+#
+# One-shot arrays (LazySequence) can't be measured without consuming
+# them, so they are refused with a TypeError.
+#
+# Intercepting attribute assignment slows object construction, so the
+# listener is only registered while some measured object is alive.
+#
+# Sizes are those of the builtin encoder, which escapes all non-ASCII
+# text.  Backends writing raw UTF-8 (orjson) never produce more bytes.
+
+_TRACKED = (BaseObject, CompactNode)
+
+# Bytes added by the two separators around each object member (':' and
+# ','), and by the brackets or braces of a non-empty container.
+_MEMBER_OVERHEAD = 2
+_CONTAINER_OVERHEAD = 1
+
+
+class _SizeTracker:
+    def __init__(self) -> None:
+        self._sizes = {}
+        self._parents = {}
+        add_mutation_listener(self._on_mutation)
+
+    def invalidate(self, obj) -> None:
+        sizes = self._sizes
+        parents = self._parents
+        pending = [id(obj)]
+        seen = set()
+        while pending:
+            key = pending.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+            sizes.pop(key, None)
+            pending.extend(parents.get(key, ()))
+
+    def _on_mutation(self, obj) -> None:
+        key = id(obj)
+        if key in self._sizes:
+            self.invalidate(obj)
+
+    def _forget(self, key: int) -> None:
+        self._sizes.pop(key, None)
+        self._parents.pop(key, None)
+        if not self._sizes:
+            _release(self)
+
+    def _measure_object(self, mapping: dict, keys: dict, parent, fresh: bool) -> int:
+        if not mapping:
+            return 2
+        size = _CONTAINER_OVERHEAD
+        for key, value in mapping.items():
+            encoded = keys.get(key)
+            if encoded is None:
+                encoded = _key_text(key, keys)
+            scalar = _SCALARS.get(value.__class__)
+            if scalar is not None:
+                size += len(encoded) + len(scalar(value)) + _MEMBER_OVERHEAD
+            else:
+                size += len(encoded) + self.measure(value, parent, fresh) + _MEMBER_OVERHEAD
+        return size
+
+    def measure(self, value, parent=None, fresh: bool = False) -> int:
+        cls = value.__class__
+        scalar = _SCALARS.get(cls)
+        if scalar is not None:
+            return len(scalar(value))
+
+        layout = _OBJECTS.get(cls)
+        if layout is None:
+            if cls not in _ENCODERS:
+                _compile(cls)
+                return self.measure(value, parent, fresh)
+            if cls in _ONE_SHOT:
+                raise one_shot_error(value, 'measure')
+            # Counted while iterating: registered array types need not have len().
+            size = _CONTAINER_OVERHEAD
+            count = 0
+            for item in value:
+                scalar = _SCALARS.get(item.__class__)
+                if scalar is not None:
+                    size += len(scalar(item))
+                else:
+                    size += self.measure(item, parent, fresh)
+                count += 1
+            return size + count if count else 2
+        if not isinstance(value, _TRACKED):
+            return self._measure_object(layout[0](value), layout[1], parent, fresh)
+
+        key = id(value)
+        if parent is not None:
+            self._parents.setdefault(key, set()).add(parent)
+        if not fresh:
+            entry = self._sizes.get(key)
+            if entry is not None:
+                return entry[1]
+
+        size = self._measure_object(layout[0](value), layout[1], key, fresh)
+        # Weakly held, as in SerializationCache, so a new object reusing the
+        # id() can't pick up a stale size.
+        reference = weakref.ref(value, lambda _, key=key: self._forget(key))
+        self._sizes[key] = (reference, size)
+        return size
+
+
+_tracker = None
+
+
+def _get_tracker() -> _SizeTracker:
+    global _tracker
+    if _tracker is None:
+        _tracker = _SizeTracker()
+    return _tracker
+
+
+def _release(tracker: _SizeTracker) -> None:
+    # Called once every measured object has been garbage collected.
+    global _tracker
+    if _tracker is tracker:
+        _tracker = None
+        remove_mutation_listener(tracker._on_mutation)
+
+
+def encoded_size(obj, fresh: bool = True) -> int:
+    """
+    Return the size in bytes of the compact JSON encoding of ``obj``.
+
+    Equal to ``len(obj.as_bytes())`` with the builtin backend, without building
+    the encoding.  The sizes of all subtrees are remembered, and with
+    ``fresh=False`` those of subtrees that haven't changed since they were last
+    measured are reused.
+
+    Remembered sizes only follow attribute and item assignment on BaseObjects.
+    In-place changes to lists and dicts, such as ``card.body.append(x)``, leave
+    them stale, and ``fresh=False`` then returns a wrong size without any error;
+    call invalidate() on the object holding the list after such a change.
+
+    Args:
+        obj: Any BaseObject, or a list/dict/scalar containing them.
+        fresh (bool, optional): Measure every subtree again. Defaults to True;
+            pass False to reuse remembered sizes, see above.
+
+    Returns:
+        int: The encoded size in bytes.
+
+    Raises:
+        TypeError: If the tree holds a one-shot array such as a LazySequence.
+    """
+    return _get_tracker().measure(obj, fresh=fresh)
+
+
+def invalidate(obj) -> None:
+    """
+    Forget the remembered size of ``obj`` and of every object it was found under.
+
+    Needed after in-place changes to lists or dicts held by ``obj``, which are
+    not tracked automatically.
+
+    Args:
+        obj: A BaseObject or CompactNode.
+    """
+    if _tracker is not None:
+        _tracker.invalidate(obj)
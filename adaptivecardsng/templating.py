@@ -0,0 +1,685 @@
+from __future__ import annotations
+
+import re
+from json.encoder import encode_basestring_ascii
+
+from .serialization import COMPACT, JSONFormat, _encode_key, _write_value, to_dict
+
+# Adaptive Card templating.
+#
+# A template is an ordinary card whose string values contain
+# ``${...}`` data-binding expressions, following the Adaptive Cards
+# Templating language (https://learn.microsoft.com/adaptive-cards/templating/):
+#
+#   - A string that is exactly one ``${expr}`` is replaced by the value
+#     of the expression, keeping its JSON type (number, bool, object).
+#   - Expressions embedded in a longer string are interpolated as text.
+#   - ``$data`` on an element changes the data scope for that element.
+#     When it evaluates to an array inside an array (e.g. a card body),
+#     the element is repeated once per item.
+#   - ``$when`` drops the element when its expression is false.  On the
+#     card itself it drops the whole card: render() returns ''.
+#   - Inside expressions, ``$root`` is the record being rendered, ``$data``
+#     the current scope and ``$index`` the position within a ``$data``
+#     expansion.  Bindings that can't be resolved are left as written.
+#
+# Rather than walking the card and evaluating bindings for every record,
+# compile_template() turns the card into a render plan once.  Subtrees
+# with no bindings are encoded to their final JSON text at compile time,
+# and expressions are compiled into Python closures, so rendering a
+# record only evaluates the bindings and concatenates pre-encoded text.
+#
+# The expression language is a practical subset of the Adaptive
+# Expressions language: literals, property paths (a.b, a[0], a['b']),
+# arithmetic, comparison and logical operators, and the functions in
+# _FUNCTIONS below.
+
+
+class TemplateError(ValueError):
+    """Raised when a template or one of its expressions can't be compiled."""
+
+
+class _Undefined:
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return 'undefined'
+
+
+_UNDEFINED = _Undefined()
+
+
+class _Scope:
+    __slots__ = ('data', 'root', 'index')
+
+    def __init__(self, data, root, index) -> None:
+        self.data = data
+        self.root = root
+        self.index = index
+
+
+def _member(value, name):
+    if value is _UNDEFINED or value is None:
+        return _UNDEFINED
+    if isinstance(value, dict):
+        return value.get(name, _UNDEFINED)
+    if isinstance(value, (list, tuple, str)):
+        if isinstance(name, int) and not isinstance(name, bool) and -len(value) <= name < len(value):
+            return value[name]
+        return _UNDEFINED
+    if isinstance(name, str):
+        return getattr(value, name, _UNDEFINED)
+    return _UNDEFINED
+
+
+def _text(value) -> str:
+    # String conversion used for interpolation, following JavaScript rules.
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _add(left, right):
+    if left is _UNDEFINED or right is _UNDEFINED:
+        return _UNDEFINED
+    if isinstance(left, str) or isinstance(right, str):
+        return _text(left) + _text(right)
+    return left + right
+
+
+def _arithmetic(operation):
+    def apply(left, right):
+        if left is _UNDEFINED or right is _UNDEFINED:
+            return _UNDEFINED
+        try:
+            return operation(left, right)
+        except (TypeError, ZeroDivisionError):
+            return _UNDEFINED
+    return apply
+
+
+def _comparison(operation):
+    def apply(left, right):
+        if left is _UNDEFINED or right is _UNDEFINED:
+            return False
+        try:
+            return operation(left, right)
+        except TypeError:
+            return False
+    return apply
+
+
+def _divide(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        return left // right
+    return left / right
+
+
+_BINARY = {
+    '+': _add,
+    '-': _arithmetic(lambda a, b: a - b),
+    '*': _arithmetic(lambda a, b: a * b),
+    '/': _arithmetic(_divide),
+    '%': _arithmetic(lambda a, b: a % b),
+    '<': _comparison(lambda a, b: a < b),
+    '>': _comparison(lambda a, b: a > b),
+    '<=': _comparison(lambda a, b: a <= b),
+    '>=': _comparison(lambda a, b: a >= b),
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+
+def _count(value) -> int:
+    if value is _UNDEFINED or value is None:
+        return 0
+    return len(value)
+
+
+_FUNCTIONS = {
+    'if': lambda condition, then, otherwise: then if condition else otherwise,
+    'not': lambda value: not value,
+    'and': lambda *values: all(values),
+    'or': lambda *values: any(values),
+    'equals': lambda left, right: left == right,
+    'empty': lambda value: not value,
+    'exists': lambda value: value is not _UNDEFINED and value is not None,
+    'count': _count,
+    'length': _count,
+    'string': _text,
+    'int': int,
+    'float': float,
+    'toUpper': lambda value: _text(value).upper(),
+    'toLower': lambda value: _text(value).lower(),
+    'concat': lambda *values: ''.join(_text(value) for value in values),
+    'join': lambda values, separator: separator.join(_text(value) for value in values),
+    'formatNumber': lambda value, precision=0: f'{value:,.{int(precision)}f}',
+}
+
+_CONSTANTS = {'true': True, 'false': False, 'null': None}
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<number>\d+(?:\.\d+)?)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<name>[A-Za-z_$@][\w$@]*)
+  | (?P<op>&&|\|\||==|!=|<=|>=|[-+*/%<>!().,\[\]])
+)""", re.VERBOSE)
+
+_ESCAPES = re.compile(r"\\(.)")
+
+
+def _tokenize(source: str) -> list:
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        if match is None:
+            raise TemplateError(f"Unexpected character in expression {source!r} "
+                                f"at offset {position}")
+        position = match.end()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+    tokens.append(('end', None))
+    return tokens
+
+
+class _Parser:
+    # Recursive-descent parser that compiles an expression straight into
+    # nested closures taking a _Scope.
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.position = 0
+
+    def peek(self) -> tuple:
+        return self.tokens[self.position]
+
+    def advance(self) -> tuple:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def accept(self, *operators) -> (str | None):
+        kind, value = self.peek()
+        if kind == 'op' and value in operators:
+            self.position += 1
+            return value
+        return None
+
+    def expect(self, operator: str) -> None:
+        if self.accept(operator) is None:
+            raise TemplateError(f"Expected {operator!r} in expression {self.source!r}")
+
+    def parse(self):
+        expression = self.parse_or()
+        if self.peek()[0] != 'end':
+            raise TemplateError(f"Unexpected {self.peek()[1]!r} in expression {self.source!r}")
+        return expression
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self.accept('||'):
+            right = self.parse_and()
+            left = (lambda a, b: lambda scope: a(scope) or b(scope))(left, right)
+        return left
+
+    def parse_and(self):
+        left = self.parse_binary(0)
+        while self.accept('&&'):
+            right = self.parse_binary(0)
+            left = (lambda a, b: lambda scope: a(scope) and b(scope))(left, right)
+        return left
+
+    _LEVELS = (('==', '!='), ('<', '>', '<=', '>='), ('+', '-'), ('*', '/', '%'))
+
+    def parse_binary(self, level: int):
+        if level == len(self._LEVELS):
+            return self.parse_unary()
+        left = self.parse_binary(level + 1)
+        while True:
+            operator = self.accept(*self._LEVELS[level])
+            if operator is None:
+                return left
+            right = self.parse_binary(level + 1)
+            left = (lambda apply, a, b: lambda scope: apply(a(scope), b(scope)))(
+                _BINARY[operator], left, right)
+
+    def parse_unary(self):
+        if self.accept('!'):
+            operand = self.parse_unary()
+            return lambda scope: not operand(scope)
+        if self.accept('-'):
+            operand = self.parse_unary()
+            return lambda scope: _BINARY['-'](0, operand(scope))
+        return self.parse_postfix()
+
+    def parse_postfix(self):
+        expression = self.parse_primary()
+        while True:
+            if self.accept('.'):
+                kind, name = self.advance()
+                if kind != 'name':
+                    raise TemplateError(f"Expected a property name in expression "
+                                        f"{self.source!r}")
+                expression = (lambda target, key: lambda scope: _member(target(scope), key))(
+                    expression, name)
+            elif self.accept('['):
+                index = self.parse_or()
+                self.expect(']')
+                expression = (lambda target, key: lambda scope: _member(target(scope),
+                                                                         key(scope)))(
+                    expression, index)
+            else:
+                return expression
+
+    def parse_primary(self):
+        kind, value = self.advance()
+        if kind == 'number':
+            constant = float(value) if '.' in value else int(value)
+            return lambda scope: constant
+        if kind == 'string':
+            constant = _ESCAPES.sub(r'\1', value[1:-1])
+            return lambda scope: constant
+        if kind == 'op' and value == '(':
+            expression = self.parse_or()
+            self.expect(')')
+            return expression
+        if kind == 'name':
+            if self.accept('('):
+                return self.parse_call(value)
+            if value in _CONSTANTS:
+                constant = _CONSTANTS[value]
+                return lambda scope: constant
+            if value == '$root':
+                return lambda scope: scope.root
+            if value == '$data':
+                return lambda scope: scope.data
+            if value == '$index':
+                return lambda scope: scope.index
+            return lambda scope: _member(scope.data, value)
+        if kind == 'end':
+            raise TemplateError(f"Unexpected end of expression {self.source!r}")
+        raise TemplateError(f"Unexpected {value!r} in expression {self.source!r}")
+
+    def parse_call(self, name: str):
+        try:
+            function = _FUNCTIONS[name]
+        except KeyError:
+            raise TemplateError(f"Unknown function {name!r} in expression "
+                                f"{self.source!r}") from None
+        arguments = []
+        if not self.accept(')'):
+            arguments.append(self.parse_or())
+            while self.accept(','):
+                arguments.append(self.parse_or())
+            self.expect(')')
+
+        def call(scope):
+            values = [argument(scope) for argument in arguments]
+            try:
+                return function(*values)
+            except (TypeError, ValueError):
+                return _UNDEFINED
+        return call
+
+
+def compile_expression(source: str):
+    """
+    Compile a binding expression (the text between ``${`` and ``}``).
+
+    Args:
+        source (str): The expression source.
+
+    Returns:
+        callable: A function of a scope returning the expression's value.
+
+    Raises:
+        TemplateError: If the expression is malformed.
+    """
+    return _Parser(source).parse()
+
+
+def _split_bindings(text: str) -> list:
+    # Split a string into literal text and (source, expression) pairs.
+    pieces = []
+    position = 0
+    while True:
+        start = text.find('${', position)
+        if start < 0:
+            break
+        quote = None
+        end = start + 2
+        while end < len(text):
+            char = text[end]
+            if quote:
+                if char == '\\':
+                    end += 1
+                elif char == quote:
+                    quote = None
+            elif char in '\'"':
+                quote = char
+            elif char == '}':
+                break
+            end += 1
+        if end >= len(text):
+            break
+        if start > position:
+            pieces.append(text[position:start])
+        source = text[start + 2:end]
+        pieces.append((text[start:end + 1], compile_expression(source)))
+        position = end + 1
+    if position < len(text):
+        pieces.append(text[position:])
+    return pieces
+
+
+# Render plan nodes.  Each one writes its JSON text for a scope into a
+# list of parts; _Static nodes hold text encoded at compile time.
+
+class _Static:
+    __slots__ = ('text',)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def write(self, scope: _Scope, parts: list) -> None:
+        parts.append(self.text)
+
+
+class _Binding:
+    # A string that is exactly one ${...}: replaced by the raw value.
+    __slots__ = ('literal', 'expression', 'fmt', 'level')
+
+    def __init__(self, literal: str, expression, fmt: JSONFormat, level: int) -> None:
+        self.literal = encode_basestring_ascii(literal)
+        self.expression = expression
+        self.fmt = fmt
+        self.level = level
+
+    def write(self, scope: _Scope, parts: list) -> None:
+        value = self.expression(scope)
+        if value is _UNDEFINED:
+            parts.append(self.literal)
+        else:
+            _write_value(value, self.fmt, parts, self.level)
+
+
+class _Interpolation:
+    __slots__ = ('pieces',)
+
+    def __init__(self, pieces: list) -> None:
+        self.pieces = pieces
+
+    def write(self, scope: _Scope, parts: list) -> None:
+        text = []
+        for piece in self.pieces:
+            if piece.__class__ is str:
+                text.append(piece)
+            else:
+                value = piece[1](scope)
+                text.append(piece[0] if value is _UNDEFINED else _text(value))
+        parts.append(encode_basestring_ascii(''.join(text)))
+
+
+class _Object:
+    __slots__ = ('members', 'data', 'when', 'opening', 'separator', 'closing')
+
+    def __init__(self, members: list, data, when, opening: str, separator: str,
+                 closing: str) -> None:
+        self.members = members
+        self.data = data
+        self.when = when
+        self.opening = opening
+        self.separator = separator
+        self.closing = closing
+
+    def scopes(self, scope: _Scope, repeat: bool) -> list:
+        """The scopes this object renders in: none if excluded, several if repeated."""
+        if self.data is None:
+            scopes = [scope]
+        else:
+            data = self.data(scope)
+            if data is _UNDEFINED:
+                scopes = [scope]
+            elif repeat and isinstance(data, (list, tuple)):
+                scopes = [_Scope(item, scope.root, index) for index, item in enumerate(data)]
+            else:
+                scopes = [_Scope(data, scope.root, scope.index)]
+        if self.when is not None:
+            scopes = [child for child in scopes if self.when(child)]
+        return scopes
+
+    def write(self, scope: _Scope, parts: list) -> None:
+        parts.append(self.opening)
+        start = len(parts)
+        separator = self.separator
+        for prefix, value in self.members:
+            if value.__class__ is _Object and (value.data is not None or
+                                                 value.when is not None):
+                scopes = value.scopes(scope, False)
+                if not scopes:
+                    continue
+                if len(parts) > start:
+                    parts.append(separator)
+                parts.append(prefix)
+                value.write(scopes[0], parts)
+            else:
+                if len(parts) > start:
+                    parts.append(separator)
+                parts.append(prefix)
+                value.write(scope, parts)
+        if len(parts) == start:
+            parts[-1] = '{}'
+        else:
+            parts.append(self.closing)
+
+
+class _Array:
+    __slots__ = ('items', 'opening', 'separator', 'closing')
+
+    def __init__(self, items: list, opening: str, separator: str, closing: str) -> None:
+        self.items = items
+        self.opening = opening
+        self.separator = separator
+        self.closing = closing
+
+    def write(self, scope: _Scope, parts: list) -> None:
+        parts.append(self.opening)
+        start = len(parts)
+        separator = self.separator
+        for item in self.items:
+            if item.__class__ is _Object and (item.data is not None or item.when is not None):
+                for child in item.scopes(scope, True):
+                    if len(parts) > start:
+                        parts.append(separator)
+                    item.write(child, parts)
+            else:
+                if len(parts) > start:
+                    parts.append(separator)
+                item.write(scope, parts)
+        if len(parts) == start:
+            parts[-1] = '[]'
+        else:
+            parts.append(self.closing)
+
+
+def _static(value, fmt: JSONFormat, level: int) -> _Static:
+    parts = []
+    _write_value(value, fmt, parts, level)
+    return _Static(''.join(parts))
+
+
+def _directive(value):
+    # $data / $when values: a binding, or (for $data) literal inline data.
+    if isinstance(value, str):
+        pieces = _split_bindings(value)
+        if len(pieces) == 1 and pieces[0].__class__ is tuple:
+            return pieces[0][1]
+        return lambda scope: value
+    return lambda scope: value
+
+
+def _compile_value(value, fmt: JSONFormat, level: int):
+    if isinstance(value, str):
+        if '${' not in value:
+            return _static(value, fmt, level)
+        pieces = _split_bindings(value)
+        if len(pieces) == 1 and pieces[0].__class__ is tuple:
+            return _Binding(value, pieces[0][1], fmt, level)
+        if not any(piece.__class__ is tuple for piece in pieces):
+            return _static(value, fmt, level)
+        return _Interpolation(pieces)
+
+    if isinstance(value, dict):
+        return _compile_object(value, fmt, level)
+
+    if isinstance(value, list):
+        if not value:
+            return _static(value, fmt, level)
+        items = [_compile_value(item, fmt, level + 1) for item in value]
+        if all(item.__class__ is _Static for item in items):
+            return _static(value, fmt, level)
+        opening, separator, closing = _delimiters('[', ']', fmt, level)
+        return _Array(items, opening, separator, closing)
+
+    return _static(value, fmt, level)
+
+
+def _delimiters(opening: str, closing: str, fmt: JSONFormat, level: int) -> tuple:
+    if fmt.indent is None:
+        return opening, fmt.item_separator, closing
+    newline = fmt.newline(level + 1)
+    return opening + newline, fmt.item_separator + newline, fmt.newline(level) + closing
+
+
+def _compile_object(mapping: dict, fmt: JSONFormat, level: int):
+    data = mapping.get('$data')
+    when = mapping.get('$when')
+    items = [(key, value) for key, value in mapping.items() if key not in ('$data', '$when')]
+    if fmt.sort_keys:
+        items.sort(key=lambda item: item[0])
+
+    opening, separator, closing = _delimiters('{', '}', fmt, level)
+    members = []
+    for key, value in items:
+        prefix = _encode_key(key) + fmt.key_separator
+        members.append((prefix, _compile_value(value, fmt, level + 1)))
+
+    if data is None and when is None and all(member.__class__ is _Static
+                                             for _, member in members):
+        return _static(dict(items), fmt, level)
+
+    # Merge runs of static members, so rendering appends one pre-encoded
+    # string for each of them.
+    merged = []
+    for prefix, member in members:
+        if member.__class__ is _Static and merged and merged[-1][1].__class__ is _Static:
+            previous_prefix, previous = merged[-1]
+            merged[-1] = (previous_prefix,
+                          _Static(previous.text + separator + prefix + member.text))
+        else:
+            merged.append((prefix, member))
+
+    return _Object(merged, None if data is None else _directive(data),
+                   None if when is None else _directive(when), opening, separator, closing)
+
+
+class Template:
+    """
+    An Adaptive Card template compiled into a reusable render plan.
+
+    Create one with compile_template(), then call render() once per data record.
+    """
+    def __init__(self, card, fmt: JSONFormat = COMPACT) -> None:
+        """
+        Args:
+            card: An AdaptiveCard (or any BaseObject or plain dict) containing
+                ``${...}`` bindings, ``$data`` and ``$when``.
+            fmt (JSONFormat, optional): Output format. Defaults to COMPACT.
+
+        Raises:
+            TemplateError: If a binding expression is malformed.
+        """
+        self.fmt = fmt
+        self._source = to_dict(card)
+        self._plan = _compile_value(self._source, fmt, 0)
+
+    def __reduce__(self):
+        # The plan holds closures, so pickle the source and recompile; this
+        # lets templates (and their render methods) be sent to worker processes.
+        return Template, (self._source, self.fmt)
+
+    def render(self, data) -> str:
+        """
+        Render the template for one data record.
+
+        Args:
+            data: The record, usually a dict; available as ``$root``.
+
+        Returns:
+            str: The expanded card as JSON, or an empty string if the card's own
+            ``$when`` is false for this record.
+        """
+        parts = []
+        plan = self._plan
+        scope = _Scope(data, data, 0)
+        if plan.__class__ is _Object:
+            scopes = plan.scopes(scope, False)
+            if not scopes:
+                return ''
+            scope = scopes[0]
+        plan.write(scope, parts)
+        return ''.join(parts)
+
+    def render_bytes(self, data) -> bytes:
+        """
+        Render the template for one data record as UTF-8 JSON.
+
+        Args:
+            data: The record, usually a dict; available as ``$root``.
+
+        Returns:
+            bytes: The expanded card as JSON; empty if the card's own ``$when`` is
+            false.
+        """
+        return self.render(data).encode('ascii')
+
+    def render_many(self, records):
+        """
+        Render the template for each of a sequence of data records.
+
+        Args:
+            records (iterable): The data records.
+
+        Yields:
+            str: The expanded card as JSON, one per record; an empty string for
+            the records the card's own ``$when`` excludes.
+        """
+        render = self.render
+        for record in records:
+            yield render(record)
+
+
+def compile_template(card, fmt: JSONFormat = COMPACT) -> Template:
+    """
+    Compile a card containing ``${...}`` bindings into a Template.
+
+    Args:
+        card: An AdaptiveCard (or any BaseObject or plain dict) to use as template.
+        fmt (JSONFormat, optional): Output format. Defaults to COMPACT.
+
+    Returns:
+        Template: The compiled template.
+    """
+    return Template(card, fmt)
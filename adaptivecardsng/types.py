@@ -39,7 +39,7 @@ class Refresh(BaseObject):
                  *args, **kwargs) -> None:
         super(Refresh, self).__init__(*args, **kwargs)
         if execute:
-            self.execute = execute
+            self.action = execute
 
         if user_ids:
             self.userIds = user_ids
@@ -0,0 +1,544 @@
+from __future__ import annotations
+
+import enum
+
+from .base import BaseObject
+from .compact import CompactNode
+from .lazy import LazySequence
+from .serialization import _ARRAYS
+from .enums import (ActionMode, ActionStyle, AssociatedInputs, BlockElementHeight,
+                    ChoiceInputStyle, Colors, ContainerStyle, FontSize, FontType,
+                    FontWeight, HorizontalAlignment, ImageFillMode, ImageSize,
+                    ImageStyle, Spacing, TextBlockStyle, TextInputStyle,
+                    VerticalAlignment)
+
+# Adaptive Card 1.5 schema validation.
+#
+# Teams only reports a malformed card after the webhook round trip, so
+# validate() checks cards locally before they are sent: unknown types
+# and properties, missing required properties, values of the wrong
+# JSON type, and enum values that don't belong to the property (e.g. a
+# Spacing member used as a "color").
+#
+# The schema is compiled once at import time into _Rules tables, one
+# per object type, mapping each allowed property to a check function.
+# Validating a card is then a single pass over the tree, with one dict
+# lookup and one call per property.  Paths are kept as linked
+# (parent, key) tuples and only formatted into JSON paths such as
+# "$.body[2].items[0].color" when a problem is reported, so valid cards
+# pay nothing for them.
+#
+# Both BaseObject trees (including CompactNodes) and decoded JSON dicts
+# can be validated.  The elements of lazily consumed rows and items
+# (see lazy.py) are not checked.
+
+
+class ValidationIssue:
+    """A single problem found in a card."""
+    __slots__ = ('path', 'message')
+
+    def __init__(self, path: str, message: str) -> None:
+        """
+        Args:
+            path (str): JSON path of the offending value, e.g. "$.body[0].color".
+            message (str): Description of the problem.
+        """
+        self.path = path
+        self.message = message
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ValidationIssue):
+            return NotImplemented
+        return (self.path, self.message) == (other.path, other.message)
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"ValidationIssue({self.path!r}, {self.message!r})"
+
+
+class CardValidationError(ValueError):
+    """Raised by check() for a card that fails validation."""
+
+    def __init__(self, issues: list[ValidationIssue]) -> None:
+        self.issues = issues
+        summary = '; '.join(str(issue) for issue in issues[:3])
+        if len(issues) > 3:
+            summary += f" (and {len(issues) - 3} more)"
+        super().__init__(f"Invalid card: {summary}")
+
+
+def _format_path(path) -> str:
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    text = '$'
+    for key in reversed(keys):
+        if key.__class__ is int:
+            text += f'[{key}]'
+        elif key.isidentifier():
+            text += '.' + key
+        else:
+            text += "['" + key.replace("'", "\\'") + "']"
+    return text
+
+
+def _report(issues: list, path, message: str) -> None:
+    issues.append(ValidationIssue(_format_path(path), message))
+
+
+def _describe(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, (BaseObject, CompactNode, dict)):
+        return 'an object'
+    if isinstance(value, (list, tuple)) or value.__class__ in _ARRAYS:
+        return 'an array'
+    if isinstance(value, enum.Enum):
+        return str(value)
+    return repr(value)
+
+
+def _state(value) -> (dict | None):
+    if value.__class__ is dict:
+        return value
+    if isinstance(value, (BaseObject, CompactNode)):
+        return value.__dict__
+    return None
+
+
+# Value checks.  Each takes (value, path, issues) and appends to issues.
+
+def _any(value, path, issues) -> None:
+    pass
+
+
+def _string(value, path, issues) -> None:
+    if not isinstance(value, str):
+        _report(issues, path, f"expected a string, got {_describe(value)}")
+
+
+def _boolean(value, path, issues) -> None:
+    if value is not True and value is not False:
+        _report(issues, path, f"expected a boolean, got {_describe(value)}")
+
+
+def _integer(value, path, issues) -> None:
+    if value.__class__ is not int and (not isinstance(value, int) or isinstance(value, bool)):
+        _report(issues, path, f"expected an integer, got {_describe(value)}")
+
+
+def _number(value, path, issues) -> None:
+    if value.__class__ is not int and value.__class__ is not float and \
+            (not isinstance(value, (int, float)) or isinstance(value, bool)):
+        _report(issues, path, f"expected a number, got {_describe(value)}")
+
+
+def _object(value, path, issues) -> None:
+    if _state(value) is None:
+        _report(issues, path, f"expected an object, got {_describe(value)}")
+
+
+def _nullable(check):
+    def nullable(value, path, issues) -> None:
+        if value is not None:
+            check(value, path, issues)
+    return nullable
+
+
+def _literal(expected: str):
+    def literal(value, path, issues) -> None:
+        if value != expected:
+            _report(issues, path, f"expected {expected!r}, got {_describe(value)}")
+    return literal
+
+
+def _enum(enum_type):
+    # Members of the right Enum and their wire strings are accepted; members
+    # of any other Enum never compare equal, so they are rejected.
+    allowed = frozenset(enum_type) | frozenset(member.value for member in enum_type)
+    expected = ', '.join(repr(member.value) for member in enum_type)
+
+    def check(value, path, issues) -> None:
+        try:
+            if value in allowed:
+                return
+        except TypeError:
+            pass
+        _report(issues, path, f"{_describe(value)} is not a valid {enum_type.__name__} "
+                              f"value (expected one of {expected})")
+    return check
+
+
+def _pixels(value) -> bool:
+    return value.endswith('px') and value[:-2].isdigit()
+
+
+def _image_height(value, path, issues) -> None:
+    if isinstance(value, str) and _pixels(value):
+        return
+    _HEIGHT(value, path, issues)
+
+
+def _column_width(value, path, issues) -> None:
+    if isinstance(value, str):
+        if value in ('auto', 'stretch') or value.isdigit() or _pixels(value):
+            return
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return
+    _report(issues, path, f"{_describe(value)} is not a valid width (expected 'auto', "
+                          f"'stretch', a number or a pixel size such as '50px')")
+
+
+def _either(first, second):
+    # Tries ``first`` and only falls back to ``second`` if it reported issues.
+    def either(value, path, issues) -> None:
+        attempt = []
+        first(value, path, attempt)
+        if attempt:
+            second(value, path, issues)
+    return either
+
+
+def _array(item_check):
+    def array(value, path, issues) -> None:
+        if value.__class__ is not list and not isinstance(value, (list, tuple)) and \
+                value.__class__ not in _ARRAYS:
+            _report(issues, path, f"expected an array, got {_describe(value)}")
+            return
+        if value.__class__ is LazySequence:
+            # Checking the elements would consume them before serialization.
+            return
+        for position, item in enumerate(value):
+            item_check(item, (path, position), issues)
+    return array
+
+
+# Object checks.
+
+class _Rules:
+    """Compiled checks for one object type."""
+    __slots__ = ('name', 'properties', 'required')
+
+    def __init__(self, name: str, properties: dict, required: tuple) -> None:
+        self.name = name
+        self.properties = properties
+        self.required = required
+
+
+def _check_state(state: dict, rules: _Rules, path, issues: list) -> None:
+    properties = rules.properties
+    for key, value in state.items():
+        check = properties.get(key)
+        if check is None:
+            _report(issues, (path, key), f"unknown property {key!r} for {rules.name}")
+        else:
+            check(value, (path, key), issues)
+    for key in rules.required:
+        if key not in state:
+            _report(issues, path, f"{rules.name} is missing required property {key!r}")
+
+
+def _one_of(table: dict, what: str):
+    # Objects identified by their "type" property, e.g. any element.  The
+    # table may still be empty when this is called; it's read at check time.
+    def one_of(value, path, issues) -> None:
+        state = _state(value)
+        if state is None:
+            _report(issues, path, f"expected {what}, got {_describe(value)}")
+            return
+        kind = state.get('type')
+        if kind is None:
+            _report(issues, path, f"{what} is missing required property 'type'")
+            return
+        rules = table.get(kind) if isinstance(kind, str) else None
+        if rules is None:
+            if kind in _TYPED:
+                _report(issues, (path, 'type'), f"{kind} is not allowed here "
+                                                f"(expected {what})")
+            else:
+                _report(issues, (path, 'type'), f"unknown {what} type {_describe(kind)}")
+            return
+        _check_state(state, rules, path, issues)
+    return one_of
+
+
+def _shaped(rules: _Rules):
+    # Objects whose type is fixed by where they appear, e.g. a Fact.
+    def shaped(value, path, issues) -> None:
+        state = _state(value)
+        if state is None:
+            _report(issues, path, f"expected a {rules.name}, got {_describe(value)}")
+            return
+        _check_state(state, rules, path, issues)
+    return shaped
+
+
+def _rules(name: str, *groups: dict, required: tuple = (), **properties) -> _Rules:
+    merged = {}
+    for group in groups:
+        merged.update(group)
+    merged.update(properties)
+    return _Rules(name, merged, required)
+
+
+def _drop_or(check):
+    def fallback(value, path, issues) -> None:
+        if value != 'drop':
+            check(value, path, issues)
+    return fallback
+
+
+_HEIGHT = _enum(BlockElementHeight)
+
+# Dispatch tables, filled in below once all the rules exist.
+_ELEMENTS = {}
+_ACTIONS = {}
+_SELECT_ACTIONS = {}
+_EXECUTE_ACTIONS = {}
+_TYPED = {}
+
+_ELEMENT = _one_of(_ELEMENTS, 'an element')
+_ACTION = _one_of(_ACTIONS, 'an action')
+_SELECT_ACTION = _one_of(_SELECT_ACTIONS, 'a select action')
+_EXECUTE = _one_of(_EXECUTE_ACTIONS, 'an Action.Execute')
+
+_REQUIRES = _object
+
+_ELEMENT_COMMON = {
+    'type': _any,
+    'id': _string,
+    'isVisible': _boolean,
+    'separator': _boolean,
+    'spacing': _enum(Spacing),
+    'height': _HEIGHT,
+    'fallback': _drop_or(_ELEMENT),
+    'requires': _REQUIRES,
+}
+
+_INPUT_COMMON = {
+    **_ELEMENT_COMMON,
+    'errorMessage': _string,
+    'isRequired': _boolean,
+    'label': _string,
+}
+
+_ACTION_COMMON = {
+    'type': _any,
+    'title': _string,
+    'iconUrl': _string,
+    'id': _string,
+    'style': _enum(ActionStyle),
+    'fallback': _drop_or(_ACTION),
+    'tooltip': _string,
+    'isEnabled': _boolean,
+    'mode': _enum(ActionMode),
+    'requires': _REQUIRES,
+}
+
+_CONTAINER_STYLE = _enum(ContainerStyle)
+_HORIZONTAL_ALIGNMENT = _enum(HorizontalAlignment)
+_VERTICAL_ALIGNMENT = _enum(VerticalAlignment)
+_FONT_SIZE = _enum(FontSize)
+
+_BACKGROUND_IMAGE = _either(_string, _shaped(_rules(
+    'BackgroundImage', required=('url',),
+    url=_string, fillMode=_enum(ImageFillMode),
+    horizontalAlignment=_HORIZONTAL_ALIGNMENT, verticalAlignment=_VERTICAL_ALIGNMENT)))
+
+_CONTAINER_COMMON = {
+    'items': _array(_ELEMENT),
+    'selectAction': _SELECT_ACTION,
+    'style': _CONTAINER_STYLE,
+    'verticalContentAlignment': _VERTICAL_ALIGNMENT,
+    'bleed': _boolean,
+    'backgroundImage': _BACKGROUND_IMAGE,
+    'minHeight': _string,
+    'rtl': _boolean,
+}
+
+_CELL_ALIGNMENT = {
+    'horizontalCellContentAlignment': _HORIZONTAL_ALIGNMENT,
+    'verticalCellContentAlignment': _VERTICAL_ALIGNMENT,
+}
+
+_TEXT_RUN = _shaped(_rules(
+    'TextRun', required=('text',),
+    type=_literal('TextRun'), text=_string, color=_enum(Colors), fontType=_enum(FontType),
+    highlight=_boolean, isSubtle=_boolean, italic=_boolean, selectAction=_SELECT_ACTION,
+    size=_FONT_SIZE, strikethrough=_boolean, underline=_boolean, weight=_enum(FontWeight)))
+
+_IMAGE = _rules(
+    'Image', _ELEMENT_COMMON, required=('url',),
+    url=_string, altText=_string, backgroundColor=_string, height=_image_height,
+    horizontalAlignment=_HORIZONTAL_ALIGNMENT, selectAction=_SELECT_ACTION,
+    size=_enum(ImageSize), style=_enum(ImageStyle), width=_string)
+
+_COLUMN = _rules(
+    'Column', required=('type',),
+    type=_literal('Column'), items=_array(_ELEMENT), backgroundImage=_BACKGROUND_IMAGE,
+    bleed=_boolean, minHeight=_string, rtl=_boolean, separator=_boolean,
+    spacing=_ELEMENT_COMMON['spacing'], selectAction=_SELECT_ACTION,
+    style=_CONTAINER_STYLE, verticalContentAlignment=_VERTICAL_ALIGNMENT,
+    width=_column_width, id=_string, isVisible=_boolean, requires=_REQUIRES)
+_COLUMN.properties['fallback'] = _drop_or(_shaped(_COLUMN))
+
+_TABLE_CELL = _rules(
+    'TableCell', _ELEMENT_COMMON, _CONTAINER_COMMON, required=('items',),
+    type=_literal('TableCell'))
+
+_TABLE_ROW = _rules(
+    'TableRow', _CELL_ALIGNMENT,
+    type=_literal('TableRow'), cells=_array(_shaped(_TABLE_CELL)), style=_CONTAINER_STYLE)
+
+_TABLE_COLUMN = _rules(
+    'TableColumnDefinition', _CELL_ALIGNMENT,
+    type=_literal('TableColumnDefinition'), width=_column_width)
+
+_INLINE = _either(_string, _TEXT_RUN)
+
+_TARGET_ELEMENT = _either(_string, _shaped(_rules(
+    'TargetElement', required=('elementId',), elementId=_string, isVisible=_boolean)))
+
+_ELEMENT_RULES = (
+    _rules('TextBlock', _ELEMENT_COMMON, required=('text',),
+           text=_string, color=_enum(Colors), fontType=_enum(FontType),
+           horizontalAlignment=_HORIZONTAL_ALIGNMENT, isSubtle=_boolean, maxLines=_integer,
+           size=_FONT_SIZE, weight=_enum(FontWeight), wrap=_boolean,
+           style=_enum(TextBlockStyle)),
+    _IMAGE,
+    _rules('Media', _ELEMENT_COMMON, required=('sources',),
+           sources=_array(_shaped(_rules('MediaSource', required=('url',),
+                                         url=_string, mimeType=_string))),
+           poster=_string, altText=_string),
+    _rules('RichTextBlock', _ELEMENT_COMMON, required=('inlines',),
+           inlines=_array(_INLINE), horizontalAlignment=_HORIZONTAL_ALIGNMENT),
+    # Containers
+    _rules('ActionSet', _ELEMENT_COMMON, required=('actions',), actions=_array(_ACTION)),
+    _rules('Container', _ELEMENT_COMMON, _CONTAINER_COMMON, required=('items',)),
+    _rules('ColumnSet', _ELEMENT_COMMON,
+           columns=_array(_shaped(_COLUMN)), selectAction=_SELECT_ACTION,
+           style=_CONTAINER_STYLE, bleed=_boolean, minHeight=_string,
+           horizontalAlignment=_HORIZONTAL_ALIGNMENT),
+    _rules('FactSet', _ELEMENT_COMMON, required=('facts',),
+           facts=_array(_shaped(_rules('Fact', required=('title', 'value'),
+                                       title=_string, value=_string)))),
+    _rules('ImageSet', _ELEMENT_COMMON, required=('images',),
+           images=_array(_one_of({'Image': _IMAGE}, 'an Image')),
+           imageSize=_enum(ImageSize)),
+    _rules('Table', _ELEMENT_COMMON, _CELL_ALIGNMENT,
+           columns=_array(_shaped(_TABLE_COLUMN)), rows=_array(_shaped(_TABLE_ROW)),
+           firstRowAsHeader=_boolean, showGridLines=_boolean, gridStyle=_CONTAINER_STYLE),
+    # Inputs
+    _rules('Input.Text', _INPUT_COMMON, required=('id',),
+           isMultiline=_boolean, maxLength=_integer, placeholder=_string, regex=_string,
+           style=_enum(TextInputStyle), inlineAction=_SELECT_ACTION, value=_string),
+    _rules('Input.Number', _INPUT_COMMON, required=('id',),
+           max=_number, min=_number, placeholder=_string, value=_number),
+    _rules('Input.Date', _INPUT_COMMON, required=('id',),
+           max=_string, min=_string, placeholder=_string, value=_string),
+    _rules('Input.Time', _INPUT_COMMON, required=('id',),
+           max=_string, min=_string, placeholder=_string, value=_string),
+    _rules('Input.Toggle', _INPUT_COMMON, required=('id', 'title'),
+           title=_string, value=_string, valueOff=_string, valueOn=_string, wrap=_boolean),
+    _rules('Input.ChoiceSet', _INPUT_COMMON, required=('id',),
+           choices=_array(_shaped(_rules('Choice', required=('title', 'value'),
+                                         title=_string, value=_string))),
+           isMultiSelect=_boolean, style=_enum(ChoiceInputStyle), value=_string,
+           placeholder=_string, wrap=_boolean),
+)
+
+_ASSOCIATED_INPUTS = _enum(AssociatedInputs)
+
+_ACTION_RULES = (
+    _rules('Action.OpenUrl', _ACTION_COMMON, required=('url',), url=_string),
+    _rules('Action.Submit', _ACTION_COMMON, data=_any, associatedInputs=_ASSOCIATED_INPUTS),
+    _rules('Action.ToggleVisibility', _ACTION_COMMON, required=('targetElements',),
+           targetElements=_array(_TARGET_ELEMENT)),
+    _rules('Action.Execute', _ACTION_COMMON,
+           verb=_string, data=_any, associatedInputs=_ASSOCIATED_INPUTS),
+)
+
+_CARD = _rules(
+    'AdaptiveCard', required=('type', 'version'),
+    type=_any, version=_string, body=_array(_ELEMENT), actions=_array(_ACTION),
+    selectAction=_SELECT_ACTION, fallbackText=_string, backgroundImage=_BACKGROUND_IMAGE,
+    minHeight=_string, rtl=_boolean, speak=_string, lang=_string,
+    verticalContentAlignment=_VERTICAL_ALIGNMENT, metadata=_object, msteams=_object,
+    refresh=_shaped(_rules('Refresh', action=_EXECUTE, userIds=_array(_string))),
+    authentication=_shaped(_rules(
+        'Authentication',
+        text=_string, connectionName=_string,
+        tokenExchangeResource=_shaped(_rules(
+            'TokenExchangeResource', required=('id', 'uri', 'providerId'),
+            id=_string, uri=_string, providerId=_string)),
+        buttons=_array(_shaped(_rules(
+            'AuthCardButton', required=('type', 'value'),
+            type=_string, value=_string, title=_string, image=_string))))))
+_CARD.properties['$schema'] = _string
+
+_SHOW_CARD = _rules('Action.ShowCard', _ACTION_COMMON,
+                    card=_one_of({'AdaptiveCard': _CARD}, 'an AdaptiveCard'))
+
+_MESSAGE = _rules(
+    'message', required=('type', 'attachments'),
+    type=_any, attachments=_array(_shaped(_rules(
+        'attachment', required=('contentType', 'content'),
+        contentType=_string, contentUrl=_nullable(_string),
+        content=_one_of({'AdaptiveCard': _CARD}, 'an AdaptiveCard')))))
+
+_ELEMENTS.update((rules.name, rules) for rules in _ELEMENT_RULES)
+_ACTIONS.update((rules.name, rules) for rules in _ACTION_RULES + (_SHOW_CARD,))
+_SELECT_ACTIONS.update((rules.name, rules) for rules in _ACTION_RULES)
+_EXECUTE_ACTIONS['Action.Execute'] = _ACTIONS['Action.Execute']
+_TYPED.update(_ELEMENTS)
+_TYPED.update(_ACTIONS)
+_TYPED.update((rules.name, rules) for rules in (_CARD, _MESSAGE, _COLUMN, _TABLE_ROW,
+                                                _TABLE_CELL))
+
+_ROOT = _one_of(_TYPED, 'a card object')
+
+
+def validate(obj) -> list[ValidationIssue]:
+    """
+    Check a card against the Adaptive Card 1.5 schema.
+
+    Args:
+        obj: An AdaptiveCard or TeamsAdaptiveMessage, any other typed object
+            (e.g. an element), or the equivalent decoded JSON.
+
+    Returns:
+        list: A ValidationIssue for each problem found; empty if the card is valid.
+    """
+    issues = []
+    _ROOT(obj, None, issues)
+    return issues
+
+
+def is_valid(obj) -> bool:
+    """
+    Args:
+        obj: See validate().
+
+    Returns:
+        bool: Whether validate() finds no problems.
+    """
+    return not validate(obj)
+
+
+def check(obj) -> None:
+    """
+    Validate a card, raising an exception if it has any problems.
+
+    Args:
+        obj: See validate().
+
+    Raises:
+        CardValidationError: If the card is invalid; its ``issues`` attribute
+            holds the full list of problems.
+    """
+    issues = validate(obj)
+    if issues:
+        raise CardValidationError(issues)
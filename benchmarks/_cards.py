@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from adaptivecardsng.actions import OpenUrl, Submit
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Column, ColumnSet, Container, Fact, FactSet
+from adaptivecardsng.containers import Table, TableCell, TableRow
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import Colors, ContainerStyle, FontSize, FontWeight, Spacing
+
+# Card generators shared by the benchmark scripts in this directory.
+#
+# The cards are shaped like the alert and digest cards we see in
+# practice: a heading, a few column pairs, a FactSet and some actions,
+# with the number of repeated sections controlled by ``size``.
+
+SIZES = {
+    'small': 1,
+    'medium': 20,
+    'huge': 500,
+}
+
+
+def make_alert_card(index: int = 0) -> AdaptiveCard:
+    """Build a small single-alert card."""
+    return AdaptiveCard(body=[
+        TextBlock(text=f'Alert #{index}: disk usage above threshold',
+                  font_weight=FontWeight.bolder, font_size=FontSize.medium,
+                  color=Colors.attention, wrap=True),
+        TextBlock(text=f'host-{index % 50:03d}.example.com', subtle=True,
+                  spacing=Spacing.none),
+    ], actions=[OpenUrl(url=f'https://monitoring.example.com/alerts/{index}',
+                        title='Open')])
+
+
+def make_card(size: (int | str) = 'medium') -> AdaptiveCard:
+    """
+    Build a composite card with ``size`` repeated sections.
+
+    Args:
+        size (int/str): Number of sections, or one of the names in SIZES.
+    """
+    if isinstance(size, str):
+        size = SIZES[size]
+
+    body = [TextBlock(text='Nightly digest', font_weight=FontWeight.bolder,
+                      font_size=FontSize.large, wrap=True)]
+    for i in range(size):
+        body.append(Container(items=[
+            TextBlock(text=f'Section {i}', font_weight=FontWeight.bolder),
+            ColumnSet(columns=[
+                Column(width='auto', items=[TextBlock(text='Owner'),
+                                            TextBlock(text='Status')]),
+                Column(width='stretch', items=[TextBlock(text=f'team-{i % 7}', wrap=True),
+                                               TextBlock(text='ok', color=Colors.good)]),
+            ]),
+            FactSet(facts=[Fact(title=f'metric.{j}', value=str(i * j)) for j in range(4)]),
+        ], style=ContainerStyle.emphasis, spacing=Spacing.medium))
+
+    return AdaptiveCard(body=body, actions=[
+        Submit(data={'action': 'ack', 'ids': list(range(size))}, title='Acknowledge'),
+        OpenUrl(url='https://monitoring.example.com/digest', title='Details'),
+    ])
+
+
+def make_table_card(rows: int = 2000, columns: int = 4) -> AdaptiveCard:
+    """Build a report card holding a single Table with ``rows`` x ``columns`` cells."""
+    header = TableRow(cells=[TableCell(items=[TextBlock(text=f'Column {c}',
+                                                        font_weight=FontWeight.bolder)])
+                             for c in range(columns)])
+    body = [TableRow(cells=[TableCell(items=[TextBlock(text=f'r{r}c{c}', wrap=True)])
+                            for c in range(columns)])
+            for r in range(rows)]
+    return AdaptiveCard(body=[
+        Table(columns=[{'width': 1} for _ in range(columns)], rows=[header] + body,
+              first_row_as_header=True),
+    ])
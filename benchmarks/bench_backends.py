@@ -0,0 +1,35 @@
+import timeit
+
+from adaptivecardsng.backends import available_backends
+
+from _cards import SIZES, make_card
+
+# Throughput of each installed JSON backend for the compact wire format.
+# Every backend must produce the same bytes as the builtin encoder; the
+# full parity checks are in tests/test_backends.py.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_backends.py
+
+
+def main():
+    backends = available_backends()
+    print(f"{'size':<8}{'backend':<10}{'cards/s':>12}{'MB/s':>10}")
+    for name in SIZES:
+        card = make_card(name)
+        expected = card.as_bytes(backend='builtin')
+        for backend in backends:
+            payload = card.as_bytes(backend=backend)
+            assert payload == expected, backend
+            assert card.as_json(backend=backend) == card.as_json(backend='builtin'), backend
+
+            timer = timeit.Timer(lambda: card.as_bytes(backend=backend))
+            number, _ = timer.autorange()
+            elapsed = min(timer.repeat(5, number)) / number
+            print(f"{name:<8}{backend:<10}{1 / elapsed:>12.0f}"
+                  f"{len(payload) / elapsed / 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import os
+import time
+
+from adaptivecardsng.batch import render_many
+
+from _cards import make_card
+
+# Scaling of render_many() with the number of worker processes.  Cards
+# are built from small records inside the workers by a module-level
+# factory, which is the configuration that scales with core count.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=.:benchmarks python benchmarks/bench_batch.py
+
+
+def build(size: int):
+    return make_card(size)
+
+
+def main():
+    records = [10] * 2000
+    expected = [build(size).as_bytes() for size in records[:50]]
+
+    start = time.perf_counter()
+    for _ in render_many(records, build, executor=None):
+        pass
+    baseline = time.perf_counter() - start
+    print(f"{'workers':<9}{'cards/s':>10}{'speedup':>10}")
+    print(f"{'serial':<9}{len(records) / baseline:>10.0f}{1:>9.2f}x")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        results = list(render_many(records, build, executor='process',
+                                   max_workers=workers, chunk_size=100))
+        elapsed = time.perf_counter() - start
+        assert results[:50] == expected
+        print(f"{workers:<9}{len(records) / elapsed:>10.0f}{baseline / elapsed:>9.2f}x")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
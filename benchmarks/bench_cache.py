@@ -0,0 +1,49 @@
+import timeit
+
+from adaptivecardsng.cache import SerializationCache
+
+from _cards import SIZES, make_card
+
+# Dashboard-style re-serialization: the same card is encoded repeatedly
+# with a single TextBlock changed between renders.  Compares plain
+# as_bytes() with the SerializationCache backend and reports its hit rate.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_cache.py
+
+
+def main():
+    print(f"{'size':<8}{'uncached (ms)':>15}{'cached (ms)':>13}{'speedup':>10}{'hit rate':>10}")
+    for name in SIZES:
+        card = make_card(name)
+        status = card.body[-1]['items'][0]
+        counter = iter(range(10 ** 9))
+
+        def update():
+            status.text = f'Section updated {next(counter)}'
+
+        def uncached():
+            update()
+            return card.as_bytes()
+
+        with SerializationCache() as cache:
+            def cached():
+                update()
+                return card.as_bytes(backend=cache)
+
+            assert cached() == card.as_bytes()
+
+            timer = timeit.Timer(uncached)
+            number, _ = timer.autorange()
+            plain = min(timer.repeat(5, number)) / number
+            fast = min(timeit.Timer(cached).repeat(5, number)) / number
+
+            stats = cache.stats()
+            hit_rate = stats['hits'] / (stats['hits'] + stats['misses'])
+            print(f"{name:<8}{plain * 1e3:>15.3f}{fast * 1e3:>13.3f}"
+                  f"{plain / fast:>9.1f}x{hit_rate:>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+from adaptivecardsng import actions, containers, elements, inputs, types
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.enums import (ActionStyle, Colors, ContainerStyle, FontSize, FontWeight,
+                                   HorizontalAlignment, ImageFillMode, ImageSize, Spacing,
+                                   TextInputStyle)
+
+from _cards import SIZES, make_card
+
+# Constructor and as_json() cost of every card class, and of composite
+# cards of each size in _cards.SIZES, compared against a saved baseline.
+#
+# Each class is constructed from a fixed, typical set of arguments whose
+# child objects are built beforehand, so the constructor alone is timed.
+# Times are the best of several timeit runs.  Anything slower than the
+# baseline by more than --threshold is flagged, and the script then
+# exits with status 1.  Baselines are only comparable on the machine and
+# Python version they were recorded with; record one before starting
+# performance work:
+#
+#     PYTHONPATH=. python benchmarks/bench_classes.py --save
+#     ... change things ...
+#     PYTHONPATH=. python benchmarks/bench_classes.py
+#
+# -k restricts the run to the cases whose name contains the given text.
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+_TEXT = elements.TextBlock(text='Disk usage above threshold')
+_IMAGE = elements.Image(url='https://example.com/chart.png', alt_text='Chart')
+_SUBMIT = actions.Submit(data={'action': 'ack'}, title='Acknowledge')
+_OPEN = actions.OpenUrl(url='https://example.com/alerts/1', title='Open')
+_CELL = containers.TableCell(items=[_TEXT])
+_ROW = containers.TableRow(cells=[_CELL, _CELL, _CELL])
+_FACT = containers.Fact(title='host', value='db-01')
+_CHOICE = inputs.Choice(title='High', value='high')
+_TARGET = actions.TargetElement(element_id='details', visible=True)
+_TOKEN = types.TokenExchangeResource(id='resource', uri='api://example.com',
+                                     provider_id='provider')
+_BUTTON = types.AuthCardButton(type='signin', value='https://login.example.com', title='Sign in')
+
+# Class -> keyword arguments to construct it with.
+SAMPLES = {
+    elements.TextBlock: dict(text='Disk usage above threshold', color=Colors.attention,
+                             font_size=FontSize.medium, font_weight=FontWeight.bolder,
+                             wrap=True, spacing=Spacing.small),
+    elements.Image: dict(url='https://example.com/chart.png', alt_text='Chart',
+                         size=ImageSize.medium, select_action=_OPEN),
+    elements.MediaSource: dict(url='https://example.com/clip.mp4', mime_type='video/mp4'),
+    elements.Media: dict(sources=[elements.MediaSource(url='https://example.com/clip.mp4',
+                                                       mime_type='video/mp4')],
+                         poster='https://example.com/poster.png'),
+    elements.TextRun: dict(text='critical', color=Colors.attention, italic=True),
+    elements.RichTextBlock: dict(inlines=[elements.TextRun(text='Status: '),
+                                          elements.TextRun(text='critical', italic=True)],
+                                 horizontal_alignment=HorizontalAlignment.left),
+    containers.ActionSet: dict(actions=[_SUBMIT, _OPEN]),
+    containers.Container: dict(items=[_TEXT, _IMAGE], style=ContainerStyle.emphasis,
+                               select_action=_OPEN, spacing=Spacing.medium),
+    containers.Column: dict(items=[_TEXT], width='stretch'),
+    containers.ColumnSet: dict(columns=[containers.Column(items=[_TEXT]),
+                                        containers.Column(items=[_TEXT])]),
+    containers.Fact: dict(title='host', value='db-01'),
+    containers.FactSet: dict(facts=[_FACT, _FACT, _FACT]),
+    containers.ImageSet: dict(images=[_IMAGE, _IMAGE], image_size=ImageSize.small),
+    containers.TableCell: dict(items=[_TEXT]),
+    containers.TableRow: dict(cells=[_CELL, _CELL, _CELL]),
+    containers.Table: dict(columns=[{'width': 1}] * 3, rows=[_ROW] * 10,
+                           first_row_as_header=True),
+    inputs.Text: dict(id='comment', placeholder='Add a comment', multiline=True,
+                      style=TextInputStyle.text, label='Comment'),
+    inputs.Number: dict(id='count', min=0, max=10, value=1, label='Count'),
+    inputs.Date: dict(id='due', value='2022-01-01', label='Due'),
+    inputs.Time: dict(id='at', value='09:00', label='At'),
+    inputs.Toggle: dict(title='Notify me', id='notify', value='true'),
+    inputs.Choice: dict(title='High', value='high'),
+    inputs.ChoiceSet: dict(id='severity', choices=[_CHOICE] * 5, label='Severity'),
+    actions.OpenUrl: dict(url='https://example.com/alerts/1', title='Open',
+                          style=ActionStyle.positive),
+    actions.Submit: dict(data={'action': 'ack', 'id': 1}, title='Acknowledge'),
+    actions.ShowCard: dict(card=AdaptiveCard(body=[_TEXT]), title='Details'),
+    actions.TargetElement: dict(element_id='details', visible=True),
+    actions.ToggleVisibility: dict(target_elements=[_TARGET], title='More'),
+    actions.Execute: dict(verb='refresh', data={'id': 1}, title='Refresh'),
+    types.BackgroundImage: dict(url='https://example.com/bg.png', fill_mode=ImageFillMode.cover),
+    types.Refresh: dict(execute=actions.Execute(verb='refresh'), user_ids=['user-1']),
+    types.TokenExchangeResource: dict(id='resource', uri='api://example.com',
+                                      provider_id='provider'),
+    types.AuthCardButton: dict(type='signin', value='https://login.example.com',
+                               title='Sign in'),
+    types.Authentication: dict(text='Please sign in', connection_name='oauth',
+                               token_exchange_resource=_TOKEN, buttons=[_BUTTON]),
+}
+
+
+def _best(function, repeat: int) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def cases() -> dict:
+    """Case name -> function to time."""
+    result = {}
+    for cls, arguments in SAMPLES.items():
+        name = f'{cls.__module__.rsplit(".", 1)[-1]}.{cls.__name__}'
+        instance = cls(**arguments)
+        result[f'construct {name}'] = lambda cls=cls, arguments=arguments: cls(**arguments)
+        result[f'as_json {name}'] = instance.as_json
+    for size in SIZES:
+        card = make_card(size)
+        result[f'construct card {size}'] = lambda size=size: make_card(size)
+        result[f'as_json card {size}'] = card.as_json
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--save', action='store_true', help="record the results as the baseline")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline file")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="slowdown flagged as a regression (0.15 = 15%%)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('-k', dest='pattern', default='', help="only run matching cases")
+    options = parser.parse_args()
+
+    baseline = {}
+    if not options.save and os.path.exists(options.baseline):
+        with open(options.baseline) as fp:
+            recorded = json.load(fp)
+        if recorded['python'] != platform.python_version():
+            print(f"Note: baseline recorded with Python {recorded['python']}.")
+        baseline = recorded['results']
+
+    results = {}
+    regressions = []
+    print(f"{'case':<42}{'time (us)':>11}{'baseline':>11}{'change':>9}")
+    for name, function in cases().items():
+        if options.pattern not in name:
+            continue
+        elapsed = results[name] = _best(function, options.repeat)
+        line = f"{name:<42}{elapsed * 1e6:>11.2f}"
+        previous = baseline.get(name)
+        if previous:
+            change = elapsed / previous - 1
+            line += f"{previous * 1e6:>11.2f}{change:>+9.0%}"
+            if change > options.threshold:
+                line += '  REGRESSION'
+                regressions.append(name)
+        print(line)
+
+    if options.save:
+        with open(options.baseline, 'w') as fp:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, fp, indent=2, sort_keys=True)
+            fp.write('\n')
+        print(f"Saved {len(results)} results to {options.baseline}")
+    elif regressions:
+        sys.exit(f"{len(regressions)} regression(s) over {options.threshold:.0%}: "
+                 f"{', '.join(regressions)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import random
+import time
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.messages import Coalescer, TeamsAdaptiveMessage
+
+# Requests and bytes sent during a simulated incident, with and without
+# coalescing.  Three channels get a few hundred near-identical alerts
+# each over ten minutes, drawn from a handful of distinct texts; the
+# Coalescer holds each channel's alerts for a minute, or until 100 are
+# waiting.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_coalescing.py
+
+CHANNELS = 3
+ALERTS = 1500
+DURATION = 600.0
+TEXTS = [f'{check} failing on host-{host:02d}'
+         for check in ('Disk usage', 'Health probe', 'Replication lag') for host in range(4)]
+
+
+def alert(text: str) -> TeamsAdaptiveMessage:
+    return TeamsAdaptiveMessage(AdaptiveCard(body=[TextBlock(text=text, wrap=True)]))
+
+
+def main():
+    rng = random.Random(0)
+    urls = [f'https://example.com/webhook/{channel}' for channel in range(CHANNELS)]
+    incident = sorted((rng.uniform(0, DURATION), rng.choice(urls), rng.choice(TEXTS))
+                      for _ in range(ALERTS))
+    messages = [(when, url, alert(text)) for when, url, text in incident]
+
+    coalescer = Coalescer(window=60.0, max_messages=100)
+    sent = []
+    start = time.perf_counter()
+    for when, url, message in messages:
+        sent.extend(coalescer.add(url, message, now=when))
+        sent.extend(coalescer.due(now=when))
+    sent.extend(coalescer.flush())
+    elapsed = time.perf_counter() - start
+
+    raw_bytes = sum(len(message.as_bytes()) for _, _, message in messages)
+    sent_bytes = sum(len(message.as_bytes()) for _, message in sent)
+    print(f"{'':<12}{'requests':>10}{'KiB':>10}")
+    print(f"{'raw':<12}{len(messages):>10}{raw_bytes / 1024:>10.0f}")
+    print(f"{'coalesced':<12}{len(sent):>10}{sent_bytes / 1024:>10.0f}")
+    print(f"reduction: {len(messages) / len(sent):.0f}x fewer requests; "
+          f"coalescing cost {elapsed / len(messages) * 1e6:.0f} us per alert")
+
+
+if __name__ == '__main__':
+    main()
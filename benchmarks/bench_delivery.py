@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+from adaptivecardsng.messages import AsyncWebhookSender, TeamsAdaptiveMessage
+from adaptivecardsng.messages.testing import StandInWebhook
+
+from _cards import make_alert_card
+
+# Throughput of AsyncWebhookSender against a local stand-in webhook that
+# takes a few milliseconds to answer, as a remote service would, compared
+# with opening a new connection for every message and sending them one
+# at a time.  The stand-in runs on a thread and event loop of its own.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=.:benchmarks python benchmarks/bench_delivery.py
+
+MESSAGES = 500
+LATENCY = 0.002
+
+
+async def one_at_a_time(url: str, payloads: list) -> None:
+    # A new connection, and a single request on it, per message.
+    host, port = url.split('/')[2].split(':')
+    for payload in payloads:
+        reader, writer = await asyncio.open_connection(host, int(port))
+        writer.write(b'POST /webhook HTTP/1.1\r\nHost: %s\r\nConnection: close\r\n'
+                     b'Content-Length: %d\r\n\r\n%s' % (host.encode(), len(payload), payload))
+        await reader.read()
+        writer.close()
+
+
+async def pooled(url: str, payloads: list, max_per_host: int) -> None:
+    async with AsyncWebhookSender(max_per_host=max_per_host) as sender:
+        results = await sender.send_many((url, payload) for payload in payloads)
+    assert all(result.ok for result in results)
+
+
+def main():
+    payloads = [TeamsAdaptiveMessage(make_alert_card(index)).as_bytes()
+                for index in range(MESSAGES)]
+    print(f"{MESSAGES} messages, {LATENCY * 1000:.0f} ms per response")
+    print(f"{'sender':<22}{'msgs/s':>10}{'connections':>13}")
+    with StandInWebhook(delay=LATENCY) as webhook:
+        runs = [('one at a time', one_at_a_time(webhook.url, payloads))]
+        for limit in (1, 4, 16, 64):
+            runs.append((f'pooled, {limit} per host', pooled(webhook.url, payloads, limit)))
+        for name, run in runs:
+            connections = webhook.connections
+            start = time.perf_counter()
+            asyncio.run(run)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22}{MESSAGES / elapsed:>10.0f}"
+                  f"{webhook.connections - connections:>13}")
+
+
+if __name__ == '__main__':
+    main()
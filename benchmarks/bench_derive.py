@@ -0,0 +1,78 @@
+import copy
+import gc
+import time
+import tracemalloc
+
+from adaptivecardsng.actions import Submit
+from adaptivecardsng.elements import TextBlock
+
+from _cards import SIZES, make_card
+
+# Per-recipient variants of a base card that differ in a greeting
+# TextBlock and a Submit.data payload: copy.deepcopy() of the whole card
+# and setting the two members, against card.derive(), which copies only
+# the objects on the paths to the changes.  Time is per variant; memory
+# is what holding all the variants adds to the base card.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=.:benchmarks python benchmarks/bench_derive.py
+
+VARIANTS = 200
+
+
+def make_base(size) -> object:
+    card = make_card(size)
+    card.body.insert(0, TextBlock(text='Hello', wrap=True))
+    card.actions.append(Submit(title='Acknowledge', data={'user': None}))
+    return card
+
+
+def with_deepcopy(card, users: list) -> list:
+    variants = []
+    for user in users:
+        variant = copy.deepcopy(card)
+        variant.body[0].text = f'Hello, {user}'
+        variant.actions[-1].data = {'user': user}
+        variants.append(variant)
+    return variants
+
+
+def with_derive(card, users: list) -> list:
+    last = len(card.actions) - 1
+    return [card.derive({'/body/0/text': f'Hello, {user}',
+                         f'/actions/{last}/data': {'user': user}})
+            for user in users]
+
+
+def measure(make, card, users: list) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    variants = make(card, users)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return variants, elapsed, size
+
+
+def main():
+    users = [f'user{index}' for index in range(VARIANTS)]
+    print(f"{VARIANTS} variants per card")
+    print(f"{'card':<8}{'method':<10}{'us/variant':>12}{'KiB total':>12}{'speedup':>10}"
+          f"{'memory':>9}")
+    for size in SIZES:
+        card = make_base(size)
+        copies, copy_time, copy_memory = measure(with_deepcopy, card, users)
+        derived, derive_time, derive_memory = measure(with_derive, card, users)
+        assert [variant.as_bytes() for variant in derived] == \
+            [variant.as_bytes() for variant in copies]
+        print(f"{size:<8}{'deepcopy':<10}{copy_time / VARIANTS * 1e6:>12.1f}"
+              f"{copy_memory / 1024:>12.0f}")
+        print(f"{'':<8}{'derive':<10}{derive_time / VARIANTS * 1e6:>12.1f}"
+              f"{derive_memory / 1024:>12.0f}{copy_time / derive_time:>9.0f}x"
+              f"{copy_memory / derive_memory:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
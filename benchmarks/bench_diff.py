@@ -0,0 +1,94 @@
+import copy
+import json
+import timeit
+
+from adaptivecardsng.diff import apply_patch, diff
+from adaptivecardsng.elements import TextBlock
+
+from _cards import make_card, make_table_card
+
+# diff() on large cards, against the cheapest way of telling whether a
+# card changed at all (comparing both encodings), for an identical
+# copy, a single changed TextBlock, reordered body elements carrying
+# ids, and an appended element.  "first" diffs trees that haven't been
+# fingerprinted yet; "repeat" reuses the fingerprints remembered by the
+# first call, as when a card is diffed against its previous version.
+# Also shows the size of each patch next to the size of the card, and
+# the cost of applying it.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_diff.py
+
+
+def _best(function) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number
+
+
+def _with_ids(card):
+    for index, element in enumerate(card.body):
+        element.id = f'section-{index}'
+    return card
+
+
+def _change_leaf(card):
+    changed = copy.deepcopy(card)
+    element = changed.body[-1]
+    while 'items' in element or 'rows' in element or 'cells' in element:
+        element = element['items' if 'items' in element else
+                          'rows' if 'rows' in element else 'cells'][-1]
+    element.text = 'changed'
+    return changed
+
+
+def _reorder(card):
+    changed = copy.deepcopy(card)
+    body = changed.body
+    changed.body = body[:1] + body[-5:] + body[1:-5]
+    return changed
+
+
+def _append(card):
+    changed = copy.deepcopy(card)
+    changed.body = changed.body + [TextBlock(text='One more thing')]
+    return changed
+
+
+def main():
+    cards = {
+        'huge': _with_ids(make_card('huge')),
+        'table 2000x4': make_table_card(2000, 4),
+    }
+    edits = {
+        'identical': copy.deepcopy,
+        'one leaf': _change_leaf,
+        'reorder 5': _reorder,
+        'append': _append,
+    }
+
+    print(f"{'card':<14}{'edit':<11}{'bytes == (ms)':>14}{'first (ms)':>12}{'repeat (ms)':>13}"
+          f"{'apply (ms)':>12}{'ops':>6}{'patch (B)':>11}{'card (B)':>10}")
+    for name, card in cards.items():
+        size = len(card.as_bytes())
+        for edit, make in edits.items():
+            if edit == 'reorder 5' and name.startswith('table'):
+                continue
+            new = make(card)
+            compare = _best(lambda: card.as_bytes() == new.as_bytes())
+            pairs = [(copy.deepcopy(card), make(card)) for _ in range(3)]
+            first = min(timeit.repeat(lambda: diff(*pairs.pop()), number=1, repeat=3))
+            diff_time = _best(lambda: diff(card, new))
+            patch = diff(card, new)
+            copies = [copy.deepcopy(card) for _ in range(3)]
+            apply_time = min(timeit.repeat(lambda: apply_patch(copies.pop(), patch),
+                                           number=1, repeat=3))
+            assert apply_patch(copy.deepcopy(card), patch).as_bytes() == new.as_bytes()
+            patch_size = len(json.dumps(patch, separators=(',', ':')))
+            print(f"{name:<14}{edit:<11}{compare * 1e3:>14.2f}{first * 1e3:>12.2f}{diff_time * 1e3:>13.2f}"
+                  f"{apply_time * 1e3:>12.3f}{len(patch):>6}{patch_size:>11}{size:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import hashlib
+import timeit
+
+from adaptivecardsng.fingerprint import fingerprint
+
+from _cards import SIZES, make_card, make_table_card
+
+# fingerprint() against hashing the full JSON encoding, for a fresh
+# tree, a repeated query and a query after changing one TextBlock,
+# followed by the cost of card equality, which compares the canonical
+# encodings and so costs about two sha256 columns without the hashing.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_fingerprint.py
+
+
+def _best(function) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number
+
+
+def _last_text_block(obj):
+    # The deepest, last TextBlock in the tree: the worst case for a change.
+    for key in ('body', 'items', 'rows', 'cells', 'columns'):
+        children = obj.__dict__.get(key) if hasattr(obj, '__dict__') else None
+        for child in reversed(children or ()):
+            found = _last_text_block(child)
+            if found is not None:
+                return found
+    return obj if getattr(obj, 'type', None) == 'TextBlock' else None
+
+
+def _make(name):
+    return make_card(name) if name in SIZES else make_table_card(2000, 4)
+
+
+def main():
+    names = list(SIZES) + ['table 2000x4']
+
+    print(f"{'card':<14}{'sha256 (ms)':>13}{'first (ms)':>12}{'repeat (us)':>13}"
+          f"{'changed (us)':>14}{'== (ms)':>10}")
+    for name in names:
+        card = _make(name)
+        digest = _best(lambda: hashlib.sha256(card.as_bytes(canonical=True)).hexdigest())
+
+        # A fresh tree each time, so nothing has been hashed yet.
+        fresh = [_make(name) for _ in range(3)]
+        first = min(timeit.repeat(lambda: fingerprint(fresh.pop()), number=1, repeat=3))
+
+        repeat = _best(lambda: fingerprint(card))
+        leaf = _last_text_block(card)
+
+        def changed():
+            leaf.text = leaf.text
+            return fingerprint(card)
+        changed_time = _best(changed)
+
+        other = _make(name)
+        assert card == other
+        equal = _best(lambda: card == other)
+        print(f"{name:<14}{digest * 1e3:>13.3f}{first * 1e3:>12.3f}{repeat * 1e6:>13.2f}"
+              f"{changed_time * 1e6:>14.2f}{equal * 1e3:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
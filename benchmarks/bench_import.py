@@ -0,0 +1,81 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Import time of the package, measured with ``python -X importtime`` in
+# fresh interpreters.  Each case is run several times and the best run
+# is reported, with the modules that took the most time on their own.
+# With --limit, exits with an error if any case takes longer, so it can
+# guard against imports creeping back in.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_import.py [--limit MS]
+
+CASES = {
+    'package': 'import adaptivecardsng',
+    'elements': 'import adaptivecardsng.elements',
+    'cards': 'import adaptivecardsng.cards',
+    'teams message': 'from adaptivecardsng.messages import TeamsAdaptiveMessage',
+    'first card': "from adaptivecardsng import AdaptiveCard, TextBlock\n"
+                  "AdaptiveCard(body=[TextBlock(text='x')]).as_bytes()",
+}
+
+
+def _import_times(code: str, environment: dict) -> dict:
+    # Top-level imports made by ``code``: module -> (self, cumulative) in us.
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            env=environment, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        # One space after the bar, then two more per level of nesting.
+        times[name[1:].rstrip()] = (int(own), int(cumulative))
+    return times
+
+
+def _measure(code: str, environment: dict, startup: set, runs: int) -> tuple:
+    best = None
+    for _ in range(runs):
+        times = _import_times(code, environment)
+        total = sum(cumulative for name, (_, cumulative) in times.items()
+                    if not name.startswith(' ') and name not in startup)
+        if best is None or total < best[0]:
+            best = (total, times)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--top', type=int, default=5, help="slowest modules to list per case")
+    parser.add_argument('--limit', type=float, help="fail if a case takes longer (ms)")
+    options = parser.parse_args()
+
+    environment = dict(os.environ)
+    # Let the warm-up runs write bytecode, so compiling isn't measured.
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    startup = set(_import_times('pass', environment))
+    for code in CASES.values():
+        _import_times(code, environment)
+
+    slow = []
+    for name, code in CASES.items():
+        total, times = _measure(code, environment, startup, options.runs)
+        print(f"{name:<16}{total / 1e3:>8.2f} ms")
+        own = sorted(((own, module.strip()) for module, (own, _) in times.items()
+                      if module not in startup), reverse=True)
+        for us, module in own[:options.top]:
+            print(f"    {us / 1e3:>6.2f} ms  {module}")
+        if options.limit is not None and total / 1e3 > options.limit:
+            slow.append(name)
+
+    if slow:
+        sys.exit(f"Over the {options.limit} ms limit: {', '.join(slow)}")
+
+
+if __name__ == '__main__':
+    main()
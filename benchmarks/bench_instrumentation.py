@@ -0,0 +1,37 @@
+import timeit
+
+from adaptivecardsng.instrumentation import Recorder
+from adaptivecardsng.messages import TeamsAdaptiveMessage
+
+from _cards import SIZES, make_card
+
+# Cost of building, wrapping and serializing cards with and without an
+# active Recorder.  With no recorder active the hooks are not installed,
+# so "off" is the library's normal speed.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_instrumentation.py
+
+
+def _best(function) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number
+
+
+def _send(size) -> bytes:
+    return TeamsAdaptiveMessage(make_card(size)).as_bytes()
+
+
+def main():
+    print(f"{'card':<10}{'off (ms)':>10}{'on (ms)':>10}{'overhead':>10}")
+    for name in SIZES:
+        off = _best(lambda: _send(name))
+        with Recorder():
+            on = _best(lambda: _send(name))
+        print(f"{name:<10}{off * 1e3:>10.3f}{on * 1e3:>10.3f}{on / off - 1:>+10.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import gc
+import timeit
+import tracemalloc
+
+from adaptivecardsng.actions import Submit
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Container
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import Colors, FontWeight
+from adaptivecardsng.inputs import Choice, ChoiceSet
+from adaptivecardsng.interning import InternPool
+
+from _cards import make_card
+
+# Memory footprint and encoding time of cards before and after
+# interning, for a form repeating the same choices and labels in every
+# row, and for the generated digest card, whose sections share their
+# labels and column layout.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_interning.py
+
+
+def make_form(rows: int = 300, choices: int = 25) -> AdaptiveCard:
+    """Build a triage form with one ChoiceSet per row, all offering the same choices."""
+    body = []
+    for i in range(rows):
+        body.append(Container(items=[
+            TextBlock(text='Severity', font_weight=FontWeight.bolder, color=Colors.accent),
+            ChoiceSet(id=f'severity-{i}', label='Pick one',
+                      choices=[Choice(title=f'Level {j}', value=str(j))
+                               for j in range(choices)]),
+        ]))
+    return AdaptiveCard(body=body, actions=[Submit(title='Save', data={'action': 'save'})])
+
+
+def _best(function) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number
+
+
+def measure(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    cases = {
+        'form 300x25': make_form,
+        'digest x500': lambda: make_card('huge'),
+    }
+    print(f"{'card':<14}{'shared':>8}{'reused':>8}{'regular (KiB)':>15}{'interned (KiB)':>16}"
+          f"{'encode (ms)':>13}{'interned (ms)':>15}{'intern (ms)':>13}")
+    for name, build in cases.items():
+        card, regular = measure(build)
+        pool = InternPool()
+        interned, interned_size = measure(lambda: pool.intern(build()))
+        assert interned.as_bytes() == card.as_bytes()
+
+        encode = _best(card.as_bytes)
+        encode_interned = _best(interned.as_bytes)
+        fresh = [build() for _ in range(3)]
+        intern_time = min(timeit.repeat(lambda: InternPool().intern(fresh.pop()),
+                                        number=1, repeat=3))
+        stats = pool.stats()
+        print(f"{name:<14}{stats['shared']:>8}{stats['reused']:>8}{regular / 1024:>15.0f}"
+              f"{interned_size / 1024:>16.0f}{encode * 1e3:>13.2f}"
+              f"{encode_interned * 1e3:>15.2f}{intern_time * 1e3:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import sqlite3
+import time
+import tracemalloc
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Table, TableCell, TableRow
+from adaptivecardsng.elements import TextBlock
+
+from bench_streaming import NullSink
+
+# Rendering a Table straight from a database cursor: rows materialised
+# into a list first, against a generator consumed during serialization
+# by dump(), with and without a row cap.  Reports the peak memory and
+# time of building and writing the card.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_lazy.py
+
+ROWS = 20000
+
+
+def make_database() -> sqlite3.Connection:
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE alerts (id INTEGER, host TEXT, message TEXT)')
+    connection.executemany('INSERT INTO alerts VALUES (?, ?, ?)',
+                           ((i, f'host-{i % 500:03d}', f'disk usage at {i % 100}%')
+                            for i in range(ROWS)))
+    return connection
+
+
+def table_row(record) -> TableRow:
+    return TableRow(cells=[TableCell(items=[TextBlock(text=str(value))]) for value in record])
+
+
+def materialised(connection, limit=None):
+    rows = [table_row(record) for record in connection.execute('SELECT * FROM alerts')]
+    return AdaptiveCard(body=[Table(rows=rows, row_limit=limit)])
+
+
+def lazy(connection, limit=None):
+    rows = (table_row(record) for record in connection.execute('SELECT * FROM alerts'))
+    return AdaptiveCard(body=[Table(rows=rows, row_limit=limit)])
+
+
+def main():
+    connection = make_database()
+    assert b''.join(lazy(connection).iter_bytes()) == materialised(connection).as_bytes()
+    assert lazy(connection, 100).as_bytes() == materialised(connection, 100).as_bytes()
+
+    print(f"{ROWS} rows")
+    print(f"{'rows':<14}{'cap':>6}{'bytes':>10}{'peak (KiB)':>12}{'time (ms)':>12}")
+    for name, build in (('list', materialised), ('generator', lazy)):
+        for limit in (None, 100):
+            sink = NullSink()
+            tracemalloc.start()
+            start = time.perf_counter()
+            build(connection, limit).dump(sink)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<14}{limit or '-':>6}{sink.written:>10}{peak / 1024:>12.0f}"
+                  f"{elapsed * 1e3:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
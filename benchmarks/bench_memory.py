@@ -0,0 +1,56 @@
+import gc
+import tracemalloc
+
+from adaptivecardsng.base import BaseObject
+from adaptivecardsng.compact import CompactNode, compact
+
+from _cards import make_card, make_table_card
+
+# Memory footprint of regular BaseObject trees against their compact()
+# equivalents, measured with tracemalloc on large generated cards.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_memory.py
+
+
+def count_nodes(obj) -> int:
+    if isinstance(obj, list):
+        return sum(count_nodes(item) for item in obj)
+    if isinstance(obj, dict):
+        return sum(count_nodes(item) for item in obj.values())
+    if isinstance(obj, (BaseObject, CompactNode)):
+        return 1 + sum(count_nodes(obj[key]) for key in obj)
+    return 0
+
+
+def measure(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    cases = {
+        'table 2000x4': lambda: make_table_card(2000, 4),
+        'digest x500': lambda: make_card('huge'),
+    }
+    print(f"{'card':<14}{'nodes':>8}{'regular (KiB)':>15}{'compact (KiB)':>15}"
+          f"{'B/node':>9}{'B/node':>9}{'ratio':>8}")
+    for name, build in cases.items():
+        card, regular = measure(build)
+        nodes = count_nodes(card)
+        # Build a fresh tree and compact it, so the strings it shares with its
+        # source are counted against the compact tree too.
+        compacted, compact_size = measure(lambda: compact(build()))
+        assert compacted.as_json() == card.as_json()
+        print(f"{name:<14}{nodes:>8}{regular / 1024:>15.0f}{compact_size / 1024:>15.0f}"
+              f"{regular / nodes:>9.0f}{compact_size / nodes:>9.0f}"
+              f"{regular / compact_size:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from adaptivecardsng.messages import AsyncWebhookSender, Outbox, TeamsAdaptiveMessage, WebhookSender
+from adaptivecardsng.messages.testing import StandInWebhook
+
+from _cards import make_alert_card
+
+# Enqueue and drain rates of the SQLite outbox with a large backlog.
+#
+# Enqueueing is measured with a commit (and fsync) per message, with
+# put() batching commits, and with a single put_many().  Draining sends
+# the backlog, spread over several webhooks, to a local stand-in that
+# answers at once, so the figures are the outbox's own overhead plus
+# loopback HTTP.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=.:benchmarks python benchmarks/bench_outbox.py
+
+BACKLOG = 20000
+WEBHOOKS = 16
+
+
+def enqueue(path: str, deliveries: list, batch_size: int, many: bool) -> float:
+    start = time.perf_counter()
+    with Outbox(path, batch_size=batch_size) as outbox:
+        if many:
+            outbox.put_many(deliveries)
+        else:
+            for url, payload in deliveries:
+                outbox.put(url, payload)
+    return time.perf_counter() - start
+
+
+async def drain_async(outbox: Outbox) -> dict:
+    async with AsyncWebhookSender() as sender:
+        return await outbox.drain_async(sender)
+
+
+def main():
+    payloads = [TeamsAdaptiveMessage(make_alert_card(index)).as_bytes()
+                for index in range(100)]
+    directory = tempfile.mkdtemp()
+    print(f"backlog: {BACKLOG} messages to {WEBHOOKS} webhooks")
+    print(f"{'operation':<28}{'msgs/s':>10}")
+    with StandInWebhook() as webhook:
+        urls = [f'{webhook.url}/{index}' for index in range(WEBHOOKS)]
+        deliveries = [(urls[index % WEBHOOKS], payloads[index % len(payloads)])
+                      for index in range(BACKLOG)]
+
+        # A commit per message is slow enough to be measured on a slice.
+        few = deliveries[:500]
+        elapsed = enqueue(os.path.join(directory, 'single.db'), few, 1, False)
+        print(f"{'put, commit each':<28}{len(few) / elapsed:>10.0f}")
+        for batch_size in (100, 1000):
+            elapsed = enqueue(os.path.join(directory, f'batch{batch_size}.db'), deliveries,
+                              batch_size, False)
+            print(f"{f'put, batches of {batch_size}':<28}{BACKLOG / elapsed:>10.0f}")
+        path = os.path.join(directory, 'many.db')
+        elapsed = enqueue(path, deliveries, 100, True)
+        print(f"{'put_many':<28}{BACKLOG / elapsed:>10.0f}")
+
+        with Outbox(path, batch_size=1000) as outbox:
+            start = time.perf_counter()
+            with WebhookSender(max_workers=WEBHOOKS) as sender:
+                counts = outbox.drain(sender)
+            elapsed = time.perf_counter() - start
+            assert counts['sent'] == BACKLOG and not outbox
+        print(f"{'drain, threads':<28}{BACKLOG / elapsed:>10.0f}")
+
+        path = os.path.join(directory, 'batch1000.db')
+        with Outbox(path, batch_size=1000) as outbox:
+            start = time.perf_counter()
+            counts = asyncio.run(drain_async(outbox))
+            elapsed = time.perf_counter() - start
+            assert counts['sent'] == BACKLOG and not outbox
+        print(f"{'drain_async':<28}{BACKLOG / elapsed:>10.0f}")
+        assert len(webhook.received) == 2 * BACKLOG
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import json
+import timeit
+
+from adaptivecardsng.parsing import from_dict, from_json
+
+from _cards import SIZES, make_card, make_table_card
+
+# Parse throughput of parsing.from_json(), split into the json.loads()
+# step and the object tree rebuild, with a round-trip check of each card.
+# The round-trip tests proper are in tests/test_parsing.py.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_parsing.py
+
+
+def main():
+    cases = {name: make_card(name) for name in SIZES}
+    cases['table 500x4'] = make_table_card(500, 4)
+
+    print(f"{'card':<13}{'loads (ms)':>12}{'rebuild (ms)':>14}{'cards/s':>10}{'MB/s':>8}")
+    for name, card in cases.items():
+        payload = card.as_bytes()
+        assert from_json(payload).as_bytes() == payload
+        decoded = json.loads(payload)
+
+        timer = timeit.Timer(lambda: from_json(payload))
+        number, _ = timer.autorange()
+        total = min(timer.repeat(5, number)) / number
+        loads = min(timeit.repeat(lambda: json.loads(payload), number=number, repeat=5)) / number
+        rebuild = min(timeit.repeat(lambda: from_dict(decoded), number=number, repeat=5)) / number
+
+        print(f"{name:<13}{loads * 1e3:>12.3f}{rebuild * 1e3:>14.3f}"
+              f"{1 / total:>10.0f}{len(payload) / total / 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from adaptivecardsng.messages import AsyncWebhookSender, RetryPolicy, Scheduler
+from adaptivecardsng.messages import TeamsAdaptiveMessage
+from adaptivecardsng.messages.testing import StandInWebhook
+
+from _cards import make_alert_card
+
+# An alert storm on one channel while a few quiet channels post now and
+# then, against a stand-in that throttles each webhook like Teams does
+# (scaled up to RATE per second so the run is short).  Sending straight
+# through the pooled sender is compared with going through a Scheduler
+# set a little below the limit.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=.:benchmarks python benchmarks/bench_scheduler.py
+
+RATE = 20.0
+BURST = 2
+STORM = 100
+QUIET_CHANNELS = 4
+QUIET = 10
+
+
+async def direct(deliveries: list, finished: list) -> list:
+    async with AsyncWebhookSender(retry=RetryPolicy(base_delay=0.05, max_delay=1.0)) as sender:
+        async def send(url, payload):
+            result = await sender.send(url, payload)
+            finished.append((url, time.perf_counter()))
+            return result
+        return await asyncio.gather(*[send(url, payload) for url, payload in deliveries])
+
+
+async def scheduled(deliveries: list, finished: list) -> list:
+    async with AsyncWebhookSender(retry=RetryPolicy(base_delay=0.05, max_delay=1.0)) as sender:
+        async with Scheduler(sender, rate=RATE * 0.9, burst=BURST) as scheduler:
+            async def send(url, payload):
+                result = await scheduler.send(url, payload)
+                finished.append((url, time.perf_counter()))
+                return result
+            return await asyncio.gather(*[send(url, payload) for url, payload in deliveries])
+
+
+async def run(mode, deliveries: list) -> dict:
+    async with StandInWebhook(rate=RATE, burst=BURST) as webhook:
+        deliveries = [(webhook.url + path, payload) for path, payload in deliveries]
+        finished = []
+        start = time.perf_counter()
+        results = await mode(deliveries, finished)
+        elapsed = time.perf_counter() - start
+        # Time for each quiet channel's messages to be through, on average.
+        quiet = [when - start for url, when in finished if '/quiet' in url]
+        return {'elapsed': elapsed, 'throttled': webhook.throttled,
+                'failed': sum(not result.ok for result in results),
+                'quiet': sum(quiet) / len(quiet)}
+
+
+def main():
+    payload = TeamsAdaptiveMessage(make_alert_card()).as_bytes()
+    deliveries = [('/storm', payload)] * STORM
+    for channel in range(QUIET_CHANNELS):
+        deliveries += [(f'/quiet{channel}', payload)] * QUIET
+    total = len(deliveries)
+    print(f"{STORM} messages to one webhook, {QUIET} to each of {QUIET_CHANNELS} others; "
+          f"limit {RATE:.0f}/s per webhook")
+    print(f"{'sender':<12}{'time (s)':>10}{'delivered':>11}{'429s':>8}"
+          f"{'quiet latency (s)':>20}")
+    for name, mode in (('direct', direct), ('scheduled', scheduled)):
+        figures = asyncio.run(run(mode, deliveries))
+        print(f"{name:<12}{figures['elapsed']:>10.2f}{total - figures['failed']:>11}"
+              f"{figures['throttled']:>8}{figures['quiet']:>20.3f}")
+
+
+if __name__ == '__main__':
+    main()
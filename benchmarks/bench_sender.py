@@ -0,0 +1,70 @@
+import time
+import urllib.request
+
+from adaptivecardsng.messages import TeamsAdaptiveMessage, WebhookSender
+from adaptivecardsng.messages.testing import StandInWebhook
+
+from _cards import make_alert_card
+
+# Throughput and latency of the blocking WebhookSender against a local
+# stand-in webhook that takes a few milliseconds to answer, compared with
+# posting each message with urllib.request, which opens a new connection
+# every time.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=.:benchmarks python benchmarks/bench_sender.py
+
+MESSAGES = 500
+LATENCY = 0.002
+
+
+def urllib_loop(url: str, payloads: list) -> list:
+    latencies = []
+    for payload in payloads:
+        start = time.perf_counter()
+        request = urllib.request.Request(url, payload, {'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def sender_loop(url: str, payloads: list) -> list:
+    with WebhookSender() as sender:
+        results = [sender.send(url, payload) for payload in payloads]
+    assert all(result.ok for result in results)
+    return [result.seconds for result in results]
+
+
+def sender_batch(url: str, payloads: list, workers: int) -> list:
+    with WebhookSender(max_per_host=workers) as sender:
+        results = sender.send_many((url, payload) for payload in payloads)
+    assert all(result.ok for result in results)
+    return [result.seconds for result in results]
+
+
+def main():
+    payloads = [TeamsAdaptiveMessage(make_alert_card(index)).as_bytes()
+                for index in range(MESSAGES)]
+    print(f"{MESSAGES} messages, {LATENCY * 1000:.0f} ms per response")
+    print(f"{'sender':<24}{'msgs/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'connections':>13}")
+    with StandInWebhook(delay=LATENCY) as webhook:
+        runs = [('urllib, one at a time', lambda: urllib_loop(webhook.url, payloads)),
+                ('send() in a loop', lambda: sender_loop(webhook.url, payloads))]
+        for workers in (4, 16):
+            runs.append((f'send_many, {workers} threads',
+                         lambda workers=workers: sender_batch(webhook.url, payloads, workers)))
+        for name, run in runs:
+            connections = webhook.connections
+            start = time.perf_counter()
+            latencies = sorted(run())
+            elapsed = time.perf_counter() - start
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(f"{name:<24}{MESSAGES / elapsed:>10.0f}{p50:>10.2f}{p99:>10.2f}"
+                  f"{webhook.connections - connections:>13}")
+
+
+if __name__ == '__main__':
+    main()
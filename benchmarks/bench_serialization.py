@@ -0,0 +1,45 @@
+import json
+import timeit
+
+from adaptivecardsng.base import BaseObjectJSONEncoder
+
+from _cards import SIZES, make_card
+
+# Compares the compiled serializer behind BaseObject.as_json() with the
+# original json.dumps(..., cls=BaseObjectJSONEncoder) approach, and the
+# compact wire format from BaseObject.as_bytes() against the indented one.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_serialization.py
+
+
+def legacy_as_json(card) -> str:
+    return json.dumps(card.__dict__, sort_keys=True, indent=2,
+                      separators=(',', ':'), cls=BaseObjectJSONEncoder)
+
+
+def main():
+    print(f"{'size':<8}{'legacy (ms)':>14}{'compiled (ms)':>16}{'speedup':>10}"
+          f"{'bytes (ms)':>13}{'pretty size':>14}{'compact size':>15}")
+    for name in SIZES:
+        card = make_card(name)
+        assert card.as_json() == legacy_as_json(card)
+
+        timer = timeit.Timer(lambda: legacy_as_json(card))
+        number, _ = timer.autorange()
+        legacy = min(timer.repeat(5, number)) / number
+
+        timer = timeit.Timer(card.as_json)
+        compiled = min(timer.repeat(5, number)) / number
+
+        timer = timeit.Timer(card.as_bytes)
+        compact = min(timer.repeat(5, number)) / number
+
+        print(f"{name:<8}{legacy * 1e3:>14.3f}{compiled * 1e3:>16.3f}"
+              f"{legacy / compiled:>9.2f}x{compact * 1e3:>13.3f}"
+              f"{len(card.as_json()):>14}{len(card.as_bytes()):>15}")
+
+
+if __name__ == '__main__':
+    main()
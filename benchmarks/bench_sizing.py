@@ -0,0 +1,71 @@
+import timeit
+
+from adaptivecardsng.messages import split_card
+from adaptivecardsng.sizing import encoded_size
+
+from _cards import SIZES, make_card, make_table_card
+
+# encoded_size() against measuring len(as_bytes()), for a full
+# measurement, a repeated query reusing remembered sizes (fresh=False)
+# and such a query after changing one TextBlock, followed by the cost of
+# splitting oversized cards with split_card().
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_sizing.py
+
+
+def _best(function, setup=None) -> float:
+    timer = timeit.Timer(function, setup=setup or 'pass')
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number
+
+
+def _last_text_block(obj):
+    # The deepest, last TextBlock in the tree: the worst case for a change.
+    for key in ('body', 'items', 'rows', 'cells', 'columns'):
+        children = obj.__dict__.get(key) if hasattr(obj, '__dict__') else None
+        for child in reversed(children or ()):
+            found = _last_text_block(child)
+            if found is not None:
+                return found
+    return obj if getattr(obj, 'type', None) == 'TextBlock' else None
+
+
+def main():
+    cases = {name: make_card(name) for name in SIZES}
+    cases['table 2000x4'] = make_table_card(2000, 4)
+
+    print(f"{'card':<14}{'as_bytes (ms)':>15}{'first (ms)':>12}{'repeat (us)':>13}"
+          f"{'changed (us)':>14}")
+    for name, card in cases.items():
+        assert encoded_size(card) == len(card.as_bytes())
+        encode = _best(lambda: len(card.as_bytes()))
+
+        # A fresh tree each time, so nothing has been measured yet.
+        fresh = [make_card(name) if name in SIZES else make_table_card(2000, 4)
+                 for _ in range(3)]
+        first = min(timeit.repeat(lambda: encoded_size(fresh.pop()), number=1, repeat=3))
+
+        repeat = _best(lambda: encoded_size(card, fresh=False))
+        leaf = _last_text_block(card)
+
+        def changed():
+            leaf.text = leaf.text
+            return encoded_size(card, fresh=False)
+        changed_time = _best(changed)
+        assert changed() == len(card.as_bytes())
+        print(f"{name:<14}{encode * 1e3:>15.3f}{first * 1e3:>12.3f}{repeat * 1e6:>13.2f}"
+              f"{changed_time * 1e6:>14.2f}")
+
+    print()
+    print(f"{'card':<14}{'bytes':>10}{'messages':>10}{'split (ms)':>12}")
+    for name in ('huge', 'table 2000x4'):
+        card = cases[name]
+        messages = split_card(card)
+        elapsed = _best(lambda: split_card(card))
+        print(f"{name:<14}{encoded_size(card):>10}{len(messages):>10}{elapsed * 1e3:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
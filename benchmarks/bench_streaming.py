@@ -0,0 +1,53 @@
+import time
+import tracemalloc
+
+from _cards import make_table_card
+
+# Peak memory and time of writing a large card with as_bytes() against
+# the incremental BaseObject.dump() writer.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_streaming.py
+
+
+class NullSink:
+    """Binary file-like object that only counts what is written to it."""
+    def __init__(self):
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        self.written += len(data)
+        return len(data)
+
+
+def whole(card, sink):
+    sink.write(card.as_bytes())
+
+
+def streamed(card, sink):
+    card.dump(sink)
+
+
+def main():
+    card = make_table_card(5000, 6)
+    expected = card.as_bytes()
+    assert b''.join(card.iter_bytes(chunk_size=4096)) == expected
+    assert b''.join(card.iter_bytes(compact=False)) == card.as_json().encode()
+
+    print(f"payload: {len(expected) / 1024:.0f} KiB")
+    print(f"{'writer':<10}{'peak (KiB)':>12}{'time (ms)':>12}")
+    for name, writer in (('as_bytes', whole), ('dump', streamed)):
+        sink = NullSink()
+        tracemalloc.start()
+        start = time.perf_counter()
+        writer(card, sink)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert sink.written == len(expected)
+        print(f"{name:<10}{peak / 1024:>12.0f}{elapsed * 1e3:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import json
+import timeit
+
+from adaptivecardsng.actions import OpenUrl, Submit
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Container, Fact, FactSet
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import Colors, FontSize, FontWeight
+from adaptivecardsng.templating import compile_template
+
+# Per-recipient rendering throughput: a compiled template rendered once
+# per data record, against building a fresh AdaptiveCard per record and
+# serializing it with as_bytes().
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_templating.py
+
+HEADER = [
+    TextBlock(text='Weekly usage report', font_weight=FontWeight.bolder,
+              font_size=FontSize.large, wrap=True),
+    TextBlock(text='Generated by the reporting service. Figures are in GiB.',
+              subtle=True, wrap=True),
+]
+
+
+def make_template() -> AdaptiveCard:
+    return AdaptiveCard(body=HEADER + [
+        TextBlock(text='Hello ${name}, here is your summary.', wrap=True),
+        Container(items=[
+            FactSet(facts=[Fact(title='${label}', value='${value}', **{'$data': '${usage}'})]),
+        ]),
+        TextBlock(text='You are over quota!', color=Colors.attention,
+                  **{'$when': '${total > quota}'}),
+    ], actions=[
+        OpenUrl(url='https://usage.example.com/users/${id}', title='Details'),
+        Submit(data={'user': '${id}'}, title='Acknowledge'),
+    ])
+
+
+def build_card(record) -> AdaptiveCard:
+    body = HEADER + [
+        TextBlock(text=f"Hello {record['name']}, here is your summary.", wrap=True),
+        Container(items=[
+            FactSet(facts=[Fact(title=item['label'], value=item['value'])
+                           for item in record['usage']]),
+        ]),
+    ]
+    if record['total'] > record['quota']:
+        body.append(TextBlock(text='You are over quota!', color=Colors.attention))
+    return AdaptiveCard(body=body, actions=[
+        OpenUrl(url=f"https://usage.example.com/users/{record['id']}", title='Details'),
+        Submit(data={'user': record['id']}, title='Acknowledge'),
+    ])
+
+
+def make_records(count: int) -> list:
+    return [{
+        'id': f'u{i}', 'name': f'User {i}', 'quota': 50, 'total': i % 100,
+        'usage': [{'label': f'volume-{j}', 'value': str(i * j % 97)} for j in range(5)],
+    } for i in range(count)]
+
+
+def main():
+    template = compile_template(make_template())
+    records = make_records(1000)
+    for record in records[:100]:
+        assert json.loads(template.render(record)) == json.loads(build_card(record).as_bytes())
+
+    def rendered():
+        for record in records:
+            template.render_bytes(record)
+
+    def built():
+        for record in records:
+            build_card(record).as_bytes()
+
+    template_time = min(timeit.repeat(rendered, number=1, repeat=5))
+    build_time = min(timeit.repeat(built, number=1, repeat=5))
+    print(f"{'approach':<20}{'records/s':>12}")
+    print(f"{'build + as_bytes':<20}{len(records) / build_time:>12.0f}")
+    print(f"{'compiled template':<20}{len(records) / template_time:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import json
+import timeit
+
+from adaptivecardsng.validation import validate
+
+from _cards import SIZES, make_card, make_table_card
+
+# Cost of validation.validate() on valid cards, both BaseObject trees
+# and decoded JSON, next to the cost of serializing the same card with
+# as_bytes() for scale.
+#
+# Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/bench_validation.py
+
+
+def _best(function) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(5, number)) / number
+
+
+def main():
+    cases = {name: make_card(name) for name in SIZES}
+    cases['table 500x4'] = make_table_card(500, 4)
+
+    print(f"{'card':<13}{'objects (ms)':>14}{'json (ms)':>11}{'as_bytes (ms)':>15}"
+          f"{'ratio':>7}")
+    for name, card in cases.items():
+        decoded = json.loads(card.as_bytes())
+        assert validate(card) == [] and validate(decoded) == []
+
+        objects = _best(lambda: validate(card))
+        plain = _best(lambda: validate(decoded))
+        encode = _best(card.as_bytes)
+        print(f"{name:<13}{objects * 1e3:>14.3f}{plain * 1e3:>11.3f}{encode * 1e3:>15.3f}"
+              f"{objects / encode:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.messages.aio import AsyncWebhookSender
+from adaptivecardsng.messages.delivery import RetryPolicy
+from adaptivecardsng.messages.teams import TeamsAdaptiveMessage
+from adaptivecardsng.messages.testing import StandInWebhook
+
+# No waiting between retries, so that the tests run quickly.
+NO_WAIT = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+
+
+def make_message(text: str = 'Deploy finished') -> TeamsAdaptiveMessage:
+    return TeamsAdaptiveMessage(AdaptiveCard(body=[TextBlock(text=text)]))
+
+
+def run(coroutine_function, **webhook_options):
+    # Runs ``coroutine_function(webhook)`` against a fresh StandInWebhook.
+    async def main():
+        async with StandInWebhook(**webhook_options) as webhook:
+            return await coroutine_function(webhook)
+    return asyncio.run(main())
+
+
+def test_connections_are_kept_alive():
+    messages = [make_message(f'Build {i}') for i in range(5)]
+
+    async def scenario(webhook):
+        async with AsyncWebhookSender(retry=NO_WAIT) as sender:
+            results = [await sender.send(webhook.url, message) for message in messages]
+        assert all(result.ok for result in results)
+        assert webhook.received == [message.as_bytes() for message in messages]
+        assert webhook.connections == 1
+    run(scenario)
+
+
+def test_throttled_send_is_retried_after_retry_after(monkeypatch):
+    waits = []
+    sleep = asyncio.sleep
+
+    async def record(delay):
+        waits.append(delay)
+        await sleep(0)
+    monkeypatch.setattr(asyncio, 'sleep', record)
+
+    async def scenario(webhook):
+        webhook.respond(429, headers={'Retry-After': '2'})
+        retry = RetryPolicy(attempts=3, base_delay=0, max_delay=5)
+        async with AsyncWebhookSender(retry=retry) as sender:
+            result = await sender.send(webhook.url, make_message())
+        assert result.ok
+        assert result.attempts == 2
+        assert waits == [2.0]
+        assert webhook.requests == 2
+        assert len(webhook.received) == 1
+    run(scenario)
+
+
+def test_stale_pooled_connection_is_resent_once():
+    async def scenario(webhook):
+        async with AsyncWebhookSender(retry=RetryPolicy(attempts=1)) as sender:
+            assert (await sender.send(webhook.url, make_message('first'))).ok
+            # The pooled connection is dropped when the next request arrives.
+            webhook.respond(None)
+            result = await sender.send(webhook.url, make_message('second'))
+        assert result.ok
+        assert result.attempts == 1
+        assert webhook.requests == 3
+        assert webhook.connections == 2
+        assert webhook.received == [make_message('first').as_bytes(),
+                                    make_message('second').as_bytes()]
+    run(scenario)
+
+
+def test_dropped_new_connection_counts_as_an_attempt():
+    async def scenario(webhook):
+        webhook.respond(None)
+        async with AsyncWebhookSender(retry=NO_WAIT) as sender:
+            result = await sender.send(webhook.url, make_message())
+        assert result.ok
+        assert result.attempts == 2
+    run(scenario)
+
+
+def test_concurrency_is_capped_per_host():
+    async def scenario(webhook):
+        async with AsyncWebhookSender(max_per_host=2, retry=NO_WAIT) as sender:
+            results = await sender.send_many((webhook.url, make_message(f'Alert {i}'))
+                                             for i in range(6))
+        assert all(result.ok for result in results)
+        assert webhook.max_in_flight == 2
+        assert webhook.connections == 2
+    run(scenario, delay=0.05)
+
+
+def test_timed_out_attempts_are_retried_then_reported():
+    async def scenario(webhook):
+        retry = RetryPolicy(attempts=2, base_delay=0, max_delay=0)
+        async with AsyncWebhookSender(timeout=0.05, retry=retry) as sender:
+            result = await sender.send(webhook.url, make_message())
+        assert not result.ok
+        assert result.status is None
+        assert isinstance(result.error, asyncio.TimeoutError)
+        assert result.attempts == 2
+    run(scenario, delay=0.5)
+
+
+@pytest.mark.parametrize('status', [204, 304])
+def test_bodyless_responses_keep_the_connection(status):
+    async def scenario(webhook):
+        webhook.respond(status, times=2)
+        async with AsyncWebhookSender(timeout=1, retry=RetryPolicy(attempts=1)) as sender:
+            results = [await sender.send(webhook.url, make_message()) for _ in range(3)]
+        assert [result.status for result in results] == [status, status, 200]
+        assert all(result.error is None for result in results)
+        assert webhook.connections == 1
+    run(scenario)
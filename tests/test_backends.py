@@ -0,0 +1,115 @@
+import json
+import math
+
+import pytest
+
+from adaptivecardsng.actions import OpenUrl, Submit
+from adaptivecardsng.backends import available_backends, get_backend
+from adaptivecardsng.base import BaseObjectJSONEncoder, _AS_JSON_FORMAT, _STR_FORMAT
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Column, ColumnSet, Container, Fact, FactSet
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import Colors, ContainerStyle, FontSize, FontWeight
+from adaptivecardsng.serialization import CANONICAL, COMPACT, JSONFormat
+
+BACKENDS = available_backends()
+
+FORMATS = {
+    'compact': COMPACT,
+    'canonical': CANONICAL,
+    'as_json': _AS_JSON_FORMAT,
+    'str': _STR_FORMAT,
+    'indent-4': JSONFormat(indent=4),
+    'indent-0': JSONFormat(indent=0),
+    'default': JSONFormat(),
+}
+
+
+def make_card(text: str = 'Nightly digest', data: (dict | None) = None) -> AdaptiveCard:
+    return AdaptiveCard(body=[
+        TextBlock(text=text, font_weight=FontWeight.bolder, font_size=FontSize.large,
+                  wrap=True),
+        Container(items=[
+            ColumnSet(columns=[
+                Column(width='auto', items=[TextBlock(text='Owner')]),
+                Column(width='stretch', items=[TextBlock(text='ok', color=Colors.good)]),
+            ]),
+            FactSet(facts=[Fact(title=f'metric.{i}', value=str(i)) for i in range(3)]),
+        ], style=ContainerStyle.emphasis),
+    ], actions=[
+        Submit(data=data if data is not None else {'ids': [1, 2, 3]}, title='Acknowledge'),
+        OpenUrl(url='https://example.com/a/b?c=d', title='Open'),
+    ])
+
+
+CARDS = {
+    'plain': make_card(),
+    'non-ascii': make_card('Café – 日本 \U0001f600'),
+    'control': make_card('tab\there\nnew "quoted" \\ \x00\x1f\x7f  '),
+    'floats': make_card(data={'values': [0.1, 1.5, 1e16, 1e-7, 2.0 ** 70, -0.0, 1e300]}),
+    'non-finite': make_card(data={'values': [math.nan, math.inf, -math.inf]}),
+    'null': make_card(data={'user': None, 'note': 'nullable'}),
+    'big-int': make_card(data={'id': 2 ** 70}),
+    'int-keys': make_card(data={2: 'two', 1: 'one'}),
+    'float-keys': make_card(data={2.5: 'two', 1.5: 'one'}),
+    'empty': AdaptiveCard(body=[Container(items=[])], actions=[Submit(data={})]),
+}
+
+
+def stdlib_dumps(obj, fmt: JSONFormat) -> str:
+    return json.dumps(obj, cls=BaseObjectJSONEncoder, indent=fmt.indent,
+                      separators=(fmt.item_separator, fmt.key_separator),
+                      sort_keys=fmt.sort_keys)
+
+
+@pytest.mark.parametrize('card', CARDS.values(), ids=list(CARDS))
+@pytest.mark.parametrize('fmt', FORMATS.values(), ids=list(FORMATS))
+def test_builtin_matches_json_encoder(card, fmt):
+    expected = stdlib_dumps(card, fmt)
+    backend = get_backend('builtin')
+    assert backend.dumps(card, fmt) == expected
+    assert backend.dumps_bytes(card, fmt) == expected.encode('ascii')
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+@pytest.mark.parametrize('card', CARDS.values(), ids=list(CARDS))
+@pytest.mark.parametrize('fmt', FORMATS.values(), ids=list(FORMATS))
+def test_backend_bytes_match_builtin(name, card, fmt):
+    backend = get_backend(name)
+    expected = get_backend('builtin').dumps_bytes(card, fmt)
+    assert backend.dumps_bytes(card, fmt) == expected
+    assert backend.dumps(card, fmt) == expected.decode('ascii')
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_as_bytes_backend_argument(name):
+    card = CARDS['non-ascii']
+    assert card.as_bytes(backend=name) == card.as_bytes(backend='builtin')
+    assert card.as_json(backend=name) == card.as_json(backend='builtin')
+    assert card.as_bytes(backend=name).isascii()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('nope')
+
+
+@pytest.mark.skipif('orjson' not in BACKENDS, reason='orjson is not installed')
+def test_orjson_falls_back_only_when_needed():
+    backend = get_backend('orjson')
+    assert backend._native(CARDS['plain'], COMPACT) is not None
+    assert backend._native(CARDS['plain'], JSONFormat(indent=4)) is None
+    for name in ('non-ascii', 'floats', 'non-finite', 'big-int'):
+        assert backend._native(CARDS[name], COMPACT) is None, name
+
+
+@pytest.mark.skipif('ujson' not in BACKENDS, reason='ujson is not installed')
+def test_ujson_falls_back_only_when_needed():
+    backend = get_backend('ujson')
+    assert backend._native(CARDS['plain'], COMPACT) is not None
+    assert backend._native(CARDS['plain'], JSONFormat(indent=2)) is not None
+    # ujson ignores default= when sorting keys.
+    assert backend._native(CARDS['plain'], CANONICAL) is None
+    assert backend._native(CARDS['plain'], JSONFormat(indent=0)) is None
+    for name in ('control', 'floats'):
+        assert backend._native(CARDS[name], COMPACT) is None, name
@@ -0,0 +1,93 @@
+import re
+
+import pytest
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Table
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.messages.coalescing import Coalescer, alert_text
+from adaptivecardsng.messages.teams import TeamsAdaptiveMessage
+
+URL = 'https://example.invalid/webhook'
+
+
+def make_alert(text: str) -> TeamsAdaptiveMessage:
+    return TeamsAdaptiveMessage(AdaptiveCard(body=[TextBlock(text=text)]))
+
+
+def rows_of(message) -> list:
+    # (alert text, count) for each row of a digest message's tables; only the
+    # first part of a split digest has the heading.
+    return [tuple(alert_text(AdaptiveCard(body=[cell])) for cell in row.cells)
+            for element in message.attachments[0]['content'].body
+            if isinstance(element, Table) for row in element.rows[1:]]
+
+
+def test_lone_message_is_handed_back_as_it_is():
+    coalescer = Coalescer(window=10)
+    alert = make_alert('disk full')
+    assert coalescer.add(URL, alert, now=0) == []
+    assert coalescer.next_due() == 10
+    assert coalescer.due(now=9) == [] and len(coalescer) == 1
+    assert coalescer.due(now=10) == [(URL, alert)]
+    assert len(coalescer) == 0 and coalescer.next_due() is None
+
+
+def test_burst_becomes_one_digest_counting_repeats():
+    coalescer = Coalescer(window=10)
+    for i, text in enumerate(['disk full', 'cpu high', 'disk full']):
+        coalescer.add(URL, make_alert(text), now=i)
+    coalescer.add('https://example.invalid/other', make_alert('quiet'), now=5)
+    [(url, message)] = coalescer.due(now=12)
+    assert url == URL
+    assert rows_of(message) == [('disk full', '2'), ('cpu high', '1')]
+    assert len(coalescer) == 1
+
+
+def test_full_buffer_is_released_at_once():
+    coalescer = Coalescer(window=60, max_messages=3)
+    assert coalescer.add(URL, make_alert('a'), now=0) == []
+    assert coalescer.add(URL, make_alert('b'), now=0) == []
+    [(_, message)] = coalescer.add(URL, make_alert('c'), now=0)
+    assert rows_of(message) == [('a', '1'), ('b', '1'), ('c', '1')]
+    assert len(coalescer) == 0
+
+
+def test_key_groups_alerts():
+    coalescer = Coalescer(key=lambda text: re.sub(r'\d+', 'N', text))
+    for i in range(4):
+        coalescer.add(URL, make_alert(f'host-{i} down'), now=0)
+    [(_, message)] = coalescer.flush()
+    assert rows_of(message) == [('host-N down', '4')]
+
+
+def test_large_digest_is_split_within_the_budget():
+    budget = 4000
+    coalescer = Coalescer(max_messages=1000, budget=budget)
+    texts = [f'alert {i} ' + 'x' * 200 for i in range(60)]
+    for text in texts:
+        coalescer.add(URL, make_alert(text), now=0)
+    messages = [message for _, message in coalescer.flush()]
+    assert len(messages) > 1
+    assert all(len(message.as_bytes()) <= budget for message in messages)
+    assert [text for message in messages for text, _ in rows_of(message)] == texts
+
+
+def test_alert_too_long_for_a_message_is_shortened_not_dropped():
+    budget = 4000
+    coalescer = Coalescer(budget=budget)
+    coalescer.add(URL, make_alert('short'), now=0)
+    coalescer.add(URL, make_alert('long ' + 'z' * (2 * budget)), now=0)
+    messages = [message for _, message in coalescer.flush()]
+    assert all(len(message.as_bytes()) <= budget for message in messages)
+    rows = [row for message in messages for row in rows_of(message)]
+    assert rows[0] == ('short', '1')
+    assert rows[1][0].startswith('long z') and rows[1][0].endswith('…')
+    assert len(coalescer) == 0
+
+
+def test_invalid_settings_are_refused():
+    with pytest.raises(ValueError):
+        Coalescer(max_messages=0)
+    with pytest.raises(ValueError):
+        Coalescer(budget=100)
@@ -0,0 +1,81 @@
+import pytest
+
+from adaptivecardsng.actions import Submit
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Container
+from adaptivecardsng.derive import REMOVE
+from adaptivecardsng.diff import PatchError
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.interning import intern, is_shared
+
+
+def make_card() -> AdaptiveCard:
+    return AdaptiveCard(body=[TextBlock(text='Hello'),
+                              Container(items=[TextBlock(text='a'), TextBlock(text='b')])],
+                        actions=[Submit(title='Ack', data={'user': 'base'})])
+
+
+def test_only_the_changed_path_is_copied():
+    base = make_card()
+    before = base.as_bytes()
+    variant = base.derive({'/body/0/text': 'Hello, Ann', '/actions/0/data': {'user': 'ann'}})
+    assert base.as_bytes() == before
+    assert variant.body[0].text == 'Hello, Ann' and variant.actions[0].data == {'user': 'ann'}
+    # Copied: the root and everything on the paths to the changes.
+    assert variant is not base
+    assert variant.body is not base.body and variant.body[0] is not base.body[0]
+    assert variant.actions is not base.actions and variant.actions[0] is not base.actions[0]
+    # Shared: everything else.
+    assert variant.body[1] is base.body[1]
+    assert variant.actions[0].title is base.actions[0].title
+
+
+def test_later_changes_reuse_the_copies_of_earlier_ones():
+    base = make_card()
+    variant = base.derive({'/body/1/items/0/text': 'x', '/body/1/items/1/text': 'y'})
+    assert [item.text for item in variant.body[1].items] == ['x', 'y']
+    assert [item.text for item in base.body[1].items] == ['a', 'b']
+    assert variant.body[0] is base.body[0]
+
+
+def test_append_and_remove():
+    base = make_card()
+    extra = TextBlock(text='c')
+    variant = base.derive({'/body/1/items/-': extra, '/body/0': REMOVE, '/actions': REMOVE})
+    assert variant.body[0].items[-1] is extra and len(base.body[1].items) == 2
+    assert 'actions' not in variant.__dict__ and 'actions' in base.__dict__
+    assert len(variant.body) == 1 and len(base.body) == 2
+
+
+def test_interned_paths_become_mutable_lists_and_objects():
+    # Repeated sub-objects, so that interning freezes and shares them.
+    base = intern(AdaptiveCard(body=[Container(items=[TextBlock(text='a')]) for _ in range(3)]))
+    assert is_shared(base.body[0]) and isinstance(base.body[0].items, tuple)
+    variant = base.derive({'/body/0/items/0/text': 'b'})
+    assert not is_shared(variant.body[0]) and isinstance(variant.body[0].items, list)
+    assert variant.body[1] is base.body[1] and is_shared(variant.body[1])
+    variant.body[0].items[0].text = 'c'
+    assert base.body[0].items[0].text == 'a'
+
+
+@pytest.mark.parametrize('changes', [{'': 'x'}, {'body/0': 'x'}, {'/body/9/text': 'x'},
+                                     {'/body/01/text': 'x'}, {'/missing/0': 'x'},
+                                     {'/body/0/missing': REMOVE}],
+                         ids=['root', 'relative', 'range', 'leading-zero', 'member', 'remove'])
+def test_invalid_pointers_are_refused(changes):
+    base = make_card()
+    before = base.as_bytes()
+    with pytest.raises(PatchError):
+        base.derive(changes)
+    assert base.as_bytes() == before
+
+
+def test_lazy_sequences_are_refused_without_being_consumed():
+    card = AdaptiveCard(body=[Container(items=(TextBlock(text=str(i)) for i in range(3)))])
+    with pytest.raises(PatchError):
+        card.derive({'/body/0/items/0/text': 'x'})
+    lazy_root = Container(items=(TextBlock(text=str(i)) for i in range(3)))
+    with pytest.raises(PatchError):
+        lazy_root.derive({'/style': 'emphasis'})
+    assert card.as_bytes().count(b'"TextBlock"') == 3
+    assert lazy_root.as_bytes().count(b'"TextBlock"') == 3
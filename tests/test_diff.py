@@ -0,0 +1,88 @@
+import copy
+import json
+import random
+
+import pytest
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Container
+from adaptivecardsng.diff import PatchError, apply_patch, diff
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import FontWeight
+
+
+def make_card(texts: list, weight: FontWeight = FontWeight.default) -> AdaptiveCard:
+    return AdaptiveCard(body=[TextBlock(text=text, id=text, weight=weight) for text in texts])
+
+
+def test_equal_trees_have_an_empty_diff():
+    assert diff(make_card(['a', 'b']), make_card(['a', 'b'])) == []
+    # Compared the way they serialize: Enum members equal their strings.
+    assert diff(make_card(['a']).to_dict(), make_card(['a'])) == []
+    assert diff({'x': (1, 2)}, {'x': [1, 2]}) == []
+
+
+def test_patch_turns_the_old_card_into_the_new_one():
+    old = make_card(['a', 'b', 'c'])
+    new = make_card(['a', 'x', 'c', 'd'], weight=FontWeight.bolder)
+    patch = diff(old, new)
+    json.dumps(patch)
+    patched = apply_patch(old, patch)
+    assert patched.to_dict() == new.to_dict()
+    assert isinstance(patched.body[-1], TextBlock)
+
+
+def test_reordering_elements_with_ids_yields_moves():
+    texts = [f'item {i}' for i in range(20)]
+    old, new = make_card(texts), make_card(texts[10:] + texts[:10])
+    patch = diff(old, new)
+    assert {operation['op'] for operation in patch} == {'move'}
+    assert len(patch) <= 10
+    assert apply_patch(old, patch).to_dict() == new.to_dict()
+
+
+def test_appending_touches_only_the_end():
+    old = make_card(['a', 'b'])
+    new = make_card(['a', 'b', 'c'])
+    assert [(operation['op'], operation['path']) for operation in diff(old, new)] == \
+        [('add', '/body/2')]
+
+
+def test_random_json_round_trips():
+    rng = random.Random(7)
+
+    def value(depth: int):
+        kind = rng.randrange(4 if depth < 3 else 2)
+        if kind == 0:
+            return rng.choice([None, True, 1, 2.5, 'a', 'b/c', 'd~e'])
+        if kind == 1:
+            return rng.randrange(3)
+        if kind == 2:
+            return [value(depth + 1) for _ in range(rng.randrange(4))]
+        return {rng.choice('abc/~'): value(depth + 1) for _ in range(rng.randrange(4))}
+
+    for _ in range(300):
+        old, new = value(0), value(0)
+        if not isinstance(old, (dict, list)):
+            continue
+        patched = apply_patch(copy.deepcopy(old), diff(old, new))
+        assert patched == new
+
+
+def test_nested_changes_use_nested_paths():
+    old = AdaptiveCard(body=[Container(items=[TextBlock(text='a')])])
+    new = AdaptiveCard(body=[Container(items=[TextBlock(text='b')])])
+    assert diff(old, new) == [{'op': 'replace', 'path': '/body/0/items/0/text', 'value': 'b'}]
+
+
+@pytest.mark.parametrize('patch', [
+    [{'op': 'remove', 'path': '/missing'}],
+    [{'op': 'add', 'path': '/list/5', 'value': 1}],
+    [{'op': 'test', 'path': '/list/0', 'value': 2}],
+    [{'op': 'move', 'from': '/list', 'path': '/list/0'}],
+    [{'op': 'remove'}],
+    [{'op': 'remove', 'path': ''}],
+], ids=['missing', 'range', 'test', 'into-itself', 'no-path', 'root'])
+def test_bad_operations_are_refused(patch):
+    with pytest.raises(PatchError):
+        apply_patch({'list': [1]}, patch)
@@ -0,0 +1,54 @@
+import pytest
+
+from adaptivecardsng import base
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Container
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import FontWeight
+from adaptivecardsng.fingerprint import fingerprint
+
+
+def make_card(text: str = 'Nightly digest') -> AdaptiveCard:
+    return AdaptiveCard(body=[TextBlock(text=text, font_weight=FontWeight.bolder),
+                              Container(items=[TextBlock(text='ok')])])
+
+
+def test_equality_and_hash_follow_content():
+    first, second = make_card(), make_card()
+    assert first == second and hash(first) == hash(second)
+    assert len({first, second, make_card('Other')}) == 2
+    assert first != make_card('Other')
+    assert first.fingerprint() == second.fingerprint() == fingerprint(second)
+
+
+def test_key_order_does_not_matter():
+    first = TextBlock(text='a', wrap=True)
+    second = TextBlock(wrap=True, text='a')
+    assert first == second and hash(first) == hash(second)
+    assert first.fingerprint() == second.fingerprint()
+
+
+def test_equality_and_hash_remember_nothing():
+    listeners = list(base._mutation_listeners)
+    first, second = make_card(), make_card()
+    assert first == second
+    hash(first)
+    assert base._mutation_listeners == listeners
+
+
+def test_fingerprint_follows_changes():
+    card = make_card()
+    before = card.fingerprint()
+    card.body[1].items[0].text = 'changed'
+    assert card.fingerprint() != before
+    assert card.fingerprint() == make_card().derive({'/body/1/items/0/text': 'changed'}) \
+        .fingerprint()
+
+
+def test_lazy_rows_are_refused_without_being_consumed():
+    card = AdaptiveCard(body=[Container(items=(TextBlock(text=str(i)) for i in range(3)))])
+    for attempt in (lambda: card == make_card(), lambda: hash(card), card.fingerprint):
+        with pytest.raises(TypeError):
+            attempt()
+    assert 'LazySequence (pending)' in str(card)
+    assert card.as_bytes().count(b'"TextBlock"') == 3
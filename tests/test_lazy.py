@@ -0,0 +1,53 @@
+import inspect
+import pickle
+
+import pytest
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Container, Table, TableCell, TableRow
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.enums import ContainerStyle
+
+
+def make_row(text: str) -> TableRow:
+    return TableRow(cells=[TableCell(items=[TextBlock(text=text)])])
+
+
+def test_lazy_items_encode_like_a_list():
+    lazy = AdaptiveCard(body=[Container(items=(TextBlock(text=str(i)) for i in range(4)))])
+    eager = AdaptiveCard(body=[Container(items=[TextBlock(text=str(i)) for i in range(4)])])
+    assert lazy.as_bytes() == eager.as_bytes()
+    with pytest.raises(RuntimeError):
+        lazy.as_bytes()
+
+
+def test_limits_add_a_trailer():
+    container = Container(items=(TextBlock(text=str(i)) for i in range(5)), item_limit=2)
+    assert [item['text'] for item in container.to_dict()['items']] == ['0', '1', '… and 3 more']
+    table = Table(rows=[make_row(str(i)) for i in range(5)], row_limit=3)
+    assert len(table.rows) == 4
+
+
+def test_positional_arguments_keep_their_meaning():
+    container = Container([TextBlock(text='a')], None, ContainerStyle.emphasis)
+    assert container.style is ContainerStyle.emphasis
+    for cls, name in ((Container, 'item_limit'), (Table, 'row_limit')):
+        parameter = inspect.signature(cls.__init__).parameters[name]
+        assert parameter.kind is inspect.Parameter.KEYWORD_ONLY
+
+
+@pytest.mark.parametrize('value', ['text', b'text', {'text': 'a'}, TextBlock(text='a')],
+                         ids=['str', 'bytes', 'dict', 'element'])
+def test_non_sequences_are_refused(value):
+    with pytest.raises(TypeError):
+        Container(items=value)
+    with pytest.raises(TypeError):
+        Table(rows=value)
+
+
+def test_display_and_pickling_leave_the_rows_alone():
+    card = AdaptiveCard(body=[Table(rows=(make_row(str(i)) for i in range(3)))])
+    assert 'LazySequence (pending)' in repr(card)
+    with pytest.raises(TypeError, match="can't be pickled"):
+        pickle.dumps(card)
+    assert card.as_bytes().count(b'"TableRow"') == 3
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from adaptivecardsng.messages.aio import AsyncWebhookSender
+from adaptivecardsng.messages.delivery import RetryPolicy
+from adaptivecardsng.messages.outbox import Outbox
+from adaptivecardsng.messages.sender import WebhookSender
+from adaptivecardsng.messages.testing import StandInWebhook
+
+# A single attempt per drain, so that failures show up at once.
+ONCE = RetryPolicy(attempts=1)
+
+
+def payload(name: str) -> bytes:
+    return ('{"text":"%s"}' % name).encode()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    with Outbox(str(tmp_path / 'outbox.db'), batch_size=3) as box:
+        yield box
+
+
+@pytest.fixture
+def webhook():
+    with StandInWebhook() as stand_in:
+        yield stand_in
+
+
+def hook(webhook, name: str) -> str:
+    return f'http://{webhook.host}:{webhook.port}/{name}'
+
+
+def sent_to(webhook, name: str) -> list:
+    return [body for path, body in zip(webhook.paths, webhook.received) if path == f'/{name}']
+
+
+def test_messages_are_sent_in_order_per_webhook(outbox, webhook):
+    for i in range(7):
+        outbox.put(hook(webhook, 'a'), payload(f'a{i}'))
+        outbox.put(hook(webhook, 'b'), payload(f'b{i}'))
+    with WebhookSender(retry=ONCE) as sender:
+        counts = outbox.drain(sender)
+    assert counts == {'sent': 14, 'dead': 0, 'deferred': 0}
+    assert sent_to(webhook, 'a') == [payload(f'a{i}') for i in range(7)]
+    assert sent_to(webhook, 'b') == [payload(f'b{i}') for i in range(7)]
+    assert len(outbox) == 0
+
+
+def test_failing_webhook_holds_back_later_messages(outbox, webhook):
+    url = hook(webhook, 'a')
+    for i in range(4):
+        outbox.put(url, payload(f'a{i}'))
+    webhook.respond(503)
+    with WebhookSender(retry=ONCE) as sender:
+        assert outbox.drain(sender) == {'sent': 0, 'dead': 0, 'deferred': 4}
+        assert webhook.received == []
+        assert outbox.depths() == {url: 4}
+        # The failed message goes first on the next drain.
+        assert outbox.drain(sender) == {'sent': 4, 'dead': 0, 'deferred': 0}
+    assert webhook.received == [payload(f'a{i}') for i in range(4)]
+
+
+def test_refused_message_becomes_a_dead_letter(outbox, webhook):
+    url = hook(webhook, 'a')
+    for i in range(3):
+        outbox.put(url, payload(f'a{i}'))
+    webhook.respond(400, b'Bad card')
+    with WebhookSender(retry=ONCE) as sender:
+        assert outbox.drain(sender) == {'sent': 2, 'dead': 1, 'deferred': 0}
+        assert webhook.received == [payload('a1'), payload('a2')]
+        [(id_, dead_url, dead_payload, status)] = outbox.dead_letters()
+        assert (dead_url, dead_payload, status) == (url, payload('a0'), 400)
+        assert len(outbox) == 0
+
+        outbox.requeue([id_])
+        assert outbox.dead_letters() == []
+        assert outbox.drain(sender) == {'sent': 1, 'dead': 0, 'deferred': 0}
+    assert webhook.received[-1] == payload('a0')
+
+
+def test_discarded_dead_letters_are_gone(outbox, webhook):
+    outbox.put(hook(webhook, 'a'), payload('a0'))
+    webhook.respond(400)
+    with WebhookSender(retry=ONCE) as sender:
+        outbox.drain(sender)
+    outbox.discard([id_ for id_, *_ in outbox.dead_letters()])
+    assert outbox.dead_letters() == [] and len(outbox) == 0
+
+
+def test_max_messages_leaves_the_rest_waiting(outbox, webhook):
+    url = hook(webhook, 'a')
+    outbox.put_many((url, payload(f'a{i}')) for i in range(5))
+    with WebhookSender(retry=ONCE) as sender:
+        assert outbox.drain(sender, max_messages=2)['sent'] == 2
+    assert webhook.received == [payload('a0'), payload('a1')]
+    assert len(outbox) == 3
+
+
+def test_buffered_messages_survive_close(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    with Outbox(path, batch_size=100) as box:
+        box.put('http://example.invalid/a', payload('a0'))
+        assert len(box) == 1
+    with Outbox(path) as box:
+        assert box.depths() == {'http://example.invalid/a': 1}
+
+
+def test_drain_async_keeps_the_same_order(outbox):
+    async def scenario():
+        async with StandInWebhook() as webhook:
+            for i in range(5):
+                outbox.put(hook(webhook, 'a'), payload(f'a{i}'))
+                outbox.put(hook(webhook, 'b'), payload(f'b{i}'))
+            webhook.respond(400)
+            async with AsyncWebhookSender(retry=ONCE) as sender:
+                counts = await outbox.drain_async(sender)
+            return webhook, counts
+
+    webhook, counts = asyncio.run(scenario())
+    assert counts == {'sent': 9, 'dead': 1, 'deferred': 0}
+    [(_, _, dead_payload, _)] = outbox.dead_letters()
+    for name in ('a', 'b'):
+        expected = [payload(f'{name}{i}') for i in range(5)]
+        assert sent_to(webhook, name) == [body for body in expected if body != dead_payload]
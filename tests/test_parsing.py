@@ -0,0 +1,289 @@
+import enum
+
+import pytest
+
+from adaptivecardsng import actions, containers, elements, enums, inputs, types
+from adaptivecardsng.base import BaseObject
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.messages.teams import TeamsAdaptiveMessage
+from adaptivecardsng.parsing import from_dict, from_json
+
+
+def assert_same_tree(original, parsed, path='$'):
+    # Same classes, the same keys in the same order, and Enum members (not
+    # their strings) where the original had them.
+    if isinstance(original, BaseObject):
+        assert parsed.__class__ is original.__class__, path
+        assert list(parsed.__dict__) == list(original.__dict__), path
+        for key, value in original.__dict__.items():
+            assert_same_tree(value, parsed.__dict__[key], f'{path}.{key}')
+    elif isinstance(original, enum.Enum):
+        assert parsed is original, path
+    elif isinstance(original, (list, tuple)):
+        assert isinstance(parsed, list) and len(parsed) == len(original), path
+        for position, (item, parsed_item) in enumerate(zip(original, parsed)):
+            assert_same_tree(item, parsed_item, f'{path}[{position}]')
+    elif isinstance(original, dict):
+        assert isinstance(parsed, dict) and list(parsed) == list(original), path
+        for key, value in original.items():
+            assert_same_tree(value, parsed[key], f'{path}.{key}')
+    else:
+        assert parsed.__class__ is original.__class__ and parsed == original, path
+
+
+def round_trip(obj, cls=None):
+    payload = obj.as_bytes()
+    parsed = from_json(payload, cls)
+    assert parsed.as_bytes() == payload
+    assert_same_tree(obj, parsed)
+    return parsed
+
+
+def in_card(*body, **kwargs) -> AdaptiveCard:
+    return AdaptiveCard(body=list(body), **kwargs)
+
+
+SUBMIT = actions.Submit(data={'id': 1, 'tags': ['a', 'b'], 'type': 'Action.Submit'},
+                        title='Send', style=enums.ActionStyle.positive)
+
+ELEMENTS = {
+    'TextBlock': elements.TextBlock(
+        text='Hello', color=enums.Colors.accent, font_type=enums.FontType.monospace,
+        horizontal_alignment=enums.HorizontalAlignment.center, subtle=True, max_lines=2,
+        font_size=enums.FontSize.extra_large, font_weight=enums.FontWeight.bolder, wrap=True,
+        style=enums.TextBlockStyle.heading, height=enums.BlockElementHeight.stretch,
+        separator=True, spacing=enums.Spacing.padding, id='greeting'),
+    'Image': elements.Image(
+        url='https://example.com/a.png', alt_text='A', background_color='#FFFFFF',
+        height='50px', horizontal_alignment=enums.HorizontalAlignment.right,
+        select_action=actions.OpenUrl(url='https://example.com'),
+        size=enums.ImageSize.large, style=enums.ImageStyle.person, width='40px'),
+    'Media': elements.Media(
+        sources=[elements.MediaSource(url='https://example.com/v.mp4', mime_type='video/mp4')],
+        poster='https://example.com/p.png', alt_text='Video'),
+    'RichTextBlock': elements.RichTextBlock(
+        inlines=['plain', elements.TextRun(
+            text='run', color=enums.Colors.good, font_type=enums.FontType.monospace,
+            highlight=True, subtle=True, italic=True, select_action=SUBMIT,
+            size=enums.FontSize.small, strikethrough=True, underline=True,
+            weight=enums.FontWeight.lighter)],
+        horizontal_alignment=enums.HorizontalAlignment.left),
+    'ActionSet': containers.ActionSet(actions=[SUBMIT, actions.OpenUrl(url='https://x.y')]),
+    'Container': containers.Container(
+        items=[elements.TextBlock(text='in')], select_action=SUBMIT,
+        style=enums.ContainerStyle.emphasis,
+        vertical_content_alignment=enums.VerticalAlignment.bottom, bleed=True,
+        background_image=types.BackgroundImage(
+            url='https://example.com/bg.png', fill_mode=enums.ImageFillMode.repeat,
+            horizontal_alignment=enums.HorizontalAlignment.center,
+            vertical_alignment=enums.VerticalAlignment.top),
+        min_height='80px', rtl=True),
+    'ColumnSet': containers.ColumnSet(
+        columns=[containers.Column(
+            items=[elements.TextBlock(text='c')],
+            background_image=types.BackgroundImage(url='https://example.com/c.png',
+                                                   fill_mode=enums.ImageFillMode.cover),
+            style=enums.ContainerStyle.good, spacing=enums.Spacing.small,
+            vertical_content_alignment=enums.VerticalAlignment.center, width='stretch'),
+            containers.Column(items=[elements.TextBlock(text='d')], width=2)],
+        style=enums.ContainerStyle.accent, min_height='20px',
+        horizontal_alignment=enums.HorizontalAlignment.right),
+    'FactSet': containers.FactSet(facts=[containers.Fact(title='a', value='1'),
+                                         containers.Fact(title='b', value='2')]),
+    'ImageSet': containers.ImageSet(images=[elements.Image(url='https://example.com/1.png')],
+                                    image_size=enums.ImageSize.small),
+    'Table': containers.Table(
+        columns=[{'width': 1}, {'width': 2}],
+        rows=[containers.TableRow(
+            cells=[containers.TableCell(
+                items=[elements.TextBlock(text='h')], style=enums.ContainerStyle.warning,
+                background_image=types.BackgroundImage(url='https://example.com/t.png'),
+                vertical_content_alignment=enums.VerticalAlignment.center),
+                containers.TableCell(items=[elements.TextBlock(text='i')])],
+            style=enums.ContainerStyle.attention,
+            horizontal_cell_content_alignment=enums.HorizontalAlignment.center,
+            vertical_cell_content_alignment=enums.VerticalAlignment.bottom)],
+        first_row_as_header=True, show_grid_lines=True, grid_style=enums.ContainerStyle.accent,
+        horizontal_cell_content_alignment=enums.HorizontalAlignment.left,
+        vertical_cell_content_alignment=enums.VerticalAlignment.top),
+}
+
+INPUTS = {
+    'Input.Text': inputs.Text(
+        id='name', multiline=True, max_length=20, placeholder='Name', regex='^a',
+        style=enums.TextInputStyle.email, inline_action=SUBMIT, value='x',
+        error_message='Bad', required=True, label='Name'),
+    'Input.Number': inputs.Number(id='n', max=10, min=1, placeholder='N', value=5),
+    'Input.Date': inputs.Date(id='d', max='2030-01-01', min='2020-01-01', value='2024-05-06'),
+    'Input.Time': inputs.Time(id='t', max='18:00', min='08:00', value='09:30'),
+    'Input.Toggle': inputs.Toggle(title='On?', id='on', value=True, value_off='no',
+                                  value_on='yes', wrap=True),
+    'Input.ChoiceSet': inputs.ChoiceSet(
+        id='pick', choices=[inputs.Choice(title='A', value='a'),
+                            inputs.Choice(title='B', value='b')],
+        multiselect=True, style=enums.ChoiceInputStyle.filtered, value='a',
+        placeholder='Pick'),
+}
+
+ACTIONS = {
+    'Action.OpenUrl': actions.OpenUrl(url='https://example.com', title='Open',
+                                      icon_url='https://example.com/i.png', id='open',
+                                      style=enums.ActionStyle.destructive,
+                                      tooltip='Opens', mode=enums.ActionMode.secondary),
+    'Action.Submit': actions.Submit(data={'k': 'v'},
+                                    associated_inputs=enums.AssociatedInputs.none,
+                                    title='Send'),
+    'Action.ShowCard': actions.ShowCard(card=in_card(elements.TextBlock(text='more')),
+                                        title='More'),
+    'Action.ToggleVisibility': actions.ToggleVisibility(
+        target_elements=[actions.TargetElement('greeting', visible=True), 'other'],
+        title='Toggle'),
+    'Action.Execute': actions.Execute(verb='go', data={'x': [1, 2]},
+                                      associated_inputs=enums.AssociatedInputs.auto,
+                                      title='Go', style=enums.ActionStyle.positive),
+}
+
+
+@pytest.mark.parametrize('element', ELEMENTS.values(), ids=list(ELEMENTS))
+def test_element_round_trip(element):
+    parsed = round_trip(in_card(element))
+    assert parsed.body[0].type == element.type
+
+
+@pytest.mark.parametrize('element', INPUTS.values(), ids=list(INPUTS))
+def test_input_round_trip(element):
+    round_trip(in_card(element))
+
+
+@pytest.mark.parametrize('action', ACTIONS.values(), ids=list(ACTIONS))
+def test_action_round_trip(action):
+    round_trip(AdaptiveCard(body=[elements.TextBlock(text='t')], actions=[action]))
+
+
+def test_card_properties_round_trip():
+    card = AdaptiveCard(
+        refresh=types.Refresh(execute=actions.Execute(verb='refresh'), user_ids=['a', 'b']),
+        authentication=types.Authentication(
+            text='Sign in', connection_name='conn',
+            token_exchange_resource=types.TokenExchangeResource('id', 'uri', 'provider'),
+            buttons=[types.AuthCardButton('signin', 'https://example.com', title='Sign in')]),
+        body=list(ELEMENTS.values()) + list(INPUTS.values()),
+        actions=list(ACTIONS.values()),
+        select_action=SUBMIT, fallback_text='fallback',
+        background_image=types.BackgroundImage(url='https://example.com/card.png',
+                                               fill_mode=enums.ImageFillMode.repeat_vertically),
+        min_height='100px', rtl=True, speak='Hi', lang='en',
+        vertical_content_alignment=enums.VerticalAlignment.center)
+    round_trip(card)
+
+
+def test_teams_message_round_trip():
+    message = TeamsAdaptiveMessage(in_card(*ELEMENTS.values()))
+    parsed = round_trip(message)
+    assert parsed.attachments[0]['content'].__class__ is AdaptiveCard
+
+
+def test_untyped_top_level_object():
+    fact = containers.Fact(title='a', value='1')
+    assert from_json(fact.as_bytes(), containers.Fact).__class__ is containers.Fact
+    assert from_dict({'title': 'a', 'value': '1'}).__class__ is dict
+
+
+# Every Enum member, in a property of the type that holds it.
+ENUM_HOLDERS = {
+    enums.FontType: lambda member: elements.TextBlock(text='t', font_type=member),
+    enums.FontSize: lambda member: elements.TextBlock(text='t', font_size=member),
+    enums.FontWeight: lambda member: elements.TextBlock(text='t', font_weight=member),
+    enums.TextBlockStyle: lambda member: elements.TextBlock(text='t', style=member),
+    enums.ImageFillMode: lambda member: containers.Container(
+        items=[], background_image=types.BackgroundImage(url='u', fill_mode=member)),
+    enums.ImageSize: lambda member: elements.Image(url='u', size=member),
+    enums.ImageStyle: lambda member: elements.Image(url='u', style=member),
+    enums.HorizontalAlignment: lambda member: elements.TextBlock(
+        text='t', horizontal_alignment=member),
+    enums.VerticalAlignment: lambda member: containers.Container(
+        items=[], vertical_content_alignment=member),
+    enums.BlockElementHeight: lambda member: elements.TextBlock(text='t', height=member),
+    enums.Spacing: lambda member: elements.TextBlock(text='t', spacing=member),
+    enums.ActionStyle: lambda member: containers.ActionSet(
+        actions=[actions.OpenUrl(url='u', style=member)]),
+    enums.ActionMode: lambda member: containers.ActionSet(
+        actions=[actions.Submit(title='s', mode=member)]),
+    enums.AssociatedInputs: lambda member: containers.ActionSet(
+        actions=[actions.Execute(verb='v', associated_inputs=member)]),
+    enums.Colors: lambda member: elements.TextBlock(text='t', color=member),
+    enums.ContainerStyle: lambda member: containers.Container(items=[], style=member),
+    enums.TextInputStyle: lambda member: inputs.Text(id='i', style=member),
+    enums.ChoiceInputStyle: lambda member: inputs.ChoiceSet(id='i', style=member),
+}
+
+ENUM_MEMBERS = [member for enum_type in ENUM_HOLDERS for member in enum_type]
+
+
+def test_every_enum_has_a_holder():
+    defined = {value for value in vars(enums).values()
+               if isinstance(value, type) and issubclass(value, enum.Enum)
+               and value.__module__ == enums.__name__}
+    assert defined == set(ENUM_HOLDERS)
+
+
+@pytest.mark.parametrize('member', ENUM_MEMBERS, ids=repr)
+def test_enum_round_trip(member):
+    round_trip(in_card(ENUM_HOLDERS[member.__class__](member)))
+
+
+def test_table_type():
+    # Tables used to be written as "Container" and parsed back as Containers.
+    table = ELEMENTS['Table']
+    assert table.type == 'Table'
+    parsed = from_json(in_card(table).as_bytes())
+    assert parsed.body[0].__class__ is containers.Table
+    assert parsed.body[0].rows[0].__class__ is containers.TableRow
+    assert parsed.body[0].rows[0].cells[0].__class__ is containers.TableCell
+
+
+@pytest.mark.parametrize('holder', [
+    lambda image: in_card(containers.Container(items=[], background_image=image)),
+    lambda image: in_card(containers.ColumnSet(columns=[containers.Column(
+        background_image=image)])),
+    lambda image: in_card(containers.Table(rows=[containers.TableRow(cells=[
+        containers.TableCell(items=[], background_image=image)])])),
+    lambda image: AdaptiveCard(background_image=image),
+], ids=['Container', 'Column', 'TableCell', 'AdaptiveCard'])
+def test_background_image(holder):
+    # "backgroundImage" was misspelt for Containers, which left their
+    # background images as plain dicts.
+    image = types.BackgroundImage(url='https://example.com/bg.png',
+                                  fill_mode=enums.ImageFillMode.repeat_horizontally)
+    card = holder(image)
+    parsed = round_trip(card)
+    found = []
+
+    def find(value):
+        if isinstance(value, types.BackgroundImage):
+            found.append(value)
+        elif isinstance(value, BaseObject):
+            for item in value.__dict__.values():
+                find(item)
+        elif isinstance(value, list):
+            for item in value:
+                find(item)
+
+    find(parsed)
+    assert len(found) == 1
+    assert found[0].fillMode is enums.ImageFillMode.repeat_horizontally
+
+
+def test_background_image_url_string():
+    round_trip(in_card(containers.Container(items=[], background_image='https://x.y/bg.png')))
+
+
+def test_unknown_values_are_kept():
+    data = {'type': 'AdaptiveCard', 'body': [
+        {'type': 'TextBlock', 'text': 't', 'color': 'chartreuse', 'x-custom': {'a': 1}},
+        {'type': 'Custom.Element', 'value': [1, 2]},
+    ]}
+    card = from_dict(data)
+    assert card.body[0].color == 'chartreuse'
+    assert card.body[1] == {'type': 'Custom.Element', 'value': [1, 2]}
+    assert card.to_dict() == data
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from adaptivecardsng.messages.aio import AsyncWebhookSender
+from adaptivecardsng.messages.delivery import RetryPolicy
+from adaptivecardsng.messages.scheduler import Scheduler, TokenBucket
+from adaptivecardsng.messages.testing import StandInWebhook
+
+# A single attempt, so that throttled deliveries are reported rather than retried.
+ONCE = RetryPolicy(attempts=1)
+
+
+def payload(name: str) -> bytes:
+    return ('{"text":"%s"}' % name).encode()
+
+
+def run(coroutine_function, **webhook_options):
+    # Runs ``coroutine_function(webhook, sender)`` against a fresh StandInWebhook.
+    async def main():
+        async with StandInWebhook(**webhook_options) as webhook, \
+                AsyncWebhookSender(retry=ONCE) as sender:
+            return await coroutine_function(webhook, sender)
+    return asyncio.run(main())
+
+
+def hook(webhook, name: str) -> str:
+    return f'http://{webhook.host}:{webhook.port}/{name}'
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    bucket = TokenBucket(rate=2, burst=3, now=0.0)
+    assert [bucket.take(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.delay(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.5) and not bucket.take(0.5)
+    bucket.empty(10.0)
+    assert bucket.delay(10.0) == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_messages_keep_their_order_and_results():
+    async def scenario(webhook, sender):
+        deliveries = [(hook(webhook, 'a'), payload(f'a{i}')) for i in range(5)]
+        async with Scheduler(sender, rate=1000, max_in_flight=1) as scheduler:
+            results = await scheduler.send_many(deliveries)
+            assert scheduler.stats()['sent'] == 5 and scheduler.stats()['depth'] == 0
+        assert all(result.ok for result in results)
+        assert webhook.received == [body for _, body in deliveries]
+    run(scenario)
+
+
+def test_quiet_webhook_is_not_stuck_behind_a_storm():
+    async def scenario(webhook, sender):
+        async with Scheduler(sender, rate=20, burst=1) as scheduler:
+            storm = [scheduler.submit(hook(webhook, 'storm'), payload(f's{i}'))
+                     for i in range(10)]
+            quiet = scheduler.submit(hook(webhook, 'quiet'), payload('q'))
+            await quiet
+            assert len(webhook.received) <= 3
+            await asyncio.gather(*storm)
+            stats = scheduler.stats()['webhooks']
+        assert stats[hook(webhook, 'storm')]['sent'] == 10
+        # At 20 per second with no burst, the storm takes about half a second.
+        assert stats[hook(webhook, 'storm')]['max_wait'] >= 0.35
+        assert stats[hook(webhook, 'quiet')]['max_wait'] < 0.2
+    run(scenario)
+
+
+def test_rate_keeps_a_throttling_webhook_happy():
+    async def scenario(webhook, sender):
+        async with Scheduler(sender, rate=10, burst=2) as scheduler:
+            results = await scheduler.send_many((hook(webhook, 'a'), payload(f'a{i}'))
+                                                for i in range(6))
+            assert scheduler.stats()['throttled'] == 0
+        assert all(result.ok for result in results)
+    # Some slack over the scheduler's rate, for the jitter of request arrival.
+    run(scenario, rate=15, burst=2)
+
+
+def test_throttled_delivery_is_reported_and_pauses_the_webhook():
+    async def scenario(webhook, sender):
+        async with Scheduler(sender, rate=1000) as scheduler:
+            webhook.respond(429)
+            results = await scheduler.send_many([(hook(webhook, 'a'), payload('a0'))])
+            assert [result.status for result in results] == [429]
+            assert scheduler.stats()['throttled'] == 1
+    run(scenario)
+
+
+def test_close_cancels_queued_messages():
+    async def scenario(webhook, sender):
+        scheduler = Scheduler(sender, rate=1, burst=1)
+        futures = [scheduler.submit(hook(webhook, 'a'), payload(f'a{i}')) for i in range(3)]
+        await futures[0]
+        await scheduler.close()
+        assert all(future.cancelled() for future in futures[1:])
+    run(scenario)
@@ -0,0 +1,91 @@
+import pytest
+
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.messages import sender as sender_module
+from adaptivecardsng.messages.delivery import RetryPolicy
+from adaptivecardsng.messages.sender import WebhookSender
+from adaptivecardsng.messages.teams import TeamsAdaptiveMessage
+from adaptivecardsng.messages.testing import StandInWebhook
+
+# No waiting between retries, so that the tests run quickly.
+NO_WAIT = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+
+
+def make_message(text: str = 'Deploy finished') -> TeamsAdaptiveMessage:
+    return TeamsAdaptiveMessage(AdaptiveCard(body=[TextBlock(text=text)]))
+
+
+def test_connections_are_kept_alive():
+    messages = [make_message(f'Build {i}') for i in range(5)]
+    with StandInWebhook() as webhook, WebhookSender(retry=NO_WAIT) as sender:
+        results = [sender.send(webhook.url, message) for message in messages]
+    assert all(result.ok for result in results)
+    assert webhook.received == [message.as_bytes() for message in messages]
+    assert webhook.connections == 1
+
+
+def test_throttled_send_is_retried_after_retry_after(monkeypatch):
+    waits = []
+    monkeypatch.setattr(sender_module.time, 'sleep', waits.append)
+    retry = RetryPolicy(attempts=3, base_delay=0, max_delay=5)
+    with StandInWebhook() as webhook, WebhookSender(retry=retry) as sender:
+        webhook.respond(429, headers={'Retry-After': '2'})
+        result = sender.send(webhook.url, make_message())
+    assert result.ok
+    assert result.attempts == 2
+    assert waits == [2.0]
+    assert webhook.requests == 2
+    assert len(webhook.received) == 1
+
+
+def test_stale_pooled_connection_is_resent_once():
+    with StandInWebhook() as webhook, WebhookSender(retry=RetryPolicy(attempts=1)) as sender:
+        assert sender.send(webhook.url, make_message('first')).ok
+        # The pooled connection is dropped when the next request arrives.
+        webhook.respond(None)
+        result = sender.send(webhook.url, make_message('second'))
+    assert result.ok
+    assert result.attempts == 1
+    assert webhook.requests == 3
+    assert webhook.connections == 2
+    assert webhook.received == [make_message('first').as_bytes(),
+                                make_message('second').as_bytes()]
+
+
+def test_dropped_new_connection_counts_as_an_attempt():
+    with StandInWebhook() as webhook, WebhookSender(retry=NO_WAIT) as sender:
+        webhook.respond(None)
+        result = sender.send(webhook.url, make_message())
+    assert result.ok
+    assert result.attempts == 2
+
+
+def test_concurrency_is_capped_per_host():
+    # More worker threads than connections, so that the cap is what limits them.
+    with StandInWebhook(delay=0.05) as webhook, \
+            WebhookSender(max_per_host=2, max_workers=6, retry=NO_WAIT) as sender:
+        results = sender.send_many((webhook.url, make_message(f'Alert {i}')) for i in range(6))
+    assert all(result.ok for result in results)
+    assert webhook.max_in_flight == 2
+    assert webhook.connections == 2
+
+
+def test_timed_out_attempts_are_retried_then_reported():
+    retry = RetryPolicy(attempts=2, base_delay=0, max_delay=0)
+    with StandInWebhook(delay=0.5) as webhook, \
+            WebhookSender(timeout=0.05, retry=retry) as sender:
+        result = sender.send(webhook.url, make_message())
+    assert not result.ok
+    assert result.status is None
+    assert isinstance(result.error, TimeoutError)
+    assert result.attempts == 2
+
+
+@pytest.mark.parametrize('status', [204, 304])
+def test_bodyless_responses_keep_the_connection(status):
+    with StandInWebhook() as webhook, WebhookSender(retry=RetryPolicy(attempts=1)) as sender:
+        webhook.respond(status, times=2)
+        results = [sender.send(webhook.url, make_message()) for _ in range(3)]
+    assert [result.status for result in results] == [status, status, 200]
+    assert webhook.connections == 1
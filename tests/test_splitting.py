@@ -0,0 +1,92 @@
+import pytest
+
+from adaptivecardsng.actions import OpenUrl
+from adaptivecardsng.cards import AdaptiveCard
+from adaptivecardsng.containers import Container, Table, TableCell, TableRow
+from adaptivecardsng.elements import TextBlock
+from adaptivecardsng.messages.splitting import split_card
+from adaptivecardsng.sizing import encoded_size, invalidate
+
+BUDGET = 4000
+
+
+def make_row(text: str) -> TableRow:
+    return TableRow(cells=[TableCell(items=[TextBlock(text=text)])])
+
+
+def body_of(message) -> list:
+    return message.attachments[0]['content'].body
+
+
+def test_encoded_size_matches_as_bytes():
+    card = AdaptiveCard(body=[TextBlock(text='Café – 日本'), Container(items=[])],
+                        actions=[OpenUrl(url='https://example.com', title='Open')])
+    assert encoded_size(card) == len(card.as_bytes())
+
+
+def test_encoded_size_follows_in_place_changes():
+    card = AdaptiveCard(body=[TextBlock(text='first')])
+    assert card.encoded_size() == len(card.as_bytes())
+    card.body.append(TextBlock(text='second ' * 10))
+    assert card.encoded_size() == len(card.as_bytes())
+
+
+def test_remembered_sizes_follow_assignment_and_invalidate():
+    text = TextBlock(text='first')
+    card = AdaptiveCard(body=[Container(items=[text])])
+    card.encoded_size()
+    text.text = 'a longer text'
+    assert card.encoded_size(fresh=False) == len(card.as_bytes())
+    card.body[0].items.append(TextBlock(text='more'))
+    invalidate(card.body[0])
+    assert card.encoded_size(fresh=False) == len(card.as_bytes())
+
+
+def test_card_that_fits_is_one_message():
+    card = AdaptiveCard(body=[TextBlock(text='short')])
+    messages = split_card(card, BUDGET)
+    assert len(messages) == 1
+    assert body_of(messages[0]) is card.body
+
+
+def test_split_keeps_order_budget_and_actions_on_last_part():
+    texts = [f'line {i} ' + 'x' * 300 for i in range(40)]
+    card = AdaptiveCard(body=[TextBlock(text=texts[0])],
+                        actions=[OpenUrl(url='https://example.com', title='Open')])
+    card.encoded_size()
+    # Filled in place after measuring, as cards usually are.
+    card.body.extend(TextBlock(text=text) for text in texts[1:])
+    messages = split_card(card, BUDGET)
+    assert len(messages) > 1
+    assert all(len(message.as_bytes()) <= BUDGET for message in messages)
+    assert [block.text for message in messages for block in body_of(message)] == texts
+    cards = [message.attachments[0]['content'] for message in messages]
+    assert all('actions' not in part.__dict__ for part in cards[:-1])
+    assert cards[-1].actions == card.actions
+    assert 'actions' in card.__dict__ and len(card.body) == 40
+
+
+def test_table_is_split_by_rows_repeating_the_header():
+    header = make_row('Host')
+    rows = [make_row(f'host-{i:03}.example.com ' + 'y' * 100) for i in range(60)]
+    card = AdaptiveCard(body=[Table(columns=[{'width': 1}], rows=[header] + rows,
+                                    first_row_as_header=True)])
+    messages = split_card(card, BUDGET)
+    assert len(messages) > 1
+    assert all(len(message.as_bytes()) <= BUDGET for message in messages)
+    tables = [table for message in messages for table in body_of(message)]
+    assert all(table.rows[0] is header for table in tables)
+    assert [row for table in tables for row in table.rows[1:]] == rows
+
+
+def test_element_too_large_for_any_message_is_refused():
+    card = AdaptiveCard(body=[TextBlock(text='ok'), TextBlock(text='z' * (2 * BUDGET))])
+    with pytest.raises(ValueError):
+        split_card(card, BUDGET)
+
+
+def test_lazy_rows_are_refused_without_being_consumed():
+    card = AdaptiveCard(body=[Container(items=(TextBlock(text=str(i)) for i in range(3)))])
+    with pytest.raises(TypeError):
+        split_card(card, BUDGET)
+    assert card.as_bytes().count(b'"TextBlock"') == 3